@@ -3,4 +3,17 @@ Admin configuration for accounts.
 """
 from django.contrib import admin
 
+from .models import APIToken
+
 # Using Django's default User admin
+
+
+@admin.register(APIToken)
+class APITokenAdmin(admin.ModelAdmin):
+    """Admin interface for APIToken model; tokens are issued with the create_api_token command."""
+    list_display = ['name', 'user', 'prefix', 'created_at', 'last_used_at']
+    search_fields = ['name', 'user__username']
+    readonly_fields = ['prefix', 'created_at', 'last_used_at']
+
+    def has_add_permission(self, request):
+        return False
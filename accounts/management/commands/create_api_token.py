@@ -0,0 +1,26 @@
+"""
+Management command that issues an API token to a user.
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import APIToken
+
+
+class Command(BaseCommand):
+    help = 'Create a token for the read-only JSON API and print its key once'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='User the token acts as')
+        parser.add_argument('--name', default='api', help='Label telling this token apart from others')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']} does not exist")
+
+        token, key = APIToken.issue(user, options['name'])
+        self.stdout.write(self.style.SUCCESS(f'Created token "{token.name}" for {user.username}'))
+        self.stdout.write(key)
+        self.stdout.write('Store the key now; it cannot be shown again. Send it as "Authorization: Bearer <key>".')
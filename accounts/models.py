@@ -2,7 +2,65 @@
 User accounts models.
 Using Django's built-in User model.
 """
+import hashlib
+import secrets
+from datetime import timedelta
+
 from django.contrib.auth.models import User
+from django.db import models
+from django.utils import timezone
 
 # We'll use Django's built-in User model
-# Future enhancement: create custom user model or profile
\ No newline at end of file
+# Future enhancement: create custom user model or profile
+
+# Seconds between updates of a token's last_used_at, so reads do not write on every request
+TOKEN_USAGE_RESOLUTION = 300
+
+
+def _hash_key(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+class APIToken(models.Model):
+    """Secret a recruiter's scripts send to read the JSON API; only its hash is stored."""
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='api_tokens')
+    name = models.CharField(max_length=100)
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    prefix = models.CharField(max_length=8, editable=False, help_text='First characters of the key, to tell tokens apart')
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    class Meta:
+        verbose_name = 'API token'
+
+    def __str__(self):
+        return f"{self.name} ({self.prefix}…) for {self.user.username}"
+
+    @classmethod
+    def issue(cls, user, name):
+        """
+        Create a token for a user.
+
+        Returns:
+            Tuple of (APIToken, key); the key is not stored and cannot be shown again
+        """
+        key = secrets.token_urlsafe(32)
+        token = cls.objects.create(user=user, name=name, key_hash=_hash_key(key), prefix=key[:8])
+        return token, key
+
+    @classmethod
+    def authenticate(cls, key):
+        """
+        Return the active user a key belongs to, or None.
+
+        Args:
+            key: Key sent by the client
+        """
+        token = cls.objects.select_related('user').filter(key_hash=_hash_key(key)).first()
+        if token is None or not token.user.is_active:
+            return None
+        now = timezone.now()
+        if token.last_used_at is None or now - token.last_used_at > timedelta(seconds=TOKEN_USAGE_RESOLUTION):
+            cls.objects.filter(pk=token.pk).update(last_used_at=now)
+        return token.user
@@ -0,0 +1,153 @@
+"""
+Fields, orderings and query plans of the JSON API's resources.
+
+Each field declares the columns, joins and prefetches it needs, so a request
+naming a subset of fields with ``fields=`` loads only those columns and every
+page costs the same fixed number of queries.
+"""
+from dataclasses import dataclass
+from operator import attrgetter
+
+from django.db.models import Prefetch
+
+from applicants.models import ApplicantCount, ApplicantNote
+from applicants.pagination import Key
+
+
+@dataclass(frozen=True)
+class Field:
+    """
+    One attribute of an API object.
+
+    Attributes:
+        get: Function returning the value from a model instance
+        columns: Model fields that must be loaded for it
+        related: Relation to join with select_related
+        prefetch: Lookup or Prefetch to load with prefetch_related
+        attach: Function run once on each page's instances before serializing
+    """
+
+    get: object
+    columns: tuple = ()
+    related: str = None
+    prefetch: object = None
+    attach: object = None
+
+
+def column(name):
+    """Field holding one model column as is."""
+    return Field(get=attrgetter(name), columns=(name,))
+
+
+@dataclass(frozen=True)
+class Resource:
+    """A list endpoint's fields and its keyset ordering."""
+
+    fields: dict
+    keys: tuple
+
+    def field_names(self, param):
+        """
+        Parse a ``fields=`` value.
+
+        Returns:
+            Requested field names in the order given, or every field if ``param`` is empty
+
+        Raises:
+            ValueError: If a name is not a field of the resource
+        """
+        if not param:
+            return list(self.fields)
+        names = list(dict.fromkeys(name.strip() for name in param.split(',') if name.strip()))
+        unknown = [name for name in names if name not in self.fields]
+        if unknown:
+            raise ValueError(f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(self.fields)}")
+        return names
+
+    def plan(self, queryset, names):
+        """Narrow a queryset to the columns, joins and prefetches the named fields need."""
+        fields = [self.fields[name] for name in names]
+        columns = {'id', *(key.field for key in self.keys)}
+        columns.update(column for field in fields for column in field.columns)
+        queryset = queryset.only(*columns)
+        related = sorted({field.related for field in fields if field.related})
+        if related:
+            queryset = queryset.select_related(*related)
+        prefetches = [field.prefetch for field in fields if field.prefetch]
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def serialize(self, rows, names):
+        """Return a page of instances as dictionaries of the named fields."""
+        for name in names:
+            if self.fields[name].attach:
+                self.fields[name].attach(rows)
+        getters = [(name, self.fields[name].get) for name in names]
+        return [{name: get(row) for name, get in getters} for row in rows]
+
+
+def _attach_applicant_counts(jobs):
+    totals = ApplicantCount.totals(job.pk for job in jobs)
+    for job in jobs:
+        job.applicant_count = totals.get(job.pk, 0)
+
+
+def _notes(applicant):
+    return [{'id': note.pk, 'note': note.note, 'created_at': note.created_at} for note in applicant.notes.all()]
+
+
+JOBS = Resource(
+    fields={
+        'id': Field(get=attrgetter('pk')),
+        'title': column('title'),
+        'description': column('description'),
+        'location': column('location'),
+        'employment_type': column('employment_type'),
+        'salary_range': column('salary_range'),
+        'requirements': column('requirements'),
+        'responsibilities': column('responsibilities'),
+        'deadline': column('deadline'),
+        'is_active': column('is_active'),
+        'created_at': column('created_at'),
+        'updated_at': column('updated_at'),
+        'applicant_count': Field(get=attrgetter('applicant_count'), attach=_attach_applicant_counts),
+    },
+    keys=(Key('created_at'), Key('id')),
+)
+
+APPLICANTS = Resource(
+    fields={
+        'id': Field(get=attrgetter('pk')),
+        'first_name': column('first_name'),
+        'last_name': column('last_name'),
+        'email': column('email'),
+        'phone': column('phone'),
+        'linkedin': column('linkedin'),
+        'cover_letter': column('cover_letter'),
+        'job': Field(get=attrgetter('applied_job_id'), columns=('applied_job',)),
+        'job_title': Field(get=attrgetter('applied_job.title'), columns=('applied_job__title',), related='applied_job'),
+        'status': column('status'),
+        'processing_status': column('processing_status'),
+        'match_score': column('match_score'),
+        'ai_recommendation': column('ai_recommendation'),
+        'applied_at': column('applied_at'),
+        'updated_at': column('updated_at'),
+        'notes': Field(get=_notes, prefetch=Prefetch(
+            'notes', queryset=ApplicantNote.objects.only('id', 'applicant', 'note', 'created_at')
+        )),
+    },
+    keys=(Key('applied_at'), Key('id')),
+)
+
+NOTES = Resource(
+    fields={
+        'id': Field(get=attrgetter('pk')),
+        'applicant': Field(get=attrgetter('applicant_id'), columns=('applicant',)),
+        'note': column('note'),
+        'created_by': Field(get=attrgetter('created_by.username'), columns=('created_by__username',),
+                            related='created_by'),
+        'created_at': column('created_at'),
+    },
+    keys=(Key('created_at'), Key('id')),
+)
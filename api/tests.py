@@ -0,0 +1,144 @@
+"""
+Tests for api app.
+"""
+import tempfile
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from accounts.models import APIToken
+from applicants.models import Applicant, ApplicantNote
+from ats_project.testing import QueryBudget, QueryBudgetAssertionsMixin
+from jobs.models import Job
+
+
+class APITestCase(TestCase):
+    """Test cases for the read-only JSON API."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        other = User.objects.create_user(username='other', password='pass123')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Test',
+                location='Remote',
+                employment_type='FT',
+                requirements='Python',
+                responsibilities='Code',
+                deadline=date.today() + timedelta(days=30),
+                created_by=owner
+            )
+            for i, owner in enumerate([self.user, self.user, other])
+        ]
+        self.applicants = [
+            Applicant.objects.create(
+                first_name='John',
+                last_name=f'Doe {i}',
+                email=f'john{i}@example.com',
+                phone=f'07700000{i}',
+                applied_job=job,
+                resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 test')
+            )
+            for i, job in enumerate([self.jobs[0], self.jobs[0], self.jobs[1], self.jobs[2]])
+        ]
+        ApplicantNote.objects.create(applicant=self.applicants[0], note='Strong', created_by=self.user)
+        ApplicantNote.objects.create(applicant=self.applicants[3], note='Other', created_by=other)
+        _, key = APIToken.issue(self.user, 'dashboards')
+        self.client = Client(headers={'Authorization': f'Bearer {key}'})
+
+    def test_token_required(self):
+        """Test requests without a valid token are refused, even with a session."""
+        anonymous = Client()
+        anonymous.login(username='recruiter', password='pass123')
+        response = anonymous.get(reverse('api:applicant_list'))
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response['WWW-Authenticate'], 'Bearer realm="api"')
+
+        bad = Client(headers={'Authorization': 'Bearer nope'})
+        self.assertEqual(bad.get(reverse('api:job_list')).status_code, 401)
+        self.assertEqual(self.client.post(reverse('api:job_list')).status_code, 405)
+
+    def test_lists_are_scoped_to_the_recruiter(self):
+        """Test each list only holds the token owner's rows."""
+        jobs = self.client.get(reverse('api:job_list')).json()['results']
+        self.assertEqual([job['title'] for job in jobs], ['Job 1', 'Job 0'])
+        self.assertEqual(jobs[1]['applicant_count'], 2)
+
+        applicants = self.client.get(reverse('api:applicant_list'), {'job': self.jobs[0].pk}).json()['results']
+        self.assertEqual({a['id'] for a in applicants}, {self.applicants[0].pk, self.applicants[1].pk})
+        self.assertEqual(applicants[-1]['notes'][0]['note'], 'Strong')
+        self.assertEqual(applicants[-1]['job_title'], 'Job 0')
+
+        notes = self.client.get(reverse('api:note_list')).json()['results']
+        self.assertEqual(notes, [{
+            'id': notes[0]['id'], 'applicant': self.applicants[0].pk, 'note': 'Strong',
+            'created_by': 'recruiter', 'created_at': notes[0]['created_at'],
+        }])
+
+    def test_cursor_pagination(self):
+        """Test following next links visits every applicant once."""
+        url = reverse('api:applicant_list') + '?limit=2&fields=id'
+        seen = []
+        while url:
+            page = self.client.get(url).json()
+            seen += [row['id'] for row in page['results']]
+            url = page['next']
+        self.assertEqual(seen, [a.pk for a in reversed(self.applicants[:3])])
+
+    def test_fields_narrow_the_select(self):
+        """Test fields= returns and loads only the requested columns."""
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('api:applicant_list'), {'fields': 'id,email'})
+        self.assertEqual(set(response.json()['results'][0]), {'id', 'email'})
+        select = next(q['sql'] for q in captured if 'FROM "applicants_applicant"' in q['sql'])
+        self.assertIn('"email"', select)
+        self.assertNotIn('"cover_letter"', select)
+        self.assertNotIn('"jobs_job"', select)
+
+        response = self.client.get(reverse('api:applicant_list'), {'fields': 'id,salary'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Unknown field(s): salary', response.json()['error'])
+
+    def test_etag(self):
+        """Test an unchanged page answers 304 and a change produces a new ETag."""
+        url = reverse('api:job_list')
+        etag = self.client.get(url)['ETag']
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': etag}).status_code, 304)
+
+        Job.objects.filter(pk=self.jobs[0].pk).update(title='Renamed')
+        response = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class APIQueryBudgetTestCase(QueryBudgetAssertionsMixin, TestCase):
+    """Test API pages cost a fixed number of queries as the data grows."""
+
+    SIZES = (10, 100, 1000)
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    @staticmethod
+    def token(recruiter):
+        return {'Authorization': f'Bearer {APIToken.issue(recruiter, "budget")[1]}'}
+
+    def test_pages(self):
+        """Test every list page, with all its fields, stays within its budget."""
+        # Token lookup and its last-used stamp, then the page and its extras
+        for name, queries in [('job_list', 4), ('applicant_list', 4), ('note_list', 3)]:
+            def url_for(recruiter, name=name):
+                return reverse(f'api:{name}')
+            url_for.__name__ = name
+            budget = QueryBudget(queries=queries, db_ms=50)
+            self.assertViewBudgetAtSizes(budget, self.SIZES, url_for, headers=self.token)
@@ -0,0 +1,13 @@
+"""
+URL patterns for api app.
+"""
+from django.urls import path
+from . import views
+
+app_name = 'api'
+
+urlpatterns = [
+    path('jobs/', views.job_list_api, name='job_list'),
+    path('applicants/', views.applicant_list_api, name='applicant_list'),
+    path('notes/', views.note_list_api, name='note_list'),
+]
@@ -0,0 +1,121 @@
+"""
+Read-only JSON API for recruiters' jobs, applicants and notes.
+
+Requests authenticate with an APIToken sent as ``Authorization: Bearer <key>``
+and see the same rows as the recruiter's HTML views. Lists are keyset
+paginated (``cursor``, ``limit``), can be narrowed with ``fields=`` and
+answer ``If-None-Match`` with 304.
+"""
+import functools
+import hashlib
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse, JsonResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views.decorators.http import require_safe
+
+from accounts.models import APIToken
+from applicants.models import Applicant, ApplicantNote
+from applicants.pagination import keyset_page
+from applicants.views import filter_applicants
+from jobs.models import Job
+
+from . import resources
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+def _error(status, message):
+    return JsonResponse({'error': message}, status=status)
+
+
+def token_required(view):
+    """Decorator authenticating a request by its API token and setting ``request.user``."""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        scheme, _, key = request.headers.get('Authorization', '').partition(' ')
+        user = None
+        if scheme.lower() in ('bearer', 'token') and key.strip():
+            user = APIToken.authenticate(key.strip())
+        if user is None:
+            response = _error(401, 'A valid API token is required.')
+            response['WWW-Authenticate'] = 'Bearer realm="api"'
+            return response
+        request.user = user
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+def _page_size(request):
+    limit = request.GET.get('limit', '')
+    if limit.isdigit() and int(limit) > 0:
+        return min(int(limit), MAX_PAGE_SIZE)
+    return DEFAULT_PAGE_SIZE
+
+
+def _list_response(request, resource, queryset):
+    """
+    Serve one page of a resource as JSON, or 304 if the client has it already.
+
+    The ETag is a digest of the response body, so it changes whenever any
+    returned value does.
+    """
+    try:
+        names = resource.field_names(request.GET.get('fields'))
+    except ValueError as e:
+        return _error(400, str(e))
+
+    rows, cursor = keyset_page(
+        resource.plan(queryset, names), resource.keys, request.GET.get('cursor'), _page_size(request)
+    )
+    next_url = None
+    if cursor:
+        params = request.GET.copy()
+        params['cursor'] = cursor
+        next_url = request.build_absolute_uri(f'{request.path}?{params.urlencode()}')
+
+    content = json.dumps({'results': resource.serialize(rows, names), 'next': next_url}, cls=DjangoJSONEncoder)
+    etag = quote_etag(hashlib.sha256(content.encode()).hexdigest()[:32])
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(content, content_type='application/json')
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Authorization'])
+    return response
+
+
+@require_safe
+@token_required
+def job_list_api(request):
+    """The recruiter's jobs, newest first."""
+    return _list_response(request, resources.JOBS, Job.objects.filter(created_by=request.user))
+
+
+@require_safe
+@token_required
+def applicant_list_api(request):
+    """The recruiter's applicants, newest first, with the applicant list's filters."""
+    try:
+        applicants, _ = filter_applicants(
+            Applicant.objects.filter(recruiter=request.user), request.GET, request.user, ranked=False
+        )
+    except ValueError:
+        return _error(400, 'Invalid filter value.')
+    return _list_response(request, resources.APPLICANTS, applicants)
+
+
+@require_safe
+@token_required
+def note_list_api(request):
+    """Notes on the recruiter's applicants, newest first; ``applicant`` narrows them to one applicant."""
+    notes = ApplicantNote.objects.filter(applicant__recruiter=request.user)
+    applicant_id = request.GET.get('applicant', '')
+    if applicant_id:
+        if not applicant_id.isdigit():
+            return _error(400, 'Invalid filter value.')
+        notes = notes.filter(applicant_id=applicant_id)
+    return _list_response(request, resources.NOTES, notes)
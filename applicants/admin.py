@@ -2,21 +2,75 @@
 Admin configuration for applicants.
 """
 from django.contrib import admin
-from .models import Applicant, ApplicantNote
+from .models import (
+    Applicant, ApplicantCount, ApplicantNote, ResumeAnalysis, ResumeBlob, ResumeExtraction, ResumeTask, ScreeningRun,
+)
 
 
 @admin.register(Applicant)
 class ApplicantAdmin(admin.ModelAdmin):
     """Admin interface for Applicant model."""
-    list_display = ['full_name', 'email', 'applied_job', 'status', 'applied_at']
-    list_filter = ['status', 'applied_at']
+    list_display = ['full_name', 'email', 'applied_job', 'status', 'processing_status', 'applied_at']
+    list_filter = ['status', 'processing_status', 'applied_at']
     search_fields = ['first_name', 'last_name', 'email']
     date_hierarchy = 'applied_at'
 
+    def get_readonly_fields(self, request, obj=None):
+        """Keep an existing application's resume fixed; its stored file is reference counted."""
+        if obj is None:
+            return self.readonly_fields
+        return [*self.readonly_fields, 'resume', 'resume_hash']
+
 
 @admin.register(ApplicantNote)
 class ApplicantNoteAdmin(admin.ModelAdmin):
     """Admin interface for ApplicantNote model."""
     list_display = ['applicant', 'created_by', 'created_at']
     list_filter = ['created_at']
-    search_fields = ['note', 'applicant__first_name', 'applicant__last_name']
\ No newline at end of file
+    search_fields = ['note', 'applicant__first_name', 'applicant__last_name']
+
+
+@admin.register(ResumeExtraction)
+class ResumeExtractionAdmin(admin.ModelAdmin):
+    """Admin interface for ResumeExtraction model."""
+    list_display = ['content_hash', 'extractor_version', 'page_count', 'success', 'created_at']
+    list_filter = ['success', 'extractor_version']
+    search_fields = ['content_hash']
+
+
+@admin.register(ResumeTask)
+class ResumeTaskAdmin(admin.ModelAdmin):
+    """Admin interface for ResumeTask model."""
+    list_display = ['applicant', 'kind', 'status', 'attempts', 'run_after', 'locked_by']
+    list_filter = ['status', 'kind']
+    raw_id_fields = ['applicant']
+
+
+@admin.register(ResumeBlob)
+class ResumeBlobAdmin(admin.ModelAdmin):
+    """Admin interface for ResumeBlob model."""
+    list_display = ['name', 'ref_count', 'created_at']
+    search_fields = ['name']
+
+
+@admin.register(ResumeAnalysis)
+class ResumeAnalysisAdmin(admin.ModelAdmin):
+    """Admin interface for ResumeAnalysis model."""
+    list_display = ['job', 'model_name', 'prompt_version', 'created_at']
+    list_filter = ['model_name', 'prompt_version']
+    raw_id_fields = ['job']
+
+
+@admin.register(ScreeningRun)
+class ScreeningRunAdmin(admin.ModelAdmin):
+    """Admin interface for ScreeningRun model."""
+    list_display = ['job', 'requested_by', 'status', 'total', 'completed', 'failed', 'created_at']
+    list_filter = ['status']
+
+
+@admin.register(ApplicantCount)
+class ApplicantCountAdmin(admin.ModelAdmin):
+    """Admin interface for ApplicantCount model."""
+    list_display = ['job', 'status', 'count']
+    list_filter = ['status']
+    raw_id_fields = ['job']
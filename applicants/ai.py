@@ -0,0 +1,259 @@
+"""
+Process-wide AI provider used for CV analysis.
+
+The provider is built once per process from settings and wraps a backend
+(Gemini, or a deterministic fake for tests and benchmarks) with a request
+timeout, a circuit breaker that fails fast after repeated quota errors, and
+latency and error counters.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.dispatch import receiver
+from django.test.signals import setting_changed
+
+
+class AIProviderError(Exception):
+    """Base error raised by the AI provider layer."""
+
+
+class CircuitOpenError(AIProviderError):
+    """Raised without calling the backend while the circuit breaker is open."""
+
+
+def is_rate_limit_error(error):
+    """Return True if an exception from a backend signals a 429 or exhausted quota."""
+    message = str(error)
+    return '429' in message or 'quota' in message.lower()
+
+
+@dataclass
+class _Response:
+    text: str
+
+
+class GeminiBackend:
+    """Gemini model client, configured once and reused for every request."""
+
+    def __init__(self, api_key, model_name, timeout):
+        import google.generativeai as genai
+
+        genai.configure(api_key=api_key)
+        self.model = genai.GenerativeModel(model_name)
+        self.timeout = timeout
+
+    def generate_content(self, prompt):
+        return self.model.generate_content(
+            prompt,
+            generation_config={'response_mime_type': 'application/json'},
+            request_options={'timeout': self.timeout},
+        )
+
+
+class FakeBackend:
+    """
+    Deterministic offline backend for tests and benchmarks.
+
+    Args:
+        latency: Seconds each call takes
+        rate_limit_every: Fail every Nth call with a 429 error (0 disables)
+    """
+
+    def __init__(self, latency=0.0, rate_limit_every=0):
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt):
+        with self.lock:
+            self.calls += 1
+            call = self.calls
+        if self.latency:
+            time.sleep(self.latency)
+        if self.rate_limit_every and call % self.rate_limit_every == 0:
+            raise RuntimeError('429 Resource has been exhausted (e.g. check quota).')
+        score = int(hashlib.sha256(prompt.encode()).hexdigest(), 16) % 101
+        recommendation = ['Poor Match', 'Partial Match', 'Good Match', 'Strong Match'][min(score // 25, 3)]
+        return _Response(json.dumps({
+            'score': score,
+            'matching_skills': ['Communication'],
+            'gaps': [],
+            'experience': 'Generated by the fake backend.',
+            'recommendation': recommendation,
+            'explanation': 'Deterministic score derived from the prompt.',
+        }))
+
+
+class CircuitBreaker:
+    """
+    Opens after ``threshold`` consecutive quota errors and stays open for
+    ``cooldown`` seconds, after which a single trial call is let through:
+    its success closes the breaker and a quota error re-opens it.
+    """
+
+    def __init__(self, threshold, cooldown):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    def allow(self):
+        with self.lock:
+            if self.opened_at is None:
+                return True
+            if self.trial_in_flight or time.monotonic() - self.opened_at < self.cooldown:
+                return False
+            # Half-open: admit one trial call; its outcome closes or re-opens the breaker
+            self.trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            trial, self.trial_in_flight = self.trial_in_flight, False
+            self.failures += 1
+            if trial or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+
+    def release(self):
+        """End a call that neither succeeded nor hit the quota; a pending trial goes to the next caller."""
+        with self.lock:
+            self.trial_in_flight = False
+
+    @property
+    def is_open(self):
+        return self.opened_at is not None
+
+
+class AIProvider:
+    """Wraps a backend with a circuit breaker and call statistics."""
+
+    def __init__(self, backend, model_name, breaker):
+        self.backend = backend
+        self.model_name = model_name
+        self.breaker = breaker
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.rejected = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def generate_content(self, prompt):
+        """Send a prompt to the backend; raises CircuitOpenError while the breaker is open."""
+        if not self.breaker.allow():
+            with self.lock:
+                self.rejected += 1
+            raise CircuitOpenError('AI service paused after repeated rate-limit errors.')
+
+        started = time.monotonic()
+        try:
+            response = self.backend.generate_content(prompt)
+        except Exception as e:
+            rate_limited = is_rate_limit_error(e)
+            if rate_limited:
+                self.breaker.record_failure()
+            else:
+                self.breaker.release()
+            self._record(started, error=True, rate_limited=rate_limited)
+            raise
+        self.breaker.record_success()
+        self._record(started)
+        return response
+
+    def _record(self, started, error=False, rate_limited=False):
+        latency = time.monotonic() - started
+        with self.lock:
+            self.calls += 1
+            self.errors += error
+            self.rate_limited += rate_limited
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+
+    def stats(self):
+        """Return a snapshot of the call counters."""
+        with self.lock:
+            return {
+                'calls': self.calls,
+                'errors': self.errors,
+                'rate_limited': self.rate_limited,
+                'rejected': self.rejected,
+                'avg_latency': self.total_latency / self.calls if self.calls else 0.0,
+                'max_latency': self.max_latency,
+                'circuit_open': self.breaker.is_open,
+            }
+
+
+def current_model_name():
+    """Name of the configured model, used in analysis cache keys."""
+    return 'fake' if settings.AI_BACKEND == 'fake' else settings.AI_MODEL_NAME
+
+
+def build_provider(backend=None):
+    """
+    Build a provider from settings.
+
+    Args:
+        backend: Optional backend to wrap instead of the configured one
+
+    Raises:
+        AIProviderError: If the Gemini API key is not configured
+    """
+    if backend is None:
+        if settings.AI_BACKEND == 'fake':
+            backend = FakeBackend()
+        else:
+            api_key = os.getenv('GEMINI_API_KEY')
+            if not api_key:
+                raise AIProviderError('Gemini API key not configured')
+            backend = GeminiBackend(api_key, settings.AI_MODEL_NAME, settings.AI_REQUEST_TIMEOUT)
+    breaker = CircuitBreaker(settings.AI_CIRCUIT_BREAKER_THRESHOLD, settings.AI_CIRCUIT_BREAKER_COOLDOWN)
+    model_name = 'fake' if isinstance(backend, FakeBackend) else current_model_name()
+    return AIProvider(backend, model_name, breaker)
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider():
+    """Return the process-wide provider, building it on first use."""
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = build_provider()
+    return _provider
+
+
+def provider_stats():
+    """Return the process-wide provider's call counters, or None if it was never built."""
+    provider = _provider
+    return provider.stats() if provider is not None else None
+
+
+def reset_provider():
+    """Drop the process-wide provider so the next call rebuilds it from settings."""
+    global _provider
+    with _provider_lock:
+        _provider = None
+
+
+@receiver(setting_changed)
+def _reset_on_setting_change(setting, **kwargs):
+    if setting.startswith('AI_'):
+        reset_provider()
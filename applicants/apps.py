@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class ApplicantsConfig(AppConfig):
     name = 'applicants'
+
+    def ready(self):
+        from . import signals  # noqa: F401
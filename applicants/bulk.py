@@ -0,0 +1,96 @@
+"""
+Set-based status changes and deletes of many applicants at once.
+
+Each operation writes the selected rows with one statement, scoped to the
+recruiter's applicants, and applies the counter, search and cache side effects
+once for the whole batch instead of once per row through the signal handlers.
+"""
+from collections import Counter
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from jobs.cache import bump_generation, bump_public_generation
+
+from . import search
+from .models import Applicant, ApplicantCount, ApplicantNote, ResumeBlob, ResumeTask
+from .signals import bulk_change
+
+
+def _selected(recruiter, applicant_ids):
+    return Applicant.objects.filter(recruiter=recruiter, pk__in=list(applicant_ids))
+
+
+def update_status(recruiter, applicant_ids, status):
+    """
+    Move a recruiter's selected applicants to a status.
+
+    Args:
+        recruiter: User whose applicants may be changed; other ids are ignored
+        applicant_ids: Primary keys of the selected applicants
+        status: New status, one of Applicant.STATUS_CHOICES
+
+    Returns:
+        Number of applicants whose status changed
+    """
+    with transaction.atomic():
+        rows = list(
+            _selected(recruiter, applicant_ids).exclude(status=status).select_for_update()
+            .values_list('pk', 'applied_job_id', 'status')
+        )
+        if not rows:
+            return 0
+        Applicant.objects.filter(pk__in=[pk for pk, _, _ in rows]).update(
+            status=status, updated_at=timezone.now()
+        )
+
+        moved = Counter((job_id, previous) for _, job_id, previous in rows)
+        for (job_id, previous), count in moved.items():
+            ApplicantCount.adjust(job_id, previous, -count)
+        for job_id, count in Counter(job_id for _, job_id, _ in rows).items():
+            ApplicantCount.adjust(job_id, status, count)
+        bump_generation(recruiter.pk)
+    return len(rows)
+
+
+def delete(recruiter, applicant_ids):
+    """
+    Delete a recruiter's selected applicants with their notes and tasks.
+
+    Resume files are not removed here: their references are released and
+    files nobody uses any more are left for ``tasks.sweep_unreferenced_resumes``.
+
+    Args:
+        recruiter: User whose applicants may be deleted; other ids are ignored
+        applicant_ids: Primary keys of the selected applicants
+
+    Returns:
+        Number of applicants deleted
+    """
+    with transaction.atomic(), bulk_change():
+        rows = list(
+            _selected(recruiter, applicant_ids).select_for_update()
+            .values_list('pk', 'applied_job_id', 'status', 'resume')
+        )
+        if not rows:
+            return 0
+        pks = [pk for pk, _, _, _ in rows]
+        # Plain DELETEs, children first. QuerySet.delete() would load every row to send
+        # the per-row signals, whose effects are applied once for the batch below.
+        placeholders = ', '.join(['%s'] * len(pks))
+        with connection.cursor() as cursor:
+            for field in (ApplicantNote._meta.get_field('applicant'), ResumeTask._meta.get_field('applicant'),
+                          Applicant._meta.pk):
+                cursor.execute(
+                    f'DELETE FROM {connection.ops.quote_name(field.model._meta.db_table)} '
+                    f'WHERE {connection.ops.quote_name(field.column)} IN ({placeholders})',
+                    pks
+                )
+
+        search.remove_applicants(pks)
+        for (job_id, status), count in Counter((job_id, status) for _, job_id, status, _ in rows).items():
+            ApplicantCount.adjust(job_id, status, -count)
+        ResumeBlob.release_many(Counter(resume for _, _, _, resume in rows if resume))
+        bump_generation(recruiter.pk)
+        bump_public_generation()
+    return len(rows)
@@ -0,0 +1,104 @@
+"""
+Streaming export of applicants as CSV or newline-delimited JSON.
+
+Rows are read with a server-side cursor where the database supports one
+(``QuerySet.iterator``), formatted one at a time and handed to the response
+as they are produced, so memory use does not grow with the number of rows.
+"""
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import OuterRef, Subquery
+
+from .extraction import EXTRACTOR_VERSION
+from .models import ResumeExtraction
+
+# Exported columns and the applicant fields they are read from
+COLUMNS = {
+    'id': 'pk',
+    'first_name': 'first_name',
+    'last_name': 'last_name',
+    'email': 'email',
+    'phone': 'phone',
+    'linkedin': 'linkedin',
+    'job_id': 'applied_job_id',
+    'job_title': 'applied_job__title',
+    'status': 'status',
+    'match_score': 'match_score',
+    'ai_recommendation': 'ai_recommendation',
+    'applied_at': 'applied_at',
+    'updated_at': 'updated_at',
+}
+
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+}
+
+# Rows fetched from the cursor per round trip
+CHUNK_SIZE = 2000
+
+# First characters that make spreadsheets read a cell as a formula
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+class _Echo:
+    """File-like object whose write returns the text instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(applicants, include_resume_text=False):
+    """
+    Iterate over applicants as dictionaries of exported columns.
+
+    Args:
+        applicants: Queryset of applicants to export
+        include_resume_text: Whether to add the stored resume text of each applicant
+
+    Yields:
+        One dictionary per applicant, in the queryset's order
+    """
+    columns = dict(COLUMNS)
+    if include_resume_text:
+        applicants = applicants.annotate(resume_text=Subquery(
+            ResumeExtraction.objects.filter(
+                content_hash=OuterRef('resume_hash'), extractor_version=EXTRACTOR_VERSION, success=True
+            ).values('text')[:1]
+        ))
+        columns['resume_text'] = 'resume_text'
+
+    names = list(columns)
+    for values in applicants.values_list(*columns.values()).iterator(chunk_size=CHUNK_SIZE):
+        yield dict(zip(names, values))
+
+
+def csv_cell(value):
+    """
+    Return a value as written to a CSV cell.
+
+    Text starting like a formula is prefixed with ``'`` so spreadsheets show it
+    instead of evaluating it (CSV formula injection).
+    """
+    if value is None:
+        return ''
+    if isinstance(value, str) and value.startswith(FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def stream_csv(rows, include_resume_text=False):
+    """Yield CSV lines for exported rows, starting with the header."""
+    writer = csv.writer(_Echo())
+    header = list(COLUMNS) + (['resume_text'] if include_resume_text else [])
+    yield writer.writerow(header)
+    for row in rows:
+        yield writer.writerow([csv_cell(value) for value in row.values()])
+
+
+def stream_ndjson(rows):
+    """Yield one JSON document per line for exported rows."""
+    for row in rows:
+        yield json.dumps(row, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,297 @@
+"""
+Sandboxed PDF text extraction.
+
+Resumes are parsed in a small pool of worker processes so a hostile or
+malformed PDF cannot hang a web worker or exhaust its memory. Every document
+is bounded by a wall-clock limit, a resident memory limit and a page cap, and
+failures come back as typed ExtractionResult values rather than error strings.
+"""
+import hashlib
+import multiprocessing
+import os
+import resource
+import signal
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from ats_project.metrics import timed
+
+# Bump whenever extraction logic changes so cached results are re-extracted.
+EXTRACTOR_VERSION = 2
+
+# Failure reasons reported in ExtractionResult.error
+NOT_FOUND = 'not_found'
+UNREADABLE = 'unreadable'
+EMPTY = 'empty'
+TOO_MANY_PAGES = 'too_many_pages'
+TIMEOUT = 'timeout'
+MEMORY_LIMIT = 'memory_limit'
+CRASHED = 'crashed'
+BUSY = 'busy'
+
+ERROR_MESSAGES = {
+    NOT_FOUND: 'Resume file not found.',
+    UNREADABLE: 'Unable to read resume file.',
+    EMPTY: 'Unable to extract text from resume.',
+    TOO_MANY_PAGES: 'Resume has too many pages to extract.',
+    TIMEOUT: 'Resume extraction timed out.',
+    MEMORY_LIMIT: 'Resume extraction exceeded the memory limit.',
+    CRASHED: 'Resume extraction failed unexpectedly.',
+    BUSY: 'Resume extraction is busy; try again shortly.',
+}
+
+# Failures that may succeed on a later attempt and so must not be cached
+TRANSIENT_ERRORS = {NOT_FOUND, CRASHED, BUSY}
+
+# Extra seconds the parent waits beyond the in-worker alarm before killing the pool
+PARENT_TIMEOUT_GRACE = 5
+
+# Seconds between checks on a submitted document while waiting for its result
+POLL_INTERVAL = 0.5
+
+
+@dataclass(frozen=True)
+class ExtractionResult:
+    """Outcome of extracting text from one resume."""
+
+    ok: bool
+    text: str = ''
+    page_count: int = 0
+    error: str = ''
+    detail: str = ''
+
+    @property
+    def message(self):
+        """Human-readable text for display: the resume text or the failure reason."""
+        return self.text if self.ok else ERROR_MESSAGES.get(self.error, ERROR_MESSAGES[CRASHED])
+
+    @classmethod
+    def failure(cls, error, detail='', page_count=0):
+        return cls(ok=False, error=error, detail=detail[:500], page_count=page_count)
+
+
+class _Timeout(BaseException):
+    # Not an Exception, so PyPDF2's own ``except Exception`` blocks cannot swallow it
+    pass
+
+
+def _on_alarm(signum, frame):
+    raise _Timeout()
+
+
+def _rss_bytes():
+    """Return the current resident set size of this process."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * resource.getpagesize()
+    except OSError:
+        # ru_maxrss is the peak in KiB on Linux; good enough where /proc is missing
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def init_worker(max_memory_mb):
+    """
+    Process pool initializer that caps the worker's address space.
+
+    The cap is the worker's current size plus the configured allowance, so it
+    bounds what a single document can allocate without breaking the interpreter.
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            current = int(f.read().split()[0]) * resource.getpagesize()
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        limit = current + max_memory_mb * 1024 * 1024
+        if hard != resource.RLIM_INFINITY:
+            limit = min(limit, hard)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+    except (OSError, ValueError):
+        pass
+
+
+def run_extraction(pdf_path, max_pages, max_memory_mb, timeout):
+    """
+    Extract text from a PDF inside a worker process.
+
+    Args:
+        pdf_path: Path to PDF file
+        max_pages: Documents with more pages are rejected unparsed
+        max_memory_mb: Resident memory allowed before extraction is aborted
+        timeout: Wall-clock seconds allowed for the document
+
+    Returns:
+        ExtractionResult
+    """
+    from PyPDF2 import PdfReader
+
+    if not os.path.exists(pdf_path):
+        return ExtractionResult.failure(NOT_FOUND)
+
+    memory_limit = _rss_bytes() + max_memory_mb * 1024 * 1024
+    previous = signal.signal(signal.SIGALRM, _on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    page_count = 0
+    try:
+        reader = PdfReader(pdf_path)
+        page_count = len(reader.pages)
+        if page_count > max_pages:
+            return ExtractionResult.failure(TOO_MANY_PAGES, page_count=page_count)
+
+        parts = []
+        for page in reader.pages:
+            parts.append(page.extract_text() or '')
+            if _rss_bytes() > memory_limit:
+                return ExtractionResult.failure(MEMORY_LIMIT, page_count=page_count)
+
+        text = '\n'.join(parts).strip()
+        if not text:
+            return ExtractionResult.failure(EMPTY, page_count=page_count)
+        return ExtractionResult(ok=True, text=text, page_count=page_count)
+
+    except _Timeout:
+        return ExtractionResult.failure(TIMEOUT, page_count=page_count)
+    except MemoryError:
+        return ExtractionResult.failure(MEMORY_LIMIT, page_count=page_count)
+    except Exception as e:
+        return ExtractionResult.failure(UNREADABLE, detail=str(e), page_count=page_count)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def file_sha256(path, chunk_size=64 * 1024):
+    """
+    Compute the SHA-256 hex digest of a file without loading it into memory.
+
+    Args:
+        path: Path to the file
+        chunk_size: Number of bytes read per iteration
+
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_and_extract(pdf_path, **limits):
+    """
+    Hash a resume and extract its text inside a worker process.
+
+    Returns:
+        Tuple of (SHA-256 hex digest or None if the file is missing, ExtractionResult)
+    """
+    try:
+        content_hash = file_sha256(pdf_path)
+    except FileNotFoundError:
+        return None, ExtractionResult.failure(NOT_FOUND)
+    return content_hash, run_extraction(pdf_path, **limits)
+
+
+def extraction_limits():
+    """Return the configured per-document limits as run_extraction keyword arguments."""
+    return {
+        'max_pages': settings.RESUME_EXTRACTION_MAX_PAGES,
+        'max_memory_mb': settings.RESUME_EXTRACTION_MAX_MEMORY_MB,
+        'timeout': settings.RESUME_EXTRACTION_TIMEOUT,
+    }
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = create_pool(settings.RESUME_EXTRACTION_WORKERS)
+        return _pool
+
+
+def create_pool(max_workers):
+    """Create a process pool whose workers enforce the configured memory cap."""
+    return ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=init_worker,
+        initargs=(settings.RESUME_EXTRACTION_MAX_MEMORY_MB,),
+    )
+
+
+def kill_pool(pool):
+    """Kill a pool's workers outright, e.g. when one is stuck in native code."""
+    for process in list((getattr(pool, '_processes', None) or {}).values()):
+        process.kill()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        kill_pool(pool)
+
+
+def _wait_for(future, timeout):
+    """
+    Wait for a submitted extraction, timing it from when it starts rather than from submission.
+
+    The worker's alarm bounds a document once it is parsed; the parent only
+    kills the pool when a document has been running far past that, i.e. its
+    worker is stuck where the alarm cannot fire. A future counts as running
+    once it is handed to the pool's call queue, which may hold one document
+    ahead of it, hence twice the limit. A document still queued after the limit
+    is cancelled and reported BUSY, which is not cached.
+
+    Returns:
+        ExtractionResult
+    """
+    deadline = timeout + PARENT_TIMEOUT_GRACE
+    waiting_since = time.monotonic()
+    started = None
+    while True:
+        try:
+            return future.result(timeout=POLL_INTERVAL)
+        except FutureTimeout:
+            now = time.monotonic()
+            if not future.running():
+                if now - waiting_since > deadline and future.cancel():
+                    return ExtractionResult.failure(BUSY)
+                continue
+            started = started or now
+            if now - started > timeout + deadline:
+                _reset_pool()
+                return ExtractionResult.failure(TIMEOUT)
+
+
+@timed('pdf')
+def extract_text_from_pdf(pdf_path):
+    """
+    Extract text content from a PDF resume in the sandboxed worker pool.
+
+    Args:
+        pdf_path: Path to PDF file
+
+    Returns:
+        ExtractionResult; failures carry a reason code in ``error``
+    """
+    if not os.path.exists(pdf_path):
+        return ExtractionResult.failure(NOT_FOUND)
+
+    limits = extraction_limits()
+    try:
+        future = _get_pool().submit(run_extraction, pdf_path, **limits)
+        return _wait_for(future, limits['timeout'])
+    except BrokenProcessPool as e:
+        # A worker died outright, e.g. a crash in native code
+        _reset_pool()
+        return ExtractionResult.failure(CRASHED, detail=str(e))
@@ -2,7 +2,9 @@
 Forms for applicant management.
 """
 from django import forms
+from django.core.validators import FileExtensionValidator
 from .models import Applicant, ApplicantNote
+from .normalization import normalize_phone
 
 
 class ApplicationForm(forms.ModelForm):
@@ -23,6 +25,12 @@ class ApplicationForm(forms.ModelForm):
                 attrs={'class': 'form-control', 'rows': 5, 'placeholder': 'Cover Letter (optional)'}),
         }
 
+    def clean_phone(self):
+        phone = self.cleaned_data['phone']
+        if not normalize_phone(phone):
+            raise forms.ValidationError('Enter a valid phone number.')
+        return phone
+
 
 class ApplicantStatusForm(forms.ModelForm):
     """Form for updating applicant status."""
@@ -43,4 +51,25 @@ class ApplicantNoteForm(forms.ModelForm):
         fields = ['note']
         widgets = {
             'note': forms.Textarea(attrs={'class': 'form-control', 'rows': 3, 'placeholder': 'Add a note...'}),
-        }
\ No newline at end of file
+        }
+
+
+class ImportForm(forms.Form):
+    """Form for uploading job and applicant files to import."""
+
+    jobs_file = forms.FileField(
+        required=False,
+        validators=[FileExtensionValidator(['csv', 'jsonl', 'ndjson'])],
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv,.jsonl,.ndjson'}),
+    )
+    applicants_file = forms.FileField(
+        required=False,
+        validators=[FileExtensionValidator(['csv', 'jsonl', 'ndjson'])],
+        widget=forms.FileInput(attrs={'class': 'form-control', 'accept': '.csv,.jsonl,.ndjson'}),
+    )
+
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('jobs_file') and not cleaned_data.get('applicants_file'):
+            raise forms.ValidationError('Choose a jobs file, an applicants file or both.')
+        return cleaned_data
@@ -0,0 +1,336 @@
+"""
+Bulk import of jobs and applications from CSV or JSON Lines files.
+
+Rows are validated in memory and checked against the ``(applied_job,
+normalized_email)`` and ``(applied_job, normalized_phone)`` constraints with
+one query per batch, then
+inserted with ``bulk_create``. The counter, resume reference, search, task and
+cache side effects that signal handlers apply to single saves are applied
+once per batch instead.
+"""
+import csv
+import json
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+
+from jobs.cache import bump_generation, bump_public_generation
+from jobs.models import Job
+
+from . import search
+from .extraction import EXTRACTOR_VERSION
+from .models import Applicant, ApplicantCount, ResumeBlob, ResumeExtraction, ResumeTask
+from .normalization import normalize_email
+from .storage import content_hash_from_name, get_resume_storage
+from .tasks import RESUME_PIPELINE, enqueue_resume_processing
+
+# Rows validated, deduplicated and inserted together
+BATCH_SIZE = 1000
+
+# Columns read from each kind of row; others are ignored
+JOB_FIELDS = [
+    'title', 'description', 'location', 'employment_type', 'salary_range', 'requirements', 'responsibilities',
+    'deadline', 'is_active',
+]
+APPLICANT_FIELDS = ['first_name', 'last_name', 'email', 'phone', 'linkedin', 'cover_letter', 'status']
+
+# File extensions read as CSV; anything else is read as JSON Lines
+CSV_EXTENSIONS = ('.csv',)
+FILE_EXTENSIONS = ('.csv', '.jsonl', '.ndjson')
+
+
+@dataclass(frozen=True)
+class Rejection:
+    """A row that was not imported."""
+
+    source: str
+    line: int
+    reason: str
+
+
+@dataclass
+class ImportReport:
+    """Numbers of imported jobs and applicants, and the rows rejected."""
+
+    jobs: int = 0
+    applicants: int = 0
+    rejected: list = field(default_factory=list)
+
+    def reject(self, source, line, reason):
+        self.rejected.append(Rejection(source, line, reason))
+
+
+def read_rows(file, source):
+    """
+    Read rows from a CSV or JSON Lines text file.
+
+    Args:
+        file: Text file object
+        source: File name; a ``.csv`` extension selects CSV, any other JSON Lines
+
+    Yields:
+        (line number, row) pairs; row is None for a line that is not a JSON object
+    """
+    if source.lower().endswith(CSV_EXTENSIONS):
+        reader = csv.DictReader(file)
+        for row in reader:
+            yield reader.line_num, row
+        return
+    for number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield number, row if isinstance(row, dict) else None
+
+
+def _values(row, names):
+    """Return the non-blank values of a row's known columns."""
+    values = {}
+    for name in names:
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value not in (None, ''):
+            values[name] = value
+    return values
+
+
+def _error_text(error):
+    if hasattr(error, 'message_dict'):
+        return '; '.join(f"{name}: {' '.join(messages)}" for name, messages in error.message_dict.items())
+    return ' '.join(error.messages)
+
+
+class Importer:
+    """
+    Import jobs and applications for one recruiter.
+
+    Jobs are created for the recruiter; an optional ``ref`` column names a job
+    so applicant rows in the same import can point at it with ``job_ref``.
+    Applicant rows may instead give the id of an existing job of the recruiter
+    in ``job``. The ``resume`` column is a path relative to ``resume_root``;
+    paths resolving outside it are rejected.
+    """
+
+    def __init__(self, recruiter, resume_root=None, batch_size=BATCH_SIZE):
+        self.recruiter = recruiter
+        self.resume_root = Path(resume_root).resolve() if resume_root else None
+        self.batch_size = batch_size
+        self.report = ImportReport()
+        self.job_refs = {}
+        self.job_ids = set(Job.objects.filter(created_by=recruiter).values_list('pk', flat=True))
+        self.storage = get_resume_storage()
+        self.stored = {}
+
+    def import_jobs(self, file, source):
+        """Create the jobs listed in a file."""
+        batch = []
+        refs = set()
+        for line, row in read_rows(file, source):
+            if row is None:
+                self.report.reject(source, line, 'not a JSON object')
+                continue
+            ref = str(row.get('ref') or '').strip()
+            if ref and (ref in refs or ref in self.job_refs):
+                self.report.reject(source, line, f'duplicate job ref {ref}')
+                continue
+            job = Job(created_by=self.recruiter, **_values(row, JOB_FIELDS))
+            try:
+                job.full_clean(exclude=['created_by'], validate_unique=False, validate_constraints=False)
+            except ValidationError as e:
+                self.report.reject(source, line, _error_text(e))
+                continue
+            if ref:
+                refs.add(ref)
+            batch.append((ref, job))
+            if len(batch) == self.batch_size:
+                self._insert_jobs(batch)
+                batch = []
+        if batch:
+            self._insert_jobs(batch)
+
+    def _insert_jobs(self, batch):
+        jobs = Job.objects.bulk_create([job for _, job in batch])
+        for (ref, _), job in zip(batch, jobs):
+            self.job_ids.add(job.pk)
+            if ref:
+                self.job_refs[ref] = job.pk
+        self.report.jobs += len(jobs)
+
+    def import_applicants(self, file, source):
+        """Create the applications listed in a file, skipping duplicates."""
+        batch = []
+        for line, row in read_rows(file, source):
+            try:
+                batch.append((line, *self._build_applicant(row)))
+            except (ValidationError, ValueError) as e:
+                self.report.reject(source, line, _error_text(e) if isinstance(e, ValidationError) else str(e))
+                continue
+            if len(batch) == self.batch_size:
+                self._insert_applicants(batch, source)
+                batch = []
+        if batch:
+            self._insert_applicants(batch, source)
+
+    def _build_applicant(self, row):
+        """Validate a row; returns the unsaved applicant and its resume path."""
+        if row is None:
+            raise ValueError('not a JSON object')
+        ref = str(row.get('job_ref') or '').strip()
+        job = str(row.get('job') or '').strip()
+        if ref:
+            if ref not in self.job_refs:
+                raise ValueError(f'unknown job ref {ref}')
+            job_id = self.job_refs[ref]
+        elif job.isdigit() and int(job) in self.job_ids:
+            job_id = int(job)
+        else:
+            raise ValueError(f'job {job} is not one of your jobs' if job else 'no job or job_ref given')
+
+        applicant = Applicant(applied_job_id=job_id, recruiter_id=self.recruiter.pk, **_values(row, APPLICANT_FIELDS))
+        applicant.full_clean(
+            exclude=['applied_job', 'recruiter', 'resume'], validate_unique=False, validate_constraints=False
+        )
+        applicant.normalize_contacts()
+        if not applicant.normalized_phone:
+            raise ValueError('phone: Enter a valid phone number.')
+        return applicant, self._resume_path(str(row.get('resume') or '').strip())
+
+    def _resume_path(self, value):
+        if not value:
+            raise ValueError('resume: This field is required.')
+        if self.resume_root is None:
+            raise ValueError('resume: no resume directory is configured for imports')
+        path = (self.resume_root / value).resolve()
+        if not path.is_relative_to(self.resume_root):
+            raise ValueError(f'resume: {value} is outside the resume directory')
+        if not path.is_file():
+            raise ValueError(f'resume: {value} does not exist')
+        return path
+
+    def _store_resume(self, path):
+        """Store a resume file once per import; returns its storage name."""
+        if path not in self.stored:
+            with path.open('rb') as resume:
+                self.stored[path] = self.storage.save(f'resumes/{path.name}', File(resume))
+        return self.stored[path]
+
+    def _insert_applicants(self, batch, source):
+        """Drop duplicates from a batch, then insert the rest with their side effects."""
+        taken = set()
+        existing = Applicant.objects.filter(applied_job_id__in={a.applied_job_id for _, a, _ in batch}).filter(
+            Q(normalized_email__in={a.normalized_email for _, a, _ in batch})
+            | Q(normalized_phone__in={a.normalized_phone for _, a, _ in batch})
+        ).order_by().values_list('applied_job_id', 'normalized_email', 'normalized_phone')
+        for job_id, email, phone in existing:
+            taken.update([(job_id, 'email', email), (job_id, 'phone', phone)])
+
+        recruiter_email = normalize_email(self.recruiter.email)
+        accepted = []
+        for line, applicant, path in batch:
+            keys = [(applicant.applied_job_id, 'email', applicant.normalized_email),
+                    (applicant.applied_job_id, 'phone', applicant.normalized_phone)]
+            if recruiter_email and applicant.normalized_email == recruiter_email:
+                self.report.reject(source, line, "uses the recruiter's email address")
+            elif keys[0] in taken:
+                self.report.reject(source, line, f'already applied to job {applicant.applied_job_id} '
+                                                 f'with email {applicant.email}')
+            elif keys[1] in taken:
+                self.report.reject(source, line, f'already applied to job {applicant.applied_job_id} '
+                                                 f'with phone number {applicant.phone}')
+            else:
+                try:
+                    applicant.resume = self._store_resume(path)
+                except OSError as e:
+                    self.report.reject(source, line, f'resume: {e}')
+                    continue
+                applicant.resume_hash = content_hash_from_name(applicant.resume.name) or ''
+                taken.update(keys)
+                accepted.append((line, applicant))
+
+        try:
+            with transaction.atomic():
+                self._bulk_insert([applicant for _, applicant in accepted])
+        except IntegrityError:
+            # Someone applied meanwhile; save one by one so only the clashing rows are lost
+            self._insert_one_by_one(accepted, source)
+            self._discard_unused_resumes({applicant.resume.name for _, applicant in accepted})
+
+    def _bulk_insert(self, applicants):
+        if not applicants:
+            return
+        extracted = set(ResumeExtraction.objects.filter(
+            content_hash__in={a.resume_hash for a in applicants if a.resume_hash},
+            extractor_version=EXTRACTOR_VERSION,
+        ).values_list('content_hash', flat=True))
+        for applicant in applicants:
+            pending = applicant.resume.name.endswith('.pdf') and applicant.resume_hash not in extracted
+            applicant.processing_status = 'pending' if pending else 'ready'
+
+        created = Applicant.objects.bulk_create(applicants)
+        for (job_id, status), count in Counter((a.applied_job_id, a.status) for a in created).items():
+            ApplicantCount.adjust(job_id, status, count)
+        ResumeBlob.acquire_many(Counter(a.resume.name for a in created))
+        search.index_applicants([a.pk for a in created])
+        ResumeTask.objects.bulk_create([
+            ResumeTask(applicant_id=a.pk, kind=kind)
+            for a in created if a.processing_status == 'pending'
+            for kind in RESUME_PIPELINE
+        ])
+        self.report.applicants += len(created)
+
+    def _insert_one_by_one(self, accepted, source):
+        for line, applicant in accepted:
+            applicant.pk = None
+            try:
+                with transaction.atomic():
+                    applicant.save()
+                    enqueue_resume_processing(applicant)
+            except IntegrityError:
+                self.report.reject(source, line, f'already applied to job {applicant.applied_job_id}')
+                continue
+            self.report.applicants += 1
+
+    def _discard_unused_resumes(self, names):
+        """Delete stored resumes that no inserted application ended up referencing."""
+        used = set(ResumeBlob.objects.filter(name__in=names).values_list('name', flat=True))
+        for name in names - used:
+            ResumeBlob.delete_orphan(name, self.storage)
+        self.stored = {path: name for path, name in self.stored.items() if name not in names - used}
+
+    def finish(self):
+        """Invalidate the cached pages the import changed; returns the report."""
+        if self.report.jobs or self.report.applicants:
+            bump_generation(self.recruiter.pk)
+            bump_public_generation()
+        return self.report
+
+
+def import_files(recruiter, jobs=None, applicants=None, resume_root=None, batch_size=BATCH_SIZE):
+    """
+    Import a jobs file and an applicants file, jobs first.
+
+    Args:
+        recruiter: User the jobs are created for and whose jobs applicants may reference
+        jobs: Optional (text file, file name) pair of job rows
+        applicants: Optional (text file, file name) pair of applicant rows
+        resume_root: Directory resume paths are resolved in, or None to reject every resume
+        batch_size: Rows inserted together
+
+    Returns:
+        ImportReport
+    """
+    importer = Importer(recruiter, resume_root, batch_size)
+    if jobs:
+        importer.import_jobs(*jobs)
+    if applicants:
+        importer.import_applicants(*applicants)
+    return importer.finish()
@@ -0,0 +1,183 @@
+"""
+Management command that benchmarks the main views against the current database.
+"""
+import json
+import math
+import random
+import time
+from datetime import date
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+
+from applicants import sample_data
+from applicants.models import Applicant
+from jobs.models import Job
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'baseline.json'
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples, p):
+    """Nearest-rank percentile of a list of numbers."""
+    ordered = sorted(samples)
+    return ordered[max(math.ceil(p / 100 * len(ordered)) - 1, 0)]
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = 'Measure latency percentiles and query counts of the main views and compare them with a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=30, help='Measured requests per view')
+        parser.add_argument('--warmup', type=int, default=3, help='Unmeasured requests per view first')
+        parser.add_argument('--username', help='Recruiter to sign in as (default: the one with the most jobs)')
+        parser.add_argument('--no-cache', action='store_true', help='Clear the cache before every request')
+        parser.add_argument('--baseline', default=str(DEFAULT_BASELINE), help='Baseline JSON file')
+        parser.add_argument('--save-baseline', action='store_true',
+                            help='Store these results as the new baseline instead of comparing')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed p95 slowdown over the baseline, as a fraction')
+        parser.add_argument('--min-delta-ms', type=float, default=2.0,
+                            help='Ignore p95 slowdowns smaller than this, which are timer noise on fast views')
+
+    def handle(self, *args, **options):
+        recruiter = self.get_recruiter(options['username'])
+        job = Job.objects.filter(
+            created_by=recruiter, is_active=True, deadline__gte=date.today()
+        ).order_by('-created_at').first()
+        applicant = Applicant.objects.filter(recruiter=recruiter).order_by('-applied_at', '-id').first()
+        if job is None or applicant is None:
+            raise CommandError(f'{recruiter.username} needs an open job and applicants; '
+                               f'generate some with load_sample_data --recruiters')
+
+        # Clients are reused: each one builds the middleware chain once, which is slow
+        recruiter_client = Client()
+        recruiter_client.force_login(recruiter)
+        visitor = Client()
+        resume, _ = sample_data.resume_pdf('benchmark')
+        serial = iter(range(10 ** 9))
+
+        def visit(url):
+            visitor.cookies.clear()
+            return visitor.get(url, secure=True)
+
+        def apply():
+            # A new visitor each time (the view rate-limits per session); the row is rolled back
+            visitor.cookies.clear()
+            fields = sample_data.applicant_fields(random.Random(0), next(serial))
+            fields.update(resume=SimpleUploadedFile('resume.pdf', resume, content_type='application/pdf'),
+                          linkedin=fields['linkedin'] or '')
+            fields.pop('status')
+            try:
+                with transaction.atomic():
+                    response = visitor.post(reverse('applicants:apply', args=[job.pk]), fields, secure=True)
+                    raise _Rollback(response)
+            except _Rollback as rollback:
+                response = rollback.args[0]
+            if response.get('Location') != reverse('applicants:application_success'):
+                raise CommandError('The benchmark application was not accepted')
+            return response
+
+        views = {
+            'job_list': lambda: visit(reverse('jobs:job_list')),
+            'dashboard': lambda: recruiter_client.get(reverse('jobs:dashboard'), secure=True),
+            'applicant_list': lambda: recruiter_client.get(reverse('applicants:applicant_list'), secure=True),
+            'applicant_detail': lambda: recruiter_client.get(
+                reverse('applicants:applicant_detail', args=[applicant.pk]), secure=True),
+            'apply': apply,
+        }
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']):
+            for name, request in views.items():
+                results[name] = self.measure(name, request, options)
+
+        scale = {
+            'jobs': Job.objects.count(),
+            'applicants': Applicant.objects.count(),
+            'recruiter_applicants': Applicant.objects.filter(recruiter=recruiter).count(),
+        }
+        self.report(results, scale)
+
+        path = Path(options['baseline'])
+        if options['save_baseline']:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps({'scale': scale, 'views': results}, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'Baseline saved to {path}'))
+        elif path.exists():
+            self.compare(results, scale, json.loads(path.read_text()), options['tolerance'], options['min_delta_ms'])
+        else:
+            self.stdout.write(f'No baseline at {path}; store one with --save-baseline')
+
+    def get_recruiter(self, username):
+        if username:
+            try:
+                return User.objects.get(username=username)
+            except User.DoesNotExist:
+                raise CommandError(f'User {username} does not exist')
+        owner = Job.objects.values('created_by').order_by().annotate(n=Count('id')).order_by('-n').first()
+        if owner is None:
+            raise CommandError('No jobs found; generate data with load_sample_data --recruiters first')
+        return User.objects.get(pk=owner['created_by'])
+
+    def measure(self, name, request, options):
+        """Run one view's requests and summarize their latency and query counts."""
+        latencies = []
+        queries = []
+        for i in range(options['warmup'] + options['requests']):
+            if options['no_cache']:
+                cache.clear()
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                response = request()
+                elapsed = time.perf_counter() - started
+            if response.status_code >= 400:
+                raise CommandError(f'{name} returned HTTP {response.status_code}')
+            if i >= options['warmup']:
+                latencies.append(elapsed * 1000)
+                queries.append(len(captured))
+        return {
+            **{f'p{p}_ms': round(percentile(latencies, p), 2) for p in PERCENTILES},
+            'queries': max(queries),
+        }
+
+    def report(self, results, scale):
+        self.stdout.write(f"Scale: {scale['jobs']} jobs, {scale['applicants']} applicants "
+                          f"({scale['recruiter_applicants']} for the signed-in recruiter)")
+        self.stdout.write(f"{'view':<18}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'queries':>9}")
+        for name, result in results.items():
+            self.stdout.write(f"{name:<18}{result['p50_ms']:>10.1f}{result['p95_ms']:>10.1f}"
+                              f"{result['p99_ms']:>10.1f}{result['queries']:>9}")
+
+    def compare(self, results, scale, baseline, tolerance, min_delta_ms):
+        """Report views slower or issuing more queries than the baseline; fails if any regressed."""
+        if baseline.get('scale') != scale:
+            self.stdout.write(self.style.WARNING(f"Baseline was taken at a different scale: {baseline.get('scale')}"))
+        regressions = []
+        for name, result in results.items():
+            expected = baseline['views'].get(name)
+            if expected is None:
+                continue
+            allowed = max(expected['p95_ms'] * (1 + tolerance), expected['p95_ms'] + min_delta_ms)
+            if result['p95_ms'] > allowed:
+                regressions.append(f"{name}: p95 {result['p95_ms']:.1f} ms, baseline {expected['p95_ms']:.1f} ms")
+            if result['queries'] > expected['queries']:
+                regressions.append(f"{name}: {result['queries']} queries, baseline {expected['queries']}")
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(regression))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against the baseline')
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
@@ -0,0 +1,76 @@
+"""
+Management command that bulk-imports jobs and applications from CSV or JSON Lines files.
+"""
+import csv
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from applicants.importer import BATCH_SIZE, FILE_EXTENSIONS, import_files
+
+
+class Command(BaseCommand):
+    help = 'Import jobs and applicants (with resume files) for a recruiter from CSV or JSON Lines files'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiter', required=True, help='Username the jobs are imported for')
+        parser.add_argument('--jobs', help='CSV or JSON Lines file of jobs')
+        parser.add_argument('--applicants', help='CSV or JSON Lines file of applicants')
+        parser.add_argument('--resume-root', default=None,
+                            help='Directory resume paths are relative to (default: IMPORT_RESUME_ROOT, '
+                                 'else the directory of the applicants file)')
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Rows per bulk insert')
+        parser.add_argument('--report', help='Write the rejected rows and their reasons to this CSV file')
+
+    def handle(self, *args, **options):
+        try:
+            recruiter = User.objects.get(username=options['recruiter'])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['recruiter']} does not exist")
+        if not options['jobs'] and not options['applicants']:
+            raise CommandError('Give --jobs, --applicants or both')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+
+        paths = {}
+        for name in ('jobs', 'applicants'):
+            if options[name]:
+                path = Path(options[name])
+                if not path.is_file():
+                    raise CommandError(f'{path} does not exist')
+                if not path.name.lower().endswith(FILE_EXTENSIONS):
+                    raise CommandError(f'{path} is not a .csv, .jsonl or .ndjson file')
+                paths[name] = path
+
+        resume_root = options['resume_root'] or settings.IMPORT_RESUME_ROOT
+        if resume_root is None and 'applicants' in paths:
+            resume_root = paths['applicants'].parent
+
+        files = {name: path.open(encoding='utf-8-sig', newline='') for name, path in paths.items()}
+        try:
+            report = import_files(
+                recruiter,
+                jobs=(files['jobs'], paths['jobs'].name) if 'jobs' in files else None,
+                applicants=(files['applicants'], paths['applicants'].name) if 'applicants' in files else None,
+                resume_root=resume_root,
+                batch_size=options['batch_size'],
+            )
+        finally:
+            for file in files.values():
+                file.close()
+
+        for rejection in report.rejected[:20]:
+            self.stdout.write(self.style.WARNING(f'{rejection.source}:{rejection.line}: {rejection.reason}'))
+        if len(report.rejected) > 20:
+            self.stdout.write(f'... and {len(report.rejected) - 20} more rejected row(s)')
+        if options['report']:
+            with open(options['report'], 'w', newline='') as out:
+                writer = csv.writer(out)
+                writer.writerow(['source', 'line', 'reason'])
+                writer.writerows((r.source, r.line, r.reason) for r in report.rejected)
+        self.stdout.write(self.style.SUCCESS(
+            f'Imported {report.jobs} job(s) and {report.applicants} applicant(s); '
+            f'{len(report.rejected)} row(s) rejected'
+        ))
@@ -1,18 +1,50 @@
 """
-Management command to load sample data for testing.
+Management command to load sample data for testing, or to generate it at scale.
 """
-from django.core.management.base import BaseCommand
+import random
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.core.files.base import ContentFile
+from django.db import transaction
 from datetime import date, timedelta
+from jobs.cache import bump_generation, bump_public_generation
 from jobs.models import Job
-from applicants.models import Applicant
+from applicants import sample_data, search
+from applicants.extraction import EXTRACTOR_VERSION, extract_text_from_pdf
+from applicants.models import Applicant, ApplicantCount, ApplicantNote, ResumeBlob, ResumeExtraction
+from applicants.storage import content_hash_from_name, get_resume_storage
+
+GENERATED_USERNAME_PREFIX = 'loadtest'
 
 
 class Command(BaseCommand):
-    help = 'Load sample jobs and applicants for testing'
+    help = 'Load sample jobs and applicants for testing, or generate synthetic data at scale with --recruiters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--recruiters', type=int, default=None,
+                            help='Generate this many recruiters with synthetic jobs and applicants '
+                                 'instead of the small demo set')
+        parser.add_argument('--jobs', type=int, default=10, help='Jobs per generated recruiter')
+        parser.add_argument('--applicants', type=int, default=100, help='Applicants per generated job')
+        parser.add_argument('--notes', type=int, default=0, help='Notes per generated applicant')
+        parser.add_argument('--resumes', type=int, default=50,
+                            help='Distinct synthetic PDF resumes shared by the generated applicants')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Rows per bulk insert')
+        parser.add_argument('--seed', type=int, default=0, help='Random seed; equal seeds generate equal data')
+
+    def handle(self, *args, **options):
+        if options['recruiters'] is None:
+            self.load_demo()
+            return
+        # One transaction, so an interrupted run leaves no applicants without counters
+        with transaction.atomic():
+            self.generate(options)
 
-    def handle(self, *args, **kwargs):
+    def load_demo(self):
         # Create sample recruiter
         recruiter, created = User.objects.get_or_create(
             username='recruiter',
@@ -137,4 +169,116 @@ class Command(BaseCommand):
                 ))
 
         self.stdout.write(self.style.SUCCESS('Sample data loaded successfully!'))
-        self.stdout.write(f'Login with: username=recruiter, password=recruiter123')
\ No newline at end of file
+        self.stdout.write(f'Login with: username=recruiter, password=recruiter123')
+
+    def generate(self, options):
+        """Bulk-insert synthetic recruiters, jobs, applicants and notes."""
+        for name in ('recruiters', 'jobs', 'applicants', 'notes', 'batch_size'):
+            if options[name] < 0 or (name == 'batch_size' and not options[name]):
+                raise CommandError(f'--{name.replace("_", "-")} must be positive')
+        if options['resumes'] < 1:
+            raise CommandError('--resumes must be at least 1')
+
+        started = time.monotonic()
+        rng = random.Random(options['seed'])
+        batch_size = options['batch_size']
+        resumes = self.build_resume_corpus(options['resumes'], options['seed'])
+
+        # Recruiters; password hashing is slow, so every generated account shares one hash
+        offset = User.objects.filter(username__startswith=GENERATED_USERNAME_PREFIX).count()
+        password = make_password('recruiter123')
+        recruiters = User.objects.bulk_create([
+            User(username=f'{GENERATED_USERNAME_PREFIX}{offset + i + 1}', password=password,
+                 email=f'{GENERATED_USERNAME_PREFIX}{offset + i + 1}@example.com',
+                 first_name=rng.choice(sample_data.FIRST_NAMES), last_name=rng.choice(sample_data.LAST_NAMES))
+            for i in range(options['recruiters'])
+        ], batch_size=batch_size)
+
+        jobs = Job.objects.bulk_create([
+            Job(created_by=recruiter, deadline=date.today() + timedelta(days=rng.randint(-10, 90)),
+                is_active=rng.random() < 0.9, **sample_data.job_fields(rng))
+            for recruiter in recruiters
+            for _ in range(options['jobs'])
+        ], batch_size=batch_size)
+        self.stdout.write(f'Created {len(recruiters)} recruiters and {len(jobs)} jobs')
+
+        # Applicants, in batches; counters, blob references and search rows are
+        # written here because bulk_create skips the signal handlers that keep them
+        counts = Counter()
+        blob_refs = Counter()
+        total = len(jobs) * options['applicants']
+        created = notes = 0
+        batch = []
+        for job in jobs:
+            for _ in range(options['applicants']):
+                resume_name, content_hash = rng.choice(resumes)
+                applicant = Applicant(
+                    applied_job_id=job.pk, recruiter_id=job.created_by_id, resume=resume_name,
+                    resume_hash=content_hash, processing_status='ready',
+                    **sample_data.applicant_fields(rng, created + len(batch))
+                )
+                applicant.normalize_contacts()
+                counts[job.pk, applicant.status] += 1
+                blob_refs[resume_name] += 1
+                batch.append(applicant)
+                if len(batch) == batch_size:
+                    notes += self.insert_applicants(batch, options['notes'], rng)
+                    created += len(batch)
+                    batch = []
+                    self.stdout.write(f'{created}/{total} applicants')
+        if batch:
+            notes += self.insert_applicants(batch, options['notes'], rng)
+            created += len(batch)
+
+        ApplicantCount.objects.bulk_create(
+            [ApplicantCount(job_id=job_id, status=status, count=count) for (job_id, status), count in counts.items()],
+            batch_size=batch_size,
+        )
+        ResumeBlob.acquire_many(blob_refs)
+
+        for recruiter in recruiters:
+            bump_generation(recruiter.pk)
+        bump_public_generation()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Generated {len(recruiters)} recruiters, {len(jobs)} jobs, {created} applicants and {notes} notes '
+            f'in {time.monotonic() - started:.1f}s'
+        ))
+        if recruiters:
+            self.stdout.write(f'Login with: username={recruiters[0].username}, password=recruiter123')
+
+    def build_resume_corpus(self, count, seed):
+        """
+        Store ``count`` synthetic PDF resumes and their extracted text.
+
+        Returns:
+            List of (storage name, content hash) pairs
+        """
+        storage = get_resume_storage()
+        corpus = []
+        for i in range(count):
+            pdf, _ = sample_data.resume_pdf(f'{seed}:{i}')
+            name = storage.save('resumes/resume.pdf', ContentFile(pdf))
+            content_hash = content_hash_from_name(name)
+            if not ResumeExtraction.objects.filter(content_hash=content_hash,
+                                                   extractor_version=EXTRACTOR_VERSION).exists():
+                ResumeExtraction.objects.get_or_create(
+                    content_hash=content_hash,
+                    extractor_version=EXTRACTOR_VERSION,
+                    defaults=ResumeExtraction.fields_from_result(extract_text_from_pdf(storage.path(name)))
+                )
+            corpus.append((name, content_hash))
+        self.stdout.write(f'Prepared {count} synthetic resumes')
+        return corpus
+
+    def insert_applicants(self, batch, notes_each, rng):
+        """Insert a batch of applicants with their search rows and notes; returns the note count."""
+        applicants = Applicant.objects.bulk_create(batch)
+        search.index_applicants([applicant.pk for applicant in applicants])
+        notes = ApplicantNote.objects.bulk_create([
+            ApplicantNote(applicant_id=applicant.pk, created_by_id=applicant.recruiter_id,
+                          note=sample_data.note_text(rng))
+            for applicant in applicants
+            for _ in range(notes_each)
+        ], batch_size=len(batch))
+        return len(notes)
@@ -0,0 +1,60 @@
+"""
+Management command that runs the background resume-processing worker.
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from applicants.tasks import (
+    claim_screening_run, default_worker_id, process_available, requeue_stale_screening_runs, requeue_stale_tasks,
+    run_screening, sweep_orphaned_resumes, sweep_unreferenced_resumes,
+)
+
+# Seconds between scans of the resume directory for files that never got a blob row
+ORPHAN_SWEEP_INTERVAL = 3600
+
+
+class Command(BaseCommand):
+    help = 'Process queued resume tasks (run alongside the web process)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Drain the queue once and exit instead of polling')
+        parser.add_argument('--sleep', type=float, default=2.0,
+                            help='Seconds to wait between polls when the queue is empty')
+        parser.add_argument('--worker-id', default=None,
+                            help='Identifier recorded on claimed tasks')
+
+    def handle(self, *args, **options):
+        worker_id = options['worker_id'] or default_worker_id()
+        self.stdout.write(f'Worker {worker_id} started')
+
+        next_orphan_sweep = 0
+        try:
+            while True:
+                requeue_stale_tasks()
+                requeue_stale_screening_runs()
+                processed = process_available(worker_id)
+                run = claim_screening_run(worker_id)
+                if run:
+                    self.stdout.write(f'Screening applicants for job {run.job_id}')
+                    run_screening(run)
+                    processed += 1
+                if processed:
+                    self.stdout.write(f'Processed {processed} task(s)')
+                removed = sweep_unreferenced_resumes()
+                if removed:
+                    self.stdout.write(f'Removed {removed} unreferenced resume file(s)')
+                if time.monotonic() >= next_orphan_sweep:
+                    next_orphan_sweep = time.monotonic() + ORPHAN_SWEEP_INTERVAL
+                    orphaned = sweep_orphaned_resumes()
+                    if orphaned:
+                        self.stdout.write(f'Removed {orphaned} orphaned resume file(s)')
+                if options['once']:
+                    break
+                if not processed:
+                    time.sleep(options['sleep'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS(f'Worker {worker_id} stopped'))
@@ -0,0 +1,61 @@
+"""
+Management command that repairs drift in the per-job applicant counters.
+"""
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from applicants.models import Applicant, ApplicantCount
+from jobs.cache import bump_generation, bump_public_generation
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = 'Recount applicants per job and status and fix counters that drifted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Report drifted counters without changing them')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            actual = {
+                (row['applied_job_id'], row['status']): row['n']
+                for row in Applicant.objects.order_by().values('applied_job_id', 'status').annotate(n=Count('id'))
+            }
+            stored = {
+                (job_id, status): count
+                for job_id, status, count in ApplicantCount.objects.select_for_update().values_list(
+                    'job_id', 'status', 'count'
+                )
+            }
+
+            fixes = {key: count for key, count in actual.items() if stored.get(key) != count}
+            stale = [key for key in stored if key not in actual and stored[key]]
+            for (job_id, status), count in fixes.items():
+                self.stdout.write(f'Job {job_id} {status}: {stored.get((job_id, status), 0)} -> {count}')
+            for job_id, status in stale:
+                self.stdout.write(f'Job {job_id} {status}: {stored[(job_id, status)]} -> 0')
+
+            if not options['dry_run']:
+                ApplicantCount.objects.bulk_create(
+                    [ApplicantCount(job_id=job_id, status=status, count=count)
+                     for (job_id, status), count in fixes.items()],
+                    update_conflicts=True,
+                    unique_fields=['job', 'status'],
+                    update_fields=['count'],
+                    batch_size=1000,
+                )
+                for job_id, status in stale:
+                    ApplicantCount.objects.filter(job_id=job_id, status=status).update(count=0)
+
+                # Counters were written directly, so drop the pages that show them
+                job_ids = {job_id for job_id, _ in [*fixes, *stale]}
+                for owner_id in set(Job.objects.filter(pk__in=job_ids).values_list('created_by_id', flat=True)):
+                    bump_generation(owner_id)
+                if job_ids:
+                    bump_public_generation()
+
+        drifted = len(fixes) + len(stale)
+        verb = 'Found' if options['dry_run'] else 'Fixed'
+        self.stdout.write(self.style.SUCCESS(f'{verb} {drifted} drifted counter(s)'))
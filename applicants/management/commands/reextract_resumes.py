@@ -0,0 +1,155 @@
+"""
+Management command to re-extract resume text in bulk across a process pool.
+"""
+import os
+import time
+from concurrent.futures import CancelledError, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand
+
+from applicants import search
+from applicants.extraction import (
+    EXTRACTOR_VERSION, PARENT_TIMEOUT_GRACE, TIMEOUT, TRANSIENT_ERRORS, ExtractionResult,
+    create_pool, extraction_limits, hash_and_extract, kill_pool,
+)
+from applicants.models import Applicant, ResumeExtraction
+
+
+class Command(BaseCommand):
+    help = 'Re-extract resume text for all applicants in parallel (backfill)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Applicants loaded and written back per batch')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                            help='Extraction processes (defaults to the CPU count)')
+        parser.add_argument('--start-after', type=int, default=None,
+                            help='Only process applicants with a primary key above this one')
+        parser.add_argument('--checkpoint', default=None,
+                            help='File recording the last finished primary key; resumed from if present')
+        parser.add_argument('--force', action='store_true',
+                            help='Re-extract even when a result for the current extractor version exists')
+
+    def handle(self, *args, **options):
+        checkpoint = options['checkpoint']
+        last_pk = options['start_after']
+        if last_pk is None and checkpoint and os.path.exists(checkpoint):
+            with open(checkpoint) as f:
+                last_pk = int(f.read().strip() or 0)
+            self.stdout.write(f'Resuming after applicant {last_pk}')
+        last_pk = last_pk or 0
+
+        limits = extraction_limits()
+        pool = create_pool(options['workers'])
+        started = time.monotonic()
+        documents = pages = failures = 0
+        # Key before the first resume lost to a crashed worker; the checkpoint never passes it
+        retry_after = None
+
+        try:
+            while True:
+                chunk = list(
+                    Applicant.objects.filter(pk__gt=last_pk)
+                    .order_by('pk')
+                    .only('pk', 'resume', 'resume_hash')[:options['chunk_size']]
+                )
+                if not chunk:
+                    break
+
+                todo = [a for a in chunk if a.resume.name.endswith('.pdf')]
+                if not options['force']:
+                    todo = self._without_current_extraction(todo)
+
+                futures = {applicant.pk: pool.submit(hash_and_extract, applicant.resume.path, **limits)
+                           for applicant in todo}
+                extractions = {}
+                finished = []
+                for i, applicant in enumerate(todo):
+                    try:
+                        content_hash, result = futures[applicant.pk].result(
+                            timeout=limits['timeout'] + PARENT_TIMEOUT_GRACE
+                        )
+                    except FutureTimeout:
+                        # A worker is stuck in native code; replace the whole pool and
+                        # resubmit the chunk's resumes the old one had not finished
+                        kill_pool(pool)
+                        pool = create_pool(options['workers'])
+                        self._resubmit(pool, todo[i + 1:], futures, limits)
+                        content_hash, result = applicant.resume_hash or None, ExtractionResult.failure(TIMEOUT)
+                    except (BrokenProcessPool, CancelledError):
+                        # A worker crashed and broke the pool. Leave this resume unchanged and
+                        # hold the checkpoint before it so a later run retries it
+                        if retry_after is None:
+                            retry_after = applicant.pk - 1
+                        kill_pool(pool)
+                        pool = create_pool(options['workers'])
+                        self._resubmit(pool, todo[i + 1:], futures, limits)
+                        continue
+
+                    finished.append(applicant)
+                    documents += 1
+                    pages += result.page_count
+                    failures += not result.ok
+                    applicant.processing_status = 'ready' if result.ok else 'failed'
+                    if content_hash:
+                        applicant.resume_hash = content_hash
+                        if result.error not in TRANSIENT_ERRORS:
+                            extractions[content_hash] = ResumeExtraction(
+                                content_hash=content_hash,
+                                extractor_version=EXTRACTOR_VERSION,
+                                **ResumeExtraction.fields_from_result(result)
+                            )
+
+                ResumeExtraction.objects.bulk_create(
+                    extractions.values(),
+                    update_conflicts=True,
+                    unique_fields=['content_hash', 'extractor_version'],
+                    update_fields=['text', 'page_count', 'success', 'error', 'term_counts'],
+                )
+                Applicant.objects.bulk_update(finished, ['resume_hash', 'processing_status'])
+                # Bulk writes skip signals, so refresh the search index for the chunk at once,
+                # including applicants elsewhere that share a re-extracted resume and are skipped
+                sharing = Applicant.objects.filter(resume_hash__in=extractions).values_list('pk', flat=True)
+                search.index_applicants({applicant.pk for applicant in finished}.union(sharing))
+
+                last_pk = chunk[-1].pk
+                if checkpoint:
+                    with open(checkpoint, 'w') as f:
+                        f.write(str(last_pk if retry_after is None else retry_after))
+                self._report(documents, pages, failures, started, last_pk)
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Done: {self._throughput(documents, pages, failures, started)}'
+        ))
+        if retry_after is not None:
+            self.stdout.write(self.style.WARNING(
+                f'Resumes after applicant {retry_after} were lost to a crashed worker and left unchanged; '
+                f'a run resumed from the checkpoint retries them'
+            ))
+
+    @staticmethod
+    def _resubmit(pool, applicants, futures, limits):
+        """Submit again to ``pool`` the applicants whose futures did not complete with a result."""
+        for applicant in applicants:
+            future = futures[applicant.pk]
+            if future.cancelled() or not future.done() or future.exception() is not None:
+                futures[applicant.pk] = pool.submit(hash_and_extract, applicant.resume.path, **limits)
+
+    def _without_current_extraction(self, applicants):
+        """Drop applicants whose resume already has a result for the current extractor."""
+        hashes = {a.resume_hash for a in applicants if a.resume_hash}
+        done = set(ResumeExtraction.objects.filter(
+            content_hash__in=hashes, extractor_version=EXTRACTOR_VERSION
+        ).values_list('content_hash', flat=True))
+        return [a for a in applicants if a.resume_hash not in done]
+
+    def _throughput(self, documents, pages, failures, started):
+        elapsed = max(time.monotonic() - started, 1e-9)
+        return (f'{documents} documents ({failures} failed), {pages} pages in {elapsed:.1f}s '
+                f'- {documents / elapsed:.1f} docs/s, {pages / elapsed:.1f} pages/s')
+
+    def _report(self, documents, pages, failures, started, last_pk):
+        self.stdout.write(f'[pk {last_pk}] {self._throughput(documents, pages, failures, started)}')
@@ -0,0 +1,60 @@
+"""
+Management command to AI-screen all pending applicants of a job.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from applicants.ai import FakeBackend, build_provider, get_provider
+from applicants.screening import screen_job
+from jobs.models import Job
+
+
+class Command(BaseCommand):
+    help = "Analyze every applicant of a job that has no stored AI analysis yet"
+
+    def add_arguments(self, parser):
+        parser.add_argument('job_id', type=int)
+        parser.add_argument('--concurrency', type=int, default=None,
+                            help='Maximum API calls in flight (default: AI_SCREENING_CONCURRENCY)')
+        parser.add_argument('--rpm', type=int, default=None,
+                            help='Requests per minute allowed (default: AI_REQUESTS_PER_MINUTE)')
+        parser.add_argument('--fake', action='store_true',
+                            help='Use the deterministic fake backend instead of Gemini (load testing, no network); '
+                                 'nothing is saved')
+        parser.add_argument('--fake-latency', type=float, default=0.5,
+                            help='Seconds each fake call takes')
+
+    def handle(self, *args, **options):
+        try:
+            job = Job.objects.get(pk=options['job_id'])
+        except Job.DoesNotExist:
+            raise CommandError(f"Job {options['job_id']} does not exist")
+
+        if options['fake']:
+            provider = build_provider(FakeBackend(latency=options['fake_latency']))
+        else:
+            provider = get_provider()
+
+        def progress(summary):
+            self.stdout.write(
+                f'{summary.completed + summary.failed}/{summary.total} analyzed '
+                f'({summary.failed} failed, {summary.skipped} skipped)'
+            )
+
+        summary = screen_job(
+            job,
+            model=provider,
+            concurrency=options['concurrency'],
+            requests_per_minute=options['rpm'],
+            progress=progress,
+            # Fake output must not be cached as the configured model's analysis or overwrite scores
+            store=not options['fake'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Screening finished: {summary.completed} analyzed, {summary.failed} failed, '
+            f'{summary.skipped} skipped'
+        ))
+        stats = provider.stats()
+        self.stdout.write(
+            f"API calls: {stats['calls']} ({stats['rate_limited']} rate-limited, {stats['rejected']} rejected "
+            f"by circuit breaker), avg latency {stats['avg_latency']:.2f}s, max {stats['max_latency']:.2f}s"
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0004_resume_task'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeextraction',
+            name='error',
+            field=models.CharField(blank=True, max_length=30),
+        ),
+    ]
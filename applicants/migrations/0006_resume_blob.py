@@ -0,0 +1,41 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:06
+
+import applicants.storage
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_resume_blobs(apps, schema_editor):
+    """Create reference counts for resumes uploaded before blobs were tracked."""
+    Applicant = apps.get_model('applicants', 'Applicant')
+    ResumeBlob = apps.get_model('applicants', 'ResumeBlob')
+    counts = Applicant.objects.exclude(resume='').values('resume').annotate(refs=Count('id'))
+    ResumeBlob.objects.bulk_create(
+        [ResumeBlob(name=row['resume'], ref_count=row['refs']) for row in counts.iterator()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0005_resume_extraction_error'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='applicant',
+            name='resume',
+            field=models.FileField(storage=applicants.storage.get_resume_storage, upload_to='resumes/'),
+        ),
+        migrations.RunPython(backfill_resume_blobs, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0008_screening_run'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='ai_recommendation',
+            field=models.CharField(blank=True, db_index=True, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='applicant',
+            name='match_score',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='gaps',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='match_score',
+            field=models.PositiveSmallIntegerField(blank=True, db_index=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='matching_skills',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='resumeanalysis',
+            name='recommendation',
+            field=models.CharField(blank=True, db_index=True, max_length=20),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0009_structured_analysis'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeextraction',
+            name='term_counts',
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='resumeextraction',
+            name='token_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='screeningrun',
+            name='applicant_ids',
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
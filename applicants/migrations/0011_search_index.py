@@ -0,0 +1,55 @@
+from django.db import migrations
+
+# Resume text indexed at the time of this migration
+EXTRACTOR_VERSION = 2
+
+
+def create_search_index(apps, schema_editor):
+    """Create and fill the full-text index for the current database backend."""
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            "CREATE VIRTUAL TABLE applicants_search USING fts5("
+            "name, email, cover_letter, resume, tokenize='porter unicode61')"
+        )
+        schema_editor.execute(
+            "INSERT INTO applicants_search (rowid, name, email, cover_letter, resume) "
+            "SELECT a.id, a.first_name || ' ' || a.last_name, a.email, a.cover_letter, COALESCE(e.text, '') "
+            "FROM applicants_applicant a LEFT JOIN applicants_resumeextraction e "
+            "ON e.content_hash = a.resume_hash AND e.extractor_version = %s AND e.success",
+            [EXTRACTOR_VERSION]
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            "CREATE TABLE applicants_search ("
+            "applicant_id bigint PRIMARY KEY REFERENCES applicants_applicant (id) ON DELETE CASCADE, "
+            "content text NOT NULL, document tsvector NOT NULL)"
+        )
+        schema_editor.execute("CREATE INDEX applicants_search_document ON applicants_search USING GIN (document)")
+        schema_editor.execute(
+            "INSERT INTO applicants_search (applicant_id, content, document) "
+            "SELECT a.id, concat_ws(E'\\n', a.first_name || ' ' || a.last_name, a.email, a.cover_letter, e.text), "
+            "setweight(to_tsvector('english', a.first_name || ' ' || a.last_name), 'A') "
+            "|| setweight(to_tsvector('simple', a.email), 'A') "
+            "|| setweight(to_tsvector('english', a.cover_letter), 'B') "
+            "|| setweight(to_tsvector('english', COALESCE(e.text, '')), 'C') "
+            "FROM applicants_applicant a LEFT JOIN applicants_resumeextraction e "
+            "ON e.content_hash = a.resume_hash AND e.extractor_version = %s AND e.success",
+            [EXTRACTOR_VERSION]
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute('DROP TABLE IF EXISTS applicants_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0010_offline_ranking'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
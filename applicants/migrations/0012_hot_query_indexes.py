@@ -0,0 +1,54 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:25
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_recruiter(apps, schema_editor):
+    """Copy each job's owner onto its existing applicants."""
+    Applicant = apps.get_model('applicants', 'Applicant')
+    Job = apps.get_model('jobs', 'Job')
+    Applicant.objects.filter(recruiter__isnull=True).update(
+        recruiter_id=Subquery(Job.objects.filter(pk=OuterRef('applied_job_id')).values('created_by_id')[:1])
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0011_search_index'),
+        ('jobs', '0002_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='recruiter',
+            field=models.ForeignKey(db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_recruiter, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='applicant',
+            name='applied_job',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='applicants', to='jobs.job'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['recruiter', '-applied_at', '-id'], name='applicant_recruiter_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['recruiter', 'status', '-applied_at', '-id'], name='applicant_recruiter_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['applied_job', '-applied_at', '-id'], name='applicant_job_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['applied_job', 'status', '-applied_at', '-id'], name='applicant_job_status_idx'),
+        ),
+    ]
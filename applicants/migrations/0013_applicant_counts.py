@@ -0,0 +1,40 @@
+# Generated by Django 6.1.2 on 2026-10-18 18:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_applicant_counts(apps, schema_editor):
+    """Count existing applicants per job and status."""
+    Applicant = apps.get_model('applicants', 'Applicant')
+    ApplicantCount = apps.get_model('applicants', 'ApplicantCount')
+    rows = Applicant.objects.order_by().values('applied_job_id', 'status').annotate(n=Count('id'))
+    ApplicantCount.objects.bulk_create(
+        [ApplicantCount(job_id=row['applied_job_id'], status=row['status'], count=row['n']) for row in rows],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0012_hot_query_indexes'),
+        ('jobs', '0002_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplicantCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('applied', 'Applied'), ('screening', 'Screening'), ('interview', 'Interview'), ('hired', 'Hired'), ('rejected', 'Rejected')], max_length=20)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='applicant_counts', to='jobs.job')),
+            ],
+            options={
+                'unique_together': {('job', 'status')},
+            },
+        ),
+        migrations.RunPython(backfill_applicant_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:20
+
+import re
+
+from django.conf import settings
+from django.db import migrations, models, transaction
+
+BACKFILL_CHUNK_SIZE = 1000
+
+
+# Copies of applicants.normalization as it was when this migration was written, so
+# later changes to the live functions do not change what the backfill stored
+def normalize_email(email):
+    """Return an email address trimmed and lower-cased, or '' if it is empty."""
+    return (email or '').strip().lower()
+
+
+def normalize_phone(phone):
+    """Return a phone number in E.164 form, or '' if there are no digits."""
+    phone = (phone or '').strip()
+    digits = re.sub(r'\D', '', phone)
+    if not digits:
+        return ''
+    country_code = settings.PHONE_DEFAULT_COUNTRY_CODE
+    if phone.startswith('+'):
+        return f'+{digits}'
+    if digits.startswith('00'):
+        return f'+{digits[2:]}'
+    if digits.startswith('0'):
+        return f'+{country_code}{digits[1:]}'
+    if len(digits) >= 11 and digits.startswith(country_code):
+        return f'+{digits}'
+    return f'+{country_code}{digits}'
+
+
+def backfill_contact_keys(apps, schema_editor):
+    """
+    Fill the normalized email and phone of existing applicants, a chunk per transaction.
+
+    Rows are read in (applied_job, id) order, so only one job's keys are held at a
+    time. An applicant whose key an earlier application to the same job already
+    has keeps it null, so the unique constraints added next can be created.
+    """
+    Applicant = apps.get_model('applicants', 'Applicant')
+    seen_job, seen = None, set()
+    last = (0, 0)
+    while True:
+        with transaction.atomic():
+            chunk = list(
+                Applicant.objects.filter(
+                    models.Q(applied_job_id__gt=last[0]) | models.Q(applied_job_id=last[0], id__gt=last[1])
+                ).order_by('applied_job_id', 'id').only('id', 'applied_job_id', 'email', 'phone')[:BACKFILL_CHUNK_SIZE]
+            )
+            if not chunk:
+                return
+            for applicant in chunk:
+                if applicant.applied_job_id != seen_job:
+                    seen_job, seen = applicant.applied_job_id, set()
+                email = ('email', normalize_email(applicant.email))
+                phone = ('phone', normalize_phone(applicant.phone))
+                applicant.normalized_email = None if email in seen else email[1]
+                applicant.normalized_phone = None if phone in seen else phone[1]
+                seen.update([email, phone])
+            Applicant.objects.bulk_update(chunk, ['normalized_email', 'normalized_phone'])
+        last = (chunk[-1].applied_job_id, chunk[-1].id)
+
+
+class Migration(migrations.Migration):
+
+    # Each backfill chunk commits on its own
+    atomic = False
+
+    dependencies = [
+        ('applicants', '0013_applicant_counts'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='applicant',
+            name='normalized_email',
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name='applicant',
+            name='normalized_phone',
+            field=models.CharField(blank=True, editable=False, max_length=24, null=True),
+        ),
+        migrations.RunPython(backfill_contact_keys, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 6.1.2 on 2026-10-18 19:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0014_normalized_contact_keys'),
+        ('jobs', '0002_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name='applicant',
+            unique_together=set(),
+        ),
+        migrations.AddConstraint(
+            model_name='applicant',
+            constraint=models.UniqueConstraint(fields=('applied_job', 'normalized_email'), name='applicant_job_email_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='applicant',
+            constraint=models.UniqueConstraint(fields=('applied_job', 'normalized_phone'), name='applicant_job_phone_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['recruiter', 'normalized_email', '-applied_at', '-id'], name='applicant_recruiter_email_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['recruiter', 'normalized_phone', '-applied_at', '-id'], name='applicant_recruiter_phone_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.1.2 on 2026-10-18 20:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0015_normalized_contact_constraints'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='screeningrun',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
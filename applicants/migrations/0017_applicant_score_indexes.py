@@ -0,0 +1,24 @@
+# Generated by Django 6.1.2 on 2026-10-18 20:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applicants', '0016_screeningrun_locked_at'),
+        ('jobs', '0002_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['recruiter', '-match_score', '-applied_at', '-id'], name='applicant_recruiter_score_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='applicant',
+            index=models.Index(fields=['applied_job', '-match_score', '-applied_at', '-id'], name='applicant_job_score_idx'),
+        ),
+    ]
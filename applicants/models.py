@@ -1,8 +1,13 @@
 """
 Applicant tracking models.
 """
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models.functions import Greatest
+from django.utils import timezone
 from jobs.models import Job
+from .extraction import ERROR_MESSAGES, EXTRACTOR_VERSION
+from .normalization import normalize_email, normalize_phone
+from .storage import content_hash_from_name, get_resume_storage
 
 
 class Applicant(models.Model):
@@ -16,18 +21,40 @@ class Applicant(models.Model):
         ('rejected', 'Rejected'),
     ]
 
+    PROCESSING_CHOICES = [
+        ('pending', 'Pending'),
+        ('processing', 'Processing'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    ]
+
     # Basic information
     first_name = models.CharField(max_length=100)
     last_name = models.CharField(max_length=100)
     email = models.EmailField()
     phone = models.CharField(max_length=20)
     linkedin = models.URLField(blank=True, null=True)
+    # Canonical email and E.164 phone, the keys duplicate checks and contact lookups compare.
+    # Null only on rows that already duplicated an earlier application when the keys were added
+    normalized_email = models.CharField(max_length=254, null=True, blank=True, editable=False)
+    normalized_phone = models.CharField(max_length=24, null=True, blank=True, editable=False)
 
     # Application details
-    applied_job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applicants')
-    resume = models.FileField(upload_to='resumes/')
+    # Indexed by applicant_job_recent_idx below
+    applied_job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applicants', db_index=False)
+    # Owner of the applied job, copied on creation so recruiter-wide lists read a single index range
+    recruiter = models.ForeignKey(
+        'auth.User', on_delete=models.CASCADE, null=True, editable=False, related_name='+', db_index=False
+    )
+    resume = models.FileField(upload_to='resumes/', storage=get_resume_storage)
+    resume_hash = models.CharField(max_length=64, blank=True, db_index=True)
     cover_letter = models.TextField(blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='applied')
+    processing_status = models.CharField(max_length=20, choices=PROCESSING_CHOICES, default='pending')
+
+    # Latest AI analysis, copied here so lists can sort and filter in SQL
+    match_score = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
+    ai_recommendation = models.CharField(max_length=20, blank=True, db_index=True)
 
     # Metadata
     applied_at = models.DateTimeField(auto_now_add=True)
@@ -35,14 +62,83 @@ class Applicant(models.Model):
 
     class Meta:
         ordering = ['-applied_at']
-        unique_together = [
-            ['applied_job', 'email'],
-            ['applied_job', 'phone']
+        constraints = [
+            models.UniqueConstraint(fields=['applied_job', 'normalized_email'], name='applicant_job_email_uniq'),
+            models.UniqueConstraint(fields=['applied_job', 'normalized_phone'], name='applicant_job_phone_uniq'),
+        ]
+        indexes = [
+            # Applicant list searched by an exact email address or phone number
+            models.Index(
+                fields=['recruiter', 'normalized_email', '-applied_at', '-id'], name='applicant_recruiter_email_idx'
+            ),
+            models.Index(
+                fields=['recruiter', 'normalized_phone', '-applied_at', '-id'], name='applicant_recruiter_phone_idx'
+            ),
+            # Dashboard and applicant list across a recruiter's jobs, newest first (keyset on applied_at, id)
+            models.Index(fields=['recruiter', '-applied_at', '-id'], name='applicant_recruiter_recent_idx'),
+            models.Index(fields=['recruiter', 'status', '-applied_at', '-id'], name='applicant_recruiter_status_idx'),
+            # Applicant list filtered by job, and by job and status
+            models.Index(fields=['applied_job', '-applied_at', '-id'], name='applicant_job_recent_idx'),
+            models.Index(fields=['applied_job', 'status', '-applied_at', '-id'], name='applicant_job_status_idx'),
+            # Applicant list sorted by match score, across a recruiter's jobs or within one job
+            models.Index(
+                fields=['recruiter', '-match_score', '-applied_at', '-id'], name='applicant_recruiter_score_idx'
+            ),
+            models.Index(fields=['applied_job', '-match_score', '-applied_at', '-id'], name='applicant_job_score_idx'),
         ]
 
     def __str__(self):
         return f"{self.first_name} {self.last_name} - {self.applied_job.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Status as stored, so a status change can move the applicant between counters
+        instance._loaded_status = instance.__dict__.get('status')
+        # Job and owner as stored, so moving the applicant to another job moves it between recruiters
+        instance._loaded_job_id = instance.__dict__.get('applied_job_id')
+        instance._loaded_recruiter_id = instance.__dict__.get('recruiter_id')
+        # Contacts as stored, so saving an unchanged row keeps its normalized keys
+        instance._loaded_contacts = (instance.__dict__.get('email'), instance.__dict__.get('phone'))
+        return instance
+
+    def normalize_contacts(self):
+        """Set the normalized email and phone from the entered ones; bulk_create callers must call it."""
+        self.normalized_email = normalize_email(self.email)
+        self.normalized_phone = normalize_phone(self.phone)
+
+    def save(self, *args, **kwargs):
+        moved = not self._state.adding and self.applied_job_id != getattr(self, '_loaded_job_id', self.applied_job_id)
+        if (self.recruiter_id is None or moved) and self.applied_job_id:
+            self.recruiter_id = self.applied_job.created_by_id
+        if self._state.adding and self.resume and not self.resume._committed:
+            # Store the upload before the INSERT so its content hash goes into the row. The
+            # upload is kept until signals.acquire_resume_blob has counted the reference.
+            self._resume_upload = self.resume.file
+            self.resume.save(self.resume.name, self._resume_upload, save=False)
+            self.resume_hash = content_hash_from_name(self.resume.name) or self.resume_hash
+        contacts = (self.__dict__.get('email'), self.__dict__.get('phone'))
+        # Legacy duplicates keep their null keys until their email or phone is edited
+        if self._state.adding or contacts != getattr(self, '_loaded_contacts', None):
+            self.normalize_contacts()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'applied_job' in update_fields:
+                update_fields.add('recruiter')
+            if 'email' in update_fields:
+                update_fields.add('normalized_email')
+            if 'phone' in update_fields:
+                update_fields.add('normalized_phone')
+            kwargs['update_fields'] = update_fields
+        # Counter updates made by post_save handlers commit or roll back with the row
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+        self._loaded_status = self.status
+        self._loaded_job_id = self.applied_job_id
+        self._loaded_recruiter_id = self.recruiter_id
+        self._loaded_contacts = contacts
+
     @property
     def full_name(self):
         """Return full name of applicant."""
@@ -64,4 +160,297 @@ class ApplicantNote(models.Model):
         return f"Note for {self.applicant.full_name} by {self.created_by.username}"
 
 
+class ApplicantCount(models.Model):
+    """Number of a job's applicants in one status, maintained by signal handlers."""
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='applicant_counts')
+    status = models.CharField(max_length=20, choices=Applicant.STATUS_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = [['job', 'status']]
+
+    def __str__(self):
+        return f"{self.job_id}/{self.status}: {self.count}"
+
+    @classmethod
+    def adjust(cls, job_id, status, delta):
+        """Add ``delta`` (positive or negative) to a job's count for a status."""
+        if delta < 0:
+            cls.objects.filter(job_id=job_id, status=status, count__gte=-delta).update(
+                count=models.F('count') + delta
+            )
+            return
+        if cls.objects.filter(job_id=job_id, status=status).update(count=models.F('count') + delta):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(job_id=job_id, status=status, count=delta)
+        except IntegrityError:
+            cls.objects.filter(job_id=job_id, status=status).update(count=models.F('count') + delta)
+
+    @classmethod
+    def totals(cls, job_ids):
+        """
+        Return the number of applicants of each job.
+
+        Args:
+            job_ids: Primary keys of the jobs
+
+        Returns:
+            Dictionary mapping job id to applicant count; jobs without applicants are absent
+        """
+        totals = {}
+        for job_id, count in cls.objects.filter(job_id__in=list(job_ids)).values_list('job_id', 'count'):
+            totals[job_id] = totals.get(job_id, 0) + count
+        return totals
+
+
+class ResumeExtraction(models.Model):
+    """Text extracted from a resume file, keyed by content hash and extractor version."""
+
+    content_hash = models.CharField(max_length=64)
+    extractor_version = models.PositiveIntegerField()
+    text = models.TextField(blank=True)
+    page_count = models.PositiveIntegerField(default=0)
+    success = models.BooleanField(default=False)
+    error = models.CharField(max_length=30, blank=True)
+    # Term frequencies used by the offline ranking; filled on first use and reset when the text changes
+    term_counts = models.JSONField(null=True, blank=True)
+    token_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = [['content_hash', 'extractor_version']]
+
+    def __str__(self):
+        return f"{self.content_hash[:12]} (v{self.extractor_version})"
+
+    @staticmethod
+    def fields_from_result(result):
+        """Map an ExtractionResult onto model field values."""
+        return {
+            'text': result.text,
+            'page_count': result.page_count,
+            'success': result.ok,
+            'error': result.error,
+            'term_counts': None,
+        }
+
+    @classmethod
+    def from_result(cls, result, **kwargs):
+        """Build an unsaved instance from an ExtractionResult."""
+        return cls(extractor_version=EXTRACTOR_VERSION, **cls.fields_from_result(result), **kwargs)
+
+    @property
+    def message(self):
+        """Resume text, or a readable reason when extraction failed."""
+        if self.success:
+            return self.text
+        return ERROR_MESSAGES.get(self.error, ERROR_MESSAGES['crashed'])
+
+
+class ResumeTask(models.Model):
+    """Background resume-processing job stored in the database work queue."""
+
+    KIND_CHOICES = [
+        ('extract_text', 'Extract text'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    applicant = models.ForeignKey(Applicant, on_delete=models.CASCADE, related_name='tasks')
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} for applicant {self.applicant_id} ({self.status})"
 
+
+class ResumeBlob(models.Model):
+    """Reference count for a stored resume file shared between applications."""
+
+    name = models.CharField(max_length=255, unique=True)
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+    @classmethod
+    def acquire(cls, name):
+        """Record one more applicant using the file."""
+        if cls.objects.filter(name=name).update(ref_count=models.F('ref_count') + 1):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(name=name, ref_count=1)
+        except IntegrityError:
+            cls.objects.filter(name=name).update(ref_count=models.F('ref_count') + 1)
+
+    @classmethod
+    def acquire_many(cls, counts):
+        """
+        Record more applicants using several files at once.
+
+        Args:
+            counts: Mapping of file name to the number of references added
+        """
+        for name, count in counts.items():
+            if cls.objects.filter(name=name).update(ref_count=models.F('ref_count') + count):
+                continue
+            try:
+                with transaction.atomic():
+                    cls.objects.create(name=name, ref_count=count)
+            except IntegrityError:
+                cls.objects.filter(name=name).update(ref_count=models.F('ref_count') + count)
+
+    @classmethod
+    def release(cls, name, storage):
+        """
+        Record one fewer applicant using the file, deleting it when no one else does.
+
+        The file is deleted while the blob row is still locked, so an application
+        acquiring the same file waits and then finds it gone (see
+        ``signals.acquire_resume_blob``).
+
+        Args:
+            name: Storage name of the file
+            storage: Storage the file is kept in
+
+        Returns:
+            True if the file was deleted
+        """
+        with transaction.atomic():
+            cls.objects.filter(name=name, ref_count__gt=0).update(ref_count=models.F('ref_count') - 1)
+            deleted, _ = cls.objects.filter(name=name, ref_count=0).delete()
+            if deleted:
+                storage.delete(name)
+        return bool(deleted)
+
+    @classmethod
+    def delete_orphan(cls, name, storage):
+        """
+        Delete a stored file that has no blob row.
+
+        A placeholder row is held while the file is deleted, so an application
+        acquiring the file at the same moment either makes this fail or waits
+        until the file is gone.
+
+        Returns:
+            True if the file was deleted
+        """
+        try:
+            with transaction.atomic():
+                placeholder = cls.objects.create(name=name, ref_count=0)
+                storage.delete(name)
+                placeholder.delete()
+        except IntegrityError:
+            return False
+        return True
+
+    @classmethod
+    def release_many(cls, counts):
+        """
+        Record fewer applicants using several files, leaving the files in place.
+
+        Blobs left without references are removed later by
+        ``tasks.sweep_unreferenced_resumes``.
+
+        Args:
+            counts: Mapping of file name to the number of references dropped
+        """
+        for name, count in counts.items():
+            cls.objects.filter(name=name).update(ref_count=Greatest(models.F('ref_count') - count, 0))
+
+
+class ResumeAnalysis(models.Model):
+    """Stored AI analysis of a resume against a job."""
+
+    cache_key = models.CharField(max_length=64, unique=True)
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='resume_analyses')
+    model_name = models.CharField(max_length=100)
+    prompt_version = models.PositiveIntegerField()
+    analysis = models.TextField()
+    match_score = models.PositiveSmallIntegerField(null=True, blank=True, db_index=True)
+    recommendation = models.CharField(max_length=20, blank=True, db_index=True)
+    matching_skills = models.JSONField(default=list, blank=True)
+    gaps = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        verbose_name_plural = 'resume analyses'
+
+    def __str__(self):
+        return f"Analysis for {self.job.title} ({self.model_name})"
+
+    def as_result(self):
+        """Return the analysis in the analyze_cv_with_gemini result format."""
+        return {
+            'success': True,
+            'analysis': self.analysis,
+            'score': self.match_score,
+            'recommendation': self.recommendation,
+            'matching_skills': self.matching_skills,
+            'gaps': self.gaps,
+            'analyzed_at': self.created_at,
+        }
+
+
+class ScreeningRun(models.Model):
+    """Batch AI screening of a job's applicants, run by the background worker."""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='screening_runs')
+    requested_by = models.ForeignKey('auth.User', on_delete=models.CASCADE)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    total = models.PositiveIntegerField(default=0)
+    completed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    skipped = models.PositiveIntegerField(default=0)
+    # Restricts the run to these applicants (e.g. the top of the offline ranking); empty means all
+    applicant_ids = models.JSONField(default=list, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    # Refreshed as applicants complete; a running run whose lock goes stale is handed out again
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"Screening of {self.job.title} ({self.status})"
+
+    @property
+    def progress_percent(self):
+        """Share of pending applicants processed so far."""
+        if not self.total:
+            return 100 if self.status == 'done' else 0
+        return int((self.completed + self.failed) * 100 / self.total)
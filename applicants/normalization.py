@@ -0,0 +1,75 @@
+"""
+Canonical forms of applicants' email addresses and phone numbers.
+
+Duplicate checks and contact lookups compare these forms, so "Jane@Example.com"
+and "jane@example.com", or "+94 77 123 4567" and "077-1234567", are the same key.
+"""
+import re
+
+from django.conf import settings
+
+# A search query that is only a phone number: digits with the usual separators
+PHONE_QUERY_RE = re.compile(r'^\+?[\d\s().-]+$')
+
+# Digits a searched phone number must have, so years and ranges such as "2019-2021"
+# stay text searches; and the digit range of an E.164 number
+PHONE_QUERY_MIN_DIGITS = 9
+E164_DIGITS = range(10, 16)
+
+
+def normalize_email(email):
+    """Return an email address trimmed and lower-cased, or '' if it is empty."""
+    return (email or '').strip().lower()
+
+
+def normalize_phone(phone, country_code=None):
+    """
+    Return a phone number in E.164 form, such as ``+94771234567``.
+
+    Separators are dropped. A leading ``+`` or ``00`` marks an international
+    number. A leading ``0`` is a trunk prefix and is replaced by the country
+    code. A number of 11 or more digits that starts with the country code is
+    taken as international without the ``+``. Any other number gets the
+    country code prepended.
+
+    Args:
+        phone: Number as entered
+        country_code: Calling code of national numbers, defaults to settings.PHONE_DEFAULT_COUNTRY_CODE
+
+    Returns:
+        The E.164 number, or '' if there are no digits
+    """
+    phone = (phone or '').strip()
+    digits = re.sub(r'\D', '', phone)
+    if not digits:
+        return ''
+    country_code = country_code or settings.PHONE_DEFAULT_COUNTRY_CODE
+    if phone.startswith('+'):
+        return f'+{digits}'
+    if digits.startswith('00'):
+        return f'+{digits[2:]}'
+    if digits.startswith('0'):
+        return f'+{country_code}{digits[1:]}'
+    if len(digits) >= 11 and digits.startswith(country_code):
+        return f'+{digits}'
+    return f'+{country_code}{digits}'
+
+
+def contact_lookup(query):
+    """
+    Return the exact-match filter for a search query that is an email address or phone number.
+
+    A query counts as a phone number only if it has at least
+    PHONE_QUERY_MIN_DIGITS digits and normalizes to a full E.164 number.
+
+    Returns:
+        Dictionary of queryset filter arguments, or None for any other query
+    """
+    query = query.strip()
+    if '@' in query and ' ' not in query:
+        return {'normalized_email': normalize_email(query)}
+    if PHONE_QUERY_RE.match(query) and len(re.sub(r'\D', '', query)) >= PHONE_QUERY_MIN_DIGITS:
+        phone = normalize_phone(query)
+        if len(phone) - 1 in E164_DIGITS:
+            return {'normalized_phone': phone}
+    return None
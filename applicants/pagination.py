@@ -0,0 +1,119 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are fetched with a WHERE clause on the sort key instead of OFFSET, so
+every page costs the same indexed range scan however deep it is. The cursor
+is an opaque URL-safe token holding the sort key of the last row shown.
+"""
+import base64
+import json
+from dataclasses import dataclass
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+@dataclass(frozen=True)
+class Key:
+    """One column of a keyset ordering; nullable columns sort their NULLs last."""
+
+    field: str
+    descending: bool = True
+    nullable: bool = False
+
+    def order_by(self):
+        expression = F(self.field)
+        if self.descending:
+            return expression.desc(nulls_last=True) if self.nullable else expression.desc()
+        return expression.asc(nulls_last=True) if self.nullable else expression.asc()
+
+    def equal(self, value):
+        if value is None:
+            return Q(**{f'{self.field}__isnull': True})
+        return Q(**{self.field: value})
+
+    def after(self, value):
+        if value is None:
+            # NULLs sort last, so nothing follows them in this column
+            return None
+        condition = Q(**{f'{self.field}__{"lt" if self.descending else "gt"}': value})
+        if self.nullable:
+            condition |= Q(**{f'{self.field}__isnull': True})
+        return condition
+
+
+def encode_cursor(values):
+    """Encode sort-key values into an opaque cursor."""
+    raw = json.dumps([v.isoformat() if hasattr(v, 'isoformat') else v for v in values])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, keys, model):
+    """
+    Decode a cursor for the given keys.
+
+    Args:
+        cursor: Token produced by encode_cursor
+        keys: Keys of the ordering the cursor was produced for
+        model: Model whose fields the keys name
+
+    Returns:
+        List of values, or None if the cursor is missing or malformed
+    """
+    if not cursor:
+        return None
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(keys):
+            return None
+        return [
+            None if value is None else model._meta.get_field(key.field).to_python(value)
+            for key, value in zip(keys, values)
+        ]
+    except (ValueError, TypeError, ValidationError):
+        return None
+
+
+def keyset_filter(keys, values):
+    """
+    Build the condition selecting rows that sort after ``values``.
+
+    The condition is nested, ``k1 after OR (k1 = v1 AND (k2 after OR ...))``,
+    so each equality appears once and SQLite keeps walking the ordering's index
+    instead of splitting the OR into separately sorted lookups.
+    """
+    condition = None
+    for key, value in reversed(list(zip(keys, values))):
+        after = key.after(value)
+        if condition is not None:
+            following = key.equal(value) & condition
+            condition = following if after is None else after | following
+        else:
+            condition = after
+    return condition if condition is not None else Q(pk__in=[])
+
+
+def keyset_page(queryset, keys, cursor=None, page_size=50):
+    """
+    Return one page of a queryset ordered by ``keys``.
+
+    Args:
+        queryset: Queryset to paginate
+        keys: List of Key; the last one must be unique (usually the primary key)
+        cursor: Cursor of the previous page, or None for the first page
+        page_size: Rows per page
+
+    Returns:
+        Tuple of (list of rows, cursor of the next page or None)
+    """
+    queryset = queryset.order_by(*(key.order_by() for key in keys))
+    values = decode_cursor(cursor, keys, queryset.model)
+    if values is not None:
+        queryset = queryset.filter(keyset_filter(keys, values))
+
+    rows = list(queryset[:page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    last = rows[-1]
+    return rows, encode_cursor([getattr(last, key.field) for key in keys])
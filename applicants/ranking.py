@@ -0,0 +1,174 @@
+"""
+Offline resume-to-job ranking.
+
+Scores applicants with BM25 over their extracted resume text, using the job's
+requirements, description and responsibilities as the query. Term counts are
+computed once per resume and stored on its ResumeExtraction, so ranking a job
+only builds a small applicants x query-terms matrix and scores it in one
+batched NumPy computation. No API calls are made.
+"""
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+import numpy as np
+
+from .extraction import EXTRACTOR_VERSION
+from .models import ResumeExtraction
+
+# Keeps terms like c++, c# and node.js
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*')
+
+STOPWORDS = frozenset("""
+a about above after all also an and any are as at be been being both but by can could did do does
+doing during each etc for from had has have having he her here hers him his how i if in into is it
+its just me more most must my no nor not of off on once only or other our out over own per same she
+should so some such than that the their them then there these they this those through to too under
+until up us very was we well were what when where which while who whom why will with within without
+would you your years year experience work working ability strong good excellent knowledge team
+""".split())
+
+# Query weight of each job field; requirements say most about fit
+FIELD_WEIGHTS = {
+    'requirements': 2.0,
+    'description': 1.0,
+    'responsibilities': 1.0,
+}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+
+
+def count_terms(text):
+    """
+    Count the terms of a document.
+
+    Args:
+        text: Document text
+
+    Returns:
+        Tuple of ({term: count}, total number of tokens)
+    """
+    tokens = TOKEN_RE.findall(text.lower())
+    counts = Counter(tokens)
+    # Strip sentence punctuation per distinct term rather than per token
+    for term in [t for t in counts if t.endswith('.')]:
+        count = counts.pop(term)
+        counts[term.rstrip('.')] += count
+    return dict(counts), len(tokens)
+
+
+def tokenize(text):
+    """Split text into lowercase query terms, dropping stopwords and single characters."""
+    tokens = (t.rstrip('.') for t in TOKEN_RE.findall(text.lower()))
+    return [t for t in tokens if len(t) > 1 and t not in STOPWORDS]
+
+
+def job_query(job):
+    """Return {term: weight} built from a job's requirements, description and responsibilities."""
+    weights = {}
+    for field, weight in FIELD_WEIGHTS.items():
+        for term in set(tokenize(getattr(job, field))):
+            weights[term] = weights.get(term, 0.0) + weight
+    return weights
+
+
+def bm25_scores(query, documents):
+    """
+    Score documents against a weighted query with BM25.
+
+    Args:
+        query: Dictionary mapping query terms to weights
+        documents: List of (term counts, token count) pairs from count_terms
+
+    Returns:
+        NumPy array of scores, one per document
+    """
+    if not documents or not query:
+        return np.zeros(len(documents))
+
+    terms = list(query)
+    n = len(documents)
+    # Term-frequency matrix restricted to query terms (documents x terms)
+    tf = np.array([[counts.get(t, 0) for t in terms] for counts, _ in documents], dtype=np.float64)
+    lengths = np.array([length for _, length in documents], dtype=np.float64)
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log1p((n - df + 0.5) / (df + 0.5))
+    weights = np.array([query[t] for t in terms])
+
+    avgdl = lengths.mean() or 1.0
+    norm = K1 * (1 - B + B * lengths / avgdl)
+    saturated = tf * (K1 + 1) / (tf + norm[:, None])
+    return saturated @ (idf * weights)
+
+
+def resume_term_counts(content_hashes):
+    """
+    Return stored term counts for successfully extracted resumes.
+
+    Counts missing on a row (new or re-extracted text) are computed and saved.
+
+    Args:
+        content_hashes: Iterable of resume content hashes
+
+    Returns:
+        Dictionary mapping content hash to (term counts, token count)
+    """
+    extractions = ResumeExtraction.objects.filter(
+        content_hash__in=set(content_hashes),
+        extractor_version=EXTRACTOR_VERSION,
+        success=True,
+    )
+    documents = {}
+    missing = []
+    for pk, content_hash, counts, length in extractions.values_list(
+            'pk', 'content_hash', 'term_counts', 'token_count'):
+        if counts is None:
+            missing.append(pk)
+        else:
+            documents[content_hash] = (counts, length)
+
+    if missing:
+        updated = []
+        for extraction in ResumeExtraction.objects.filter(pk__in=missing).only('pk', 'content_hash', 'text'):
+            extraction.term_counts, extraction.token_count = count_terms(extraction.text)
+            documents[extraction.content_hash] = (extraction.term_counts, extraction.token_count)
+            updated.append(extraction)
+        ResumeExtraction.objects.bulk_update(updated, ['term_counts', 'token_count'], batch_size=500)
+    return documents
+
+
+@dataclass
+class RankedApplicant:
+    """An applicant with its offline relevance score (0-100, None if no resume text)."""
+
+    applicant: object
+    score: float | None
+
+
+def rank_applicants(job):
+    """
+    Rank a job's applicants by offline relevance to the job.
+
+    Args:
+        job: Job whose applicants are ranked
+
+    Returns:
+        List of RankedApplicant, best first; applicants without extracted text last
+    """
+    applicants = list(job.applicants.only(
+        'pk', 'first_name', 'last_name', 'email', 'status', 'resume_hash', 'match_score', 'ai_recommendation'
+    ))
+    documents = resume_term_counts(a.resume_hash for a in applicants if a.resume_hash)
+
+    scored = [a for a in applicants if a.resume_hash in documents]
+    scores = bm25_scores(job_query(job), [documents[a.resume_hash] for a in scored])
+    top = scores.max() if len(scores) else 0
+    scaled = scores * 100 / top if top > 0 else scores
+
+    ranked = [RankedApplicant(a, round(float(s), 1)) for a, s in zip(scored, scaled)]
+    ranked.sort(key=lambda r: r.score, reverse=True)
+    ranked += [RankedApplicant(a, None) for a in applicants if a.resume_hash not in documents]
+    return ranked
@@ -0,0 +1,181 @@
+"""
+Synthetic recruiting data for load testing: jobs, applicants and PDF resumes.
+
+Everything is drawn from a seeded ``random.Random``, so a given seed always
+produces the same rows and the same resume files.
+"""
+import random
+
+FIRST_NAMES = [
+    'Amaya', 'Kasun', 'Nimali', 'Tharindu', 'Dilani', 'Ruwan', 'Sanduni', 'Chathura', 'Ishara', 'Nuwan',
+    'Alice', 'Bob', 'Charlie', 'Diana', 'Ethan', 'Fatima', 'George', 'Hana', 'Ivan', 'Julia',
+    'Kevin', 'Lina', 'Mohamed', 'Nadia', 'Omar', 'Priya', 'Quentin', 'Rosa', 'Samuel', 'Tara',
+]
+LAST_NAMES = [
+    'Perera', 'Fernando', 'Silva', 'Jayasinghe', 'Bandara', 'Wickramasinghe', 'Gunawardena', 'Rajapaksa',
+    'Johnson', 'Williams', 'Brown', 'Garcia', 'Nguyen', 'Khan', 'Patel', 'Muller', 'Rossi', 'Tanaka',
+]
+COMPANIES = [
+    'Acme Corp', 'Lanka Software', 'Blue Ocean Labs', 'Northwind', 'Globex', 'Initech', 'Serendib Tech',
+    'Umbrella Systems', 'Stark Industries', 'Hooli',
+]
+LOCATIONS = ['Colombo', 'Kandy', 'Galle', 'Remote', 'Singapore', 'London', 'Berlin', 'New York, NY']
+EMPLOYMENT_TYPES = ['FT', 'FT', 'FT', 'PT', 'CT', 'IN']
+
+# Roles with the skills their postings ask for; resumes mix skills from one or two roles
+ROLES = {
+    'Backend Engineer': ['Python', 'Django', 'PostgreSQL', 'REST APIs', 'Redis', 'Celery', 'Docker'],
+    'Frontend Engineer': ['JavaScript', 'TypeScript', 'React', 'CSS', 'HTML', 'Webpack', 'Accessibility'],
+    'DevOps Engineer': ['AWS', 'Docker', 'Kubernetes', 'Terraform', 'CI/CD', 'Linux', 'Prometheus'],
+    'Data Scientist': ['Python', 'SQL', 'Machine Learning', 'Pandas', 'Statistics', 'PyTorch', 'Spark'],
+    'Mobile Developer': ['Kotlin', 'Swift', 'Flutter', 'Android', 'iOS', 'Firebase', 'REST APIs'],
+    'QA Engineer': ['Selenium', 'Pytest', 'Test Automation', 'Cypress', 'JIRA', 'API Testing', 'SQL'],
+}
+LEVELS = ['Junior', '', 'Senior', 'Lead']
+DEGREES = [
+    'BSc in Computer Science', 'BSc in Software Engineering', 'BEng in Electrical Engineering',
+    'MSc in Data Science', 'BSc in Information Technology',
+]
+ACHIEVEMENTS = [
+    'Built and maintained {skill} services used by {n} thousand customers.',
+    'Reduced page load times by {n} percent by profiling and caching {skill} code paths.',
+    'Led a team of {n} engineers delivering the {skill} migration on schedule.',
+    'Automated release checks with {skill}, cutting manual QA effort by {n} percent.',
+    'Designed the {skill} data model behind the reporting platform.',
+    'Mentored {n} junior developers on {skill} best practices.',
+]
+NOTES = [
+    'Strong communication skills in the phone screen.',
+    'Follow up about notice period.',
+    'Good culture fit; schedule the technical round.',
+    'Salary expectations are above the range.',
+    'Referred by a current employee.',
+    'Portfolio looks solid, especially the recent projects.',
+]
+STATUS_WEIGHTS = {'applied': 60, 'screening': 20, 'interview': 10, 'hired': 2, 'rejected': 8}
+
+
+def job_fields(rng):
+    """Return field values for a random job posting."""
+    role = rng.choice(list(ROLES))
+    level = rng.choice(LEVELS)
+    skills = rng.sample(ROLES[role], 4)
+    low = rng.randrange(150, 600, 50)
+    return {
+        'title': f'{level} {role}'.strip(),
+        'description': f'{rng.choice(COMPANIES)} is hiring a {role.lower()} to work on {skills[0]} and '
+                       f'{skills[1]} systems across a growing product line.',
+        'location': rng.choice(LOCATIONS),
+        'employment_type': rng.choice(EMPLOYMENT_TYPES),
+        'salary_range': f'LKR {low},000 - {low + 150},000',
+        'requirements': f'{", ".join(skills)}, {rng.randint(1, 8)}+ years experience',
+        'responsibilities': f'Design, build and operate {skills[0]} and {skills[2]} components; '
+                            f'review code and support production.',
+    }
+
+
+def resume_lines(rng):
+    """Return the text lines of a random one-page resume."""
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    roles = rng.sample(list(ROLES), 2)
+    skills = rng.sample(ROLES[roles[0]], 5) + rng.sample(ROLES[roles[1]], 2)
+    lines = [
+        f'{first} {last}',
+        f'{first.lower()}.{last.lower()}@example.com | +94 77 {rng.randint(100, 999)} {rng.randint(1000, 9999)}',
+        '',
+        'SUMMARY',
+        f'{rng.choice(LEVELS) or "Experienced"} {roles[0].lower()} with a focus on {skills[0]} and {skills[1]}.',
+        '',
+        'SKILLS',
+        ', '.join(skills),
+        '',
+        'EXPERIENCE',
+    ]
+    year = 2025
+    for _ in range(rng.randint(2, 4)):
+        start = year - rng.randint(1, 4)
+        lines.append(f'{rng.choice(roles)} at {rng.choice(COMPANIES)} ({start} - {year})')
+        for template in rng.sample(ACHIEVEMENTS, 2):
+            lines.append('- ' + template.format(skill=rng.choice(skills), n=rng.randint(2, 40)))
+        year = start
+    lines += ['', 'EDUCATION', f'{rng.choice(DEGREES)}, University of Colombo ({year - 4} - {year})']
+    return lines
+
+
+def _pdf_string(text):
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return '(' + text.replace('\\', '\\\\').replace('(', '\\(').replace(')', '\\)') + ')'
+
+
+def build_pdf(lines, lines_per_page=50):
+    """
+    Render text lines as a minimal PDF with extractable Helvetica text.
+
+    Args:
+        lines: Text lines, one per row
+        lines_per_page: Rows per page before a new page is started
+
+    Returns:
+        PDF file contents as bytes
+    """
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+    font_id = 3 + 2 * len(pages)
+    objects = [
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [' + b' '.join(b'%d 0 R' % (3 + 2 * i) for i in range(len(pages)))
+        + b'] /Count %d >>' % len(pages),
+    ]
+    for i, page in enumerate(pages):
+        content = '\n'.join(
+            ['BT', '/F1 11 Tf', '14 TL', '72 740 Td'] + [f'{_pdf_string(line)} Tj T*' for line in page] + ['ET']
+        ).encode('latin-1')
+        objects.append(
+            b'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R '
+            b'/Resources << /Font << /F1 %d 0 R >> >> >>' % (4 + 2 * i, font_id)
+        )
+        objects.append(b'<< /Length %d >>\nstream\n' % len(content) + content + b'\nendstream')
+    objects.append(b'<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>')
+
+    out = bytearray(b'%PDF-1.4\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b'%d 0 obj\n' % number + body + b'\nendobj\n'
+    xref = len(out)
+    out += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+    out += b''.join(b'%010d 00000 n \n' % offset for offset in offsets)
+    out += b'trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n' % (len(objects) + 1, xref)
+    return bytes(out)
+
+
+def resume_pdf(seed):
+    """Return the synthetic resume PDF for a seed, with its text lines."""
+    lines = resume_lines(random.Random(seed))
+    return build_pdf(lines), lines
+
+
+def applicant_fields(rng, serial):
+    """
+    Return field values for a random applicant.
+
+    Args:
+        rng: Random generator
+        serial: Number unique across the generated applicants, used to keep
+            emails and phone numbers distinct
+    """
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        'first_name': first,
+        'last_name': last,
+        'email': f'{first.lower()}.{last.lower()}.{serial}@example.com',
+        'phone': f'+9477{serial:08d}',
+        'linkedin': f'https://linkedin.com/in/{first.lower()}{last.lower()}{serial}' if rng.random() < 0.6 else None,
+        'cover_letter': f'I have worked with {rng.choice(rng.choice(list(ROLES.values())))} for '
+                        f'{rng.randint(1, 10)} years and would love to join your team.',
+        'status': rng.choices(list(STATUS_WEIGHTS), weights=STATUS_WEIGHTS.values())[0],
+    }
+
+
+def note_text(rng):
+    """Return a random recruiter note."""
+    return rng.choice(NOTES)
@@ -0,0 +1,146 @@
+"""
+Batch AI screening of a job's applicants.
+
+API calls run on a bounded thread pool behind a token bucket sized to the
+provider quota, and rate-limited calls are retried with exponential backoff.
+Database reads and writes stay on the calling thread.
+"""
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+
+from django.conf import settings
+
+from .utils import analyze_cv_with_gemini, get_cached_analysis, get_resume_extraction, store_analysis
+
+
+class TokenBucket:
+    """Thread-safe token bucket allowing ``rate`` calls per ``per`` seconds."""
+
+    def __init__(self, rate, per=60.0, burst=None):
+        self.capacity = float(burst or rate)
+        self.fill_rate = rate / per
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.fill_rate
+            time.sleep(wait)
+
+
+@dataclass
+class ScreeningSummary:
+    """Counts reported while a job's applicants are screened."""
+
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    skipped: int = 0
+
+
+def _analyze_with_retry(resume_text, job_fields, model, bucket, max_retries, backoff):
+    result = {}
+    for attempt in range(max_retries + 1):
+        bucket.acquire()
+        result = analyze_cv_with_gemini(resume_text=resume_text, model=model, **job_fields)
+        if not result.get('rate_limited') or attempt == max_retries:
+            break
+        time.sleep(backoff * 2 ** attempt * random.uniform(0.5, 1.5))
+    return result
+
+
+def pending_applicants(job, applicant_ids=None):
+    """
+    Return (applicant, resume_text) pairs of a job that have no stored analysis yet.
+
+    Args:
+        job: Job whose applicants are checked
+        applicant_ids: Optional ids restricting which applicants are considered
+
+    Returns:
+        Tuple of (pending pairs, number of applicants skipped)
+    """
+    pending = []
+    skipped = 0
+    applicants = job.applicants.all()
+    if applicant_ids:
+        applicants = applicants.filter(pk__in=applicant_ids)
+    for applicant in applicants:
+        if not applicant.resume.name.endswith('.pdf'):
+            skipped += 1
+            continue
+        extraction = get_resume_extraction(applicant)
+        if not extraction.success or get_cached_analysis(extraction.text, job):
+            skipped += 1
+            continue
+        pending.append((applicant, extraction.text))
+    return pending, skipped
+
+
+def screen_job(job, model=None, concurrency=None, requests_per_minute=None,
+               max_retries=4, backoff=2.0, progress=None, applicant_ids=None, store=True):
+    """
+    Analyze every applicant of a job that has no stored analysis yet.
+
+    Args:
+        job: Job whose applicants are screened
+        model: Optional model client passed to analyze_cv_with_gemini
+        concurrency: Maximum API calls in flight
+        requests_per_minute: Token bucket rate matching the provider quota
+        max_retries: Retries for a rate-limited call before giving up
+        backoff: Base backoff in seconds, doubled on each retry
+        progress: Optional callable receiving the ScreeningSummary after each applicant
+        applicant_ids: Optional ids restricting screening to these applicants
+        store: Save the analyses and applicant scores; off for dry runs against a fake model
+
+    Returns:
+        ScreeningSummary
+    """
+    concurrency = concurrency or settings.AI_SCREENING_CONCURRENCY
+    bucket = TokenBucket(requests_per_minute or settings.AI_REQUESTS_PER_MINUTE)
+    job_fields = {
+        'job_description': job.description,
+        'job_title': job.title,
+        'job_requirements': job.requirements,
+    }
+
+    pending, skipped = pending_applicants(job, applicant_ids)
+    # Applicants who sent the same resume share one analysis
+    ids_by_text = {}
+    for applicant, text in pending:
+        ids_by_text.setdefault(text, []).append(applicant.pk)
+    texts = list(ids_by_text)
+    summary = ScreeningSummary(total=len(texts), skipped=skipped + len(pending) - len(texts))
+    if progress:
+        progress(summary)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {
+            pool.submit(_analyze_with_retry, text, job_fields, model, bucket, max_retries, backoff): text
+            for text in texts
+        }
+        for future in as_completed(futures):
+            result = future.result()
+            if result.get('success'):
+                if store:
+                    text = futures[future]
+                    store_analysis(text, job, result, ids_by_text[text])
+                summary.completed += 1
+            else:
+                summary.failed += 1
+            if progress:
+                progress(summary)
+
+    return summary
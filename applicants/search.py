@@ -0,0 +1,285 @@
+"""
+Full-text search over applicants and their resume text.
+
+SQLite uses an FTS5 virtual table and Postgres a tsvector column with a GIN
+index, both named ``applicants_search`` and created by migration 0011. The
+index holds one row per applicant (name, email, cover letter and extracted
+resume text) and is updated incrementally by signal handlers.
+
+Queries accept bare terms (all must match), ``OR``, ``AND``, ``NOT``,
+"quoted phrases" and ``prefix*`` terms, e.g. ``Kubernetes AND Terraform``.
+"""
+import re
+from dataclasses import dataclass
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .extraction import EXTRACTOR_VERSION
+from .models import Applicant, ResumeExtraction
+
+SEARCH_TABLE = 'applicants_search'
+SEARCH_LIMIT = 200
+
+# Markers placed around matches in snippets; replaced by <mark> after escaping
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+
+QUERY_TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+WORD_RE = re.compile(r'\w+')
+
+
+def is_supported():
+    """Return True if the database has an indexed full-text search backend."""
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+@dataclass(frozen=True)
+class Term:
+    """One search term or phrase."""
+
+    text: str
+    negated: bool = False
+    prefix: bool = False
+
+
+def parse_query(query):
+    """
+    Parse a search query into OR-groups of AND-ed terms.
+
+    Args:
+        query: Query typed by the recruiter
+
+    Returns:
+        List of groups, each a list of Term; groups without a positive term are dropped
+    """
+    groups = [[]]
+    negate = False
+    for phrase, word in QUERY_TOKEN_RE.findall(query):
+        if word in ('AND', 'OR', 'NOT'):
+            if word == 'OR' and groups[-1]:
+                groups.append([])
+            negate = word == 'NOT'
+            continue
+        text = phrase if phrase else word
+        prefix = not phrase and text.endswith('*')
+        words = WORD_RE.findall(text)
+        if words:
+            groups[-1].append(Term(' '.join(words), negated=negate, prefix=prefix and len(words) == 1))
+        negate = False
+    return [group for group in groups if any(not term.negated for term in group)]
+
+
+def _fts5_expression(groups):
+    def term(t):
+        return '"' + t.text.replace('"', '""') + '"' + ('*' if t.prefix else '')
+
+    clauses = []
+    for group in groups:
+        positive = ' AND '.join(term(t) for t in group if not t.negated)
+        negative = ''.join(f' NOT {term(t)}' for t in group if t.negated)
+        clauses.append(f'({positive}{negative})')
+    return ' OR '.join(clauses)
+
+
+def _tsquery_sql(groups):
+    clauses = []
+    params = []
+    for group in groups:
+        parts = []
+        for t in group:
+            if t.prefix:
+                sql = "to_tsquery('english', %s)"
+                params.append(t.text + ':*')
+            else:
+                sql = "phraseto_tsquery('english', %s)"
+                params.append(t.text)
+            parts.append('!!' + sql if t.negated else sql)
+        clauses.append('(' + ' && '.join(parts) + ')')
+    return '(' + ' || '.join(clauses) + ')', params
+
+
+def _documents(applicant_ids):
+    applicants = list(Applicant.objects.filter(pk__in=applicant_ids).values_list(
+        'pk', 'first_name', 'last_name', 'email', 'cover_letter', 'resume_hash'
+    ))
+    texts = dict(ResumeExtraction.objects.filter(
+        content_hash__in={row[5] for row in applicants if row[5]},
+        extractor_version=EXTRACTOR_VERSION,
+        success=True,
+    ).values_list('content_hash', 'text'))
+    return [
+        (pk, f'{first_name} {last_name}', email, cover_letter, texts.get(resume_hash, ''))
+        for pk, first_name, last_name, email, cover_letter, resume_hash in applicants
+    ]
+
+
+def index_applicants(applicant_ids):
+    """
+    Add or refresh the search index rows of the given applicants.
+
+    Args:
+        applicant_ids: Primary keys of the applicants to index
+    """
+    applicant_ids = list(applicant_ids)
+    if not applicant_ids or not is_supported():
+        return
+    documents = _documents(applicant_ids)
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(
+                f'DELETE FROM {SEARCH_TABLE} WHERE rowid IN ({", ".join(["%s"] * len(applicant_ids))})',
+                applicant_ids
+            )
+            cursor.executemany(
+                f'INSERT INTO {SEARCH_TABLE} (rowid, name, email, cover_letter, resume) VALUES (%s, %s, %s, %s, %s)',
+                documents
+            )
+        else:
+            cursor.executemany(
+                f"""INSERT INTO {SEARCH_TABLE} (applicant_id, content, document)
+                VALUES (%s, concat_ws(E'\\n', %s, %s, %s, %s),
+                        setweight(to_tsvector('english', %s), 'A') || setweight(to_tsvector('simple', %s), 'A')
+                        || setweight(to_tsvector('english', %s), 'B') || setweight(to_tsvector('english', %s), 'C'))
+                ON CONFLICT (applicant_id) DO UPDATE SET content = EXCLUDED.content, document = EXCLUDED.document""",
+                [(pk, *fields, *fields) for pk, *fields in documents]
+            )
+
+
+def remove_applicants(applicant_ids):
+    """
+    Drop the search index rows of the given applicants.
+
+    Args:
+        applicant_ids: Primary keys of the removed applicants
+    """
+    applicant_ids = list(applicant_ids)
+    if not applicant_ids or not is_supported():
+        return
+    column = 'rowid' if connection.vendor == 'sqlite' else 'applicant_id'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE {column} IN ({", ".join(["%s"] * len(applicant_ids))})',
+            applicant_ids
+        )
+
+
+@dataclass
+class SearchHit:
+    """A matching applicant with its relevance rank (higher is better) and snippet."""
+
+    applicant_id: int
+    rank: float
+    snippet: str
+
+
+def matching(query):
+    """
+    Return a filter matching every applicant a search query finds, without ranking or a limit.
+
+    Args:
+        query: Search query
+
+    Returns:
+        Q object for an Applicant queryset
+    """
+    groups = parse_query(query)
+    if not groups:
+        return Q(pk__in=[])
+    if connection.vendor == 'sqlite':
+        return Q(pk__in=RawSQL(
+            f'SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s', [_fts5_expression(groups)]
+        ))
+    if connection.vendor == 'postgresql':
+        tsquery, params = _tsquery_sql(groups)
+        return Q(pk__in=RawSQL(f'SELECT applicant_id FROM {SEARCH_TABLE} WHERE document @@ {tsquery}', params))
+    return _fallback_condition(groups)
+
+
+def search_applicants(query, recruiter, limit=SEARCH_LIMIT, within=None):
+    """
+    Search the applicants of a recruiter's jobs.
+
+    Args:
+        query: Search query
+        recruiter: User whose jobs' applicants are searched
+        limit: Maximum number of hits
+        within: Optional Applicant queryset the hits must belong to; its filters
+            are applied before the limit
+
+    Returns:
+        List of SearchHit, best first
+    """
+    groups = parse_query(query)
+    if not groups:
+        return []
+    within_sql, within_params = '', []
+    if within is not None:
+        subquery, within_params = within.order_by().values('pk').query.sql_with_params()
+        within_sql = f' AND a.id IN ({subquery})'
+
+    if connection.vendor == 'sqlite':
+        sql = f"""
+            SELECT {SEARCH_TABLE}.rowid, -bm25({SEARCH_TABLE}, 10.0, 10.0, 2.0, 1.0),
+                   snippet({SEARCH_TABLE}, -1, %s, %s, '…', 16)
+            FROM {SEARCH_TABLE}
+            JOIN applicants_applicant a ON a.id = {SEARCH_TABLE}.rowid
+            JOIN jobs_job j ON j.id = a.applied_job_id
+            WHERE {SEARCH_TABLE} MATCH %s AND j.created_by_id = %s{within_sql}
+            ORDER BY bm25({SEARCH_TABLE}, 10.0, 10.0, 2.0, 1.0)
+            LIMIT %s
+        """
+        params = [HIGHLIGHT_START, HIGHLIGHT_END, _fts5_expression(groups), recruiter.pk, *within_params, limit]
+    elif connection.vendor == 'postgresql':
+        tsquery, tsquery_params = _tsquery_sql(groups)
+        options = f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_END}, MaxFragments=2, MaxWords=16, MinWords=6'
+        sql = f"""
+            WITH q AS (SELECT {tsquery} AS query)
+            SELECT hit.applicant_id, hit.rank, ts_headline('english', hit.content, q.query, %s)
+            FROM (
+                SELECT s.applicant_id, s.content, ts_rank_cd(s.document, q.query) AS rank
+                FROM {SEARCH_TABLE} s
+                JOIN applicants_applicant a ON a.id = s.applicant_id
+                JOIN jobs_job j ON j.id = a.applied_job_id
+                CROSS JOIN q
+                WHERE s.document @@ q.query AND j.created_by_id = %s{within_sql}
+                ORDER BY rank DESC
+                LIMIT %s
+            ) hit CROSS JOIN q
+            ORDER BY hit.rank DESC
+        """
+        params = [*tsquery_params, options, recruiter.pk, *within_params, limit]
+    else:
+        return _search_fallback(groups, recruiter, limit, within)
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [SearchHit(pk, rank, snippet) for pk, rank, snippet in cursor.fetchall()]
+
+
+def _fallback_condition(groups):
+    condition = Q(pk__in=[])
+    for group in groups:
+        clause = Q()
+        for term in group:
+            match = (Q(first_name__icontains=term.text) | Q(last_name__icontains=term.text)
+                     | Q(email__icontains=term.text) | Q(cover_letter__icontains=term.text))
+            clause &= ~match if term.negated else match
+        condition |= clause
+    return condition
+
+
+def _search_fallback(groups, recruiter, limit, within=None):
+    """Unindexed scan for databases without a full-text backend."""
+    applicants = Applicant.objects.all() if within is None else within.order_by()
+    ids = applicants.filter(_fallback_condition(groups), applied_job__created_by=recruiter).values_list('pk', flat=True)
+    return [SearchHit(pk, 0.0, '') for pk in ids[:limit]]
+
+
+def highlight(snippet):
+    """Escape a snippet and wrap its matches in <mark> tags."""
+    html = escape(snippet).replace(HIGHLIGHT_START, '<mark>').replace(HIGHLIGHT_END, '</mark>')
+    return mark_safe(html)
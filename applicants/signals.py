@@ -0,0 +1,138 @@
+"""
+Signal handlers for applicant side effects.
+"""
+import contextvars
+import functools
+import os
+from contextlib import contextmanager
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from jobs.cache import bump_generation, bump_public_generation
+
+from . import search
+from .models import Applicant, ApplicantCount, ApplicantNote, ResumeBlob, ResumeExtraction
+
+_bulk = contextvars.ContextVar('applicant_bulk_change', default=False)
+
+
+@contextmanager
+def bulk_change():
+    """
+    Skip the per-row handlers below while a batch is written.
+
+    The caller applies the batch's counter, search and cache side effects itself.
+    """
+    token = _bulk.set(True)
+    try:
+        yield
+    finally:
+        _bulk.reset(token)
+
+
+def _per_row(handler):
+    @functools.wraps(handler)
+    def wrapper(*args, **kwargs):
+        if not _bulk.get():
+            handler(*args, **kwargs)
+    return wrapper
+
+
+@receiver(post_save, sender=Applicant)
+@_per_row
+def acquire_resume_blob(sender, instance, created, **kwargs):
+    """Count a new application's reference to its stored resume."""
+    upload = instance.__dict__.pop('_resume_upload', None)
+    if not created or not instance.resume:
+        return
+    ResumeBlob.acquire(instance.resume.name)
+    storage = instance.resume.storage
+    if upload is not None and not storage.exists(instance.resume.name):
+        # A concurrent delete removed the shared file before this reference was
+        # counted; store the upload again under the same name.
+        upload.seek(0)
+        field = instance.resume.field
+        storage.save(field.generate_filename(instance, os.path.basename(instance.resume.name)), upload)
+
+
+@receiver(post_delete, sender=Applicant)
+@_per_row
+def release_resume_blob(sender, instance, **kwargs):
+    """Delete the stored resume once no application references it."""
+    if instance.resume:
+        ResumeBlob.release(instance.resume.name, instance.resume.storage)
+
+
+@receiver(post_save, sender=Applicant)
+@_per_row
+def index_applicant(sender, instance, **kwargs):
+    """Refresh the applicant's full-text search row."""
+    search.index_applicants([instance.pk])
+
+
+@receiver(post_delete, sender=Applicant)
+@_per_row
+def unindex_applicant(sender, instance, **kwargs):
+    """Drop the deleted applicant's full-text search row."""
+    search.remove_applicants([instance.pk])
+
+
+@receiver(post_save, sender=ResumeExtraction)
+@_per_row
+def index_resume_text(sender, instance, **kwargs):
+    """Make newly extracted resume text searchable for every applicant who sent it."""
+    if instance.success:
+        search.index_applicants(
+            Applicant.objects.filter(resume_hash=instance.content_hash).values_list('pk', flat=True)
+        )
+
+
+@receiver(post_save, sender=Applicant)
+@_per_row
+def count_applicant(sender, instance, created, **kwargs):
+    """Keep the per-job, per-status applicant counters current."""
+    if created:
+        ApplicantCount.adjust(instance.applied_job_id, instance.status, 1)
+        return
+    previous = getattr(instance, '_loaded_status', None)
+    previous_job_id = getattr(instance, '_loaded_job_id', None) or instance.applied_job_id
+    if previous and (previous_job_id, previous) != (instance.applied_job_id, instance.status):
+        ApplicantCount.adjust(previous_job_id, previous, -1)
+        ApplicantCount.adjust(instance.applied_job_id, instance.status, 1)
+
+
+@receiver(post_delete, sender=Applicant)
+@_per_row
+def uncount_applicant(sender, instance, **kwargs):
+    """Remove a deleted applicant from its job's counters."""
+    status = getattr(instance, '_loaded_status', None) or instance.status
+    job_id = getattr(instance, '_loaded_job_id', None) or instance.applied_job_id
+    ApplicantCount.adjust(job_id, status, -1)
+
+
+@receiver([post_save, post_delete], sender=Applicant)
+@_per_row
+def invalidate_recruiter_dashboard(sender, instance, **kwargs):
+    """Drop the recruiter's cached dashboard fragments when an applicant changes."""
+    bump_generation(instance.recruiter_id)
+    previous = getattr(instance, '_loaded_recruiter_id', None)
+    if previous and previous != instance.recruiter_id:
+        bump_generation(previous)
+
+
+@receiver([post_save, post_delete], sender=Applicant)
+@_per_row
+def invalidate_public_job_pages(sender, instance, signal, created=False, **kwargs):
+    """Drop the cached public job pages when a job's applicant count changes."""
+    moved = getattr(instance, '_loaded_job_id', None) not in (None, instance.applied_job_id)
+    if created or moved or signal is post_delete:
+        bump_public_generation()
+
+
+@receiver([post_save, post_delete], sender=ApplicantNote)
+@_per_row
+def invalidate_dashboard_on_note(sender, instance, **kwargs):
+    """Drop the recruiter's cached dashboard fragments when a note changes."""
+    recruiter_id = Applicant.objects.filter(pk=instance.applicant_id).values_list('recruiter_id', flat=True).first()
+    bump_generation(recruiter_id)
@@ -0,0 +1,76 @@
+"""
+Content-addressed storage for resume uploads.
+"""
+import hashlib
+import os
+import re
+import tempfile
+
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage, storages
+
+HASH_NAME_RE = re.compile(r'^[0-9a-f]{64}$')
+
+
+def get_resume_storage():
+    """Return the storage configured for resumes in settings.STORAGES."""
+    return storages['resumes']
+
+
+def content_hash_from_name(name):
+    """
+    Return the SHA-256 encoded in a content-addressed file name.
+
+    Args:
+        name: Storage name of the file
+
+    Returns:
+        Hex digest, or None for files stored under their upload name
+    """
+    stem = os.path.splitext(os.path.basename(name or ''))[0]
+    return stem if HASH_NAME_RE.match(stem) else None
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that names files by the SHA-256 of their contents.
+
+    Uploads are hashed while they are written to a temporary file, then moved
+    to ``<upload dir>/<hash[:2]>/<hash><ext>``. Identical uploads therefore
+    resolve to the same name and are stored once.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is chosen from the content in _save(); equal names mean equal files.
+        return name
+
+    def _save(self, name, content):
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1].lower()
+        os.makedirs(self.location, exist_ok=True)
+
+        digest = hashlib.sha256()
+        fd, tmp_path = tempfile.mkstemp(dir=self.location, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    tmp.write(chunk)
+
+            content_hash = digest.hexdigest()
+            final_name = '/'.join(filter(None, [directory, content_hash[:2], content_hash + extension]))
+            full_path = self.path(final_name)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+            if os.path.exists(full_path):
+                os.remove(tmp_path)
+            else:
+                file_move_safe(tmp_path, full_path, allow_overwrite=True)
+                if self.file_permissions_mode is not None:
+                    os.chmod(full_path, self.file_permissions_mode)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return final_name
@@ -0,0 +1,312 @@
+"""
+Database-backed work queue for background resume processing.
+
+Tasks are rows in ResumeTask. Workers claim them with a conditional UPDATE,
+which is atomic on both SQLite and PostgreSQL, so no broker is required.
+"""
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Applicant, ResumeBlob, ResumeTask, ScreeningRun
+from .storage import content_hash_from_name
+from .utils import get_cached_analysis, get_resume_extraction, record_applicant_scores
+
+logger = logging.getLogger(__name__)
+
+# Seconds before a running task whose worker disappeared is handed out again
+STALE_LOCK_SECONDS = 600
+
+# Base delay in seconds for exponential retry backoff
+RETRY_BASE_DELAY = 30
+
+# Seconds a stored resume file may go without a blob row before it is swept as orphaned
+ORPHAN_GRACE_SECONDS = 3600
+
+# Processing steps queued for every new application, in order
+RESUME_PIPELINE = ['extract_text']
+
+
+def _extract_text(applicant):
+    """
+    Extract and store resume text for an applicant.
+
+    If the resume was already analyzed against the applicant's job, the stored
+    score is copied onto the applicant.
+    """
+    if not applicant.resume.name.endswith('.pdf'):
+        return
+    extraction = get_resume_extraction(applicant)
+    if not extraction.success:
+        raise RuntimeError(extraction.message)
+    analysis = get_cached_analysis(extraction.text, applicant.applied_job)
+    if analysis:
+        record_applicant_scores([applicant.pk], analysis)
+
+
+HANDLERS = {
+    'extract_text': _extract_text,
+}
+
+
+def default_worker_id():
+    """Return an identifier for the current worker process."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def enqueue(applicant, kind):
+    """
+    Add a processing task for an applicant to the queue.
+
+    Args:
+        applicant: Applicant instance
+        kind: Task kind, one of ResumeTask.KIND_CHOICES
+
+    Returns:
+        The created ResumeTask
+    """
+    return ResumeTask.objects.create(applicant=applicant, kind=kind)
+
+
+def enqueue_resume_processing(applicant):
+    """Queue every processing step a newly submitted resume needs."""
+    # New applicants are created pending; only a resubmitted one needs the UPDATE
+    if applicant.processing_status != 'pending':
+        Applicant.objects.filter(pk=applicant.pk).update(processing_status='pending')
+        applicant.processing_status = 'pending'
+    return [enqueue(applicant, kind) for kind in RESUME_PIPELINE]
+
+
+def requeue_stale_tasks():
+    """Release tasks held by workers that stopped without finishing them."""
+    cutoff = timezone.now() - timedelta(seconds=STALE_LOCK_SECONDS)
+    return ResumeTask.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='pending', locked_by='', locked_at=None
+    )
+
+
+def requeue_stale_screening_runs():
+    """Release screening runs held by workers that stopped without finishing them."""
+    cutoff = timezone.now() - timedelta(seconds=STALE_LOCK_SECONDS)
+    return ScreeningRun.objects.filter(status='running', locked_at__lt=cutoff).update(
+        status='pending', locked_by='', locked_at=None
+    )
+
+
+def claim_next(worker_id):
+    """
+    Claim the next runnable task for a worker.
+
+    Args:
+        worker_id: Identifier recorded on the claimed task
+
+    Returns:
+        The claimed ResumeTask, or None if the queue is empty
+    """
+    now = timezone.now()
+    candidates = ResumeTask.objects.filter(
+        status='pending', run_after__lte=now
+    ).values_list('pk', flat=True)[:10]
+
+    for pk in candidates:
+        claimed = ResumeTask.objects.filter(pk=pk, status='pending').update(
+            status='running',
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return ResumeTask.objects.select_related('applicant').get(pk=pk)
+    return None
+
+
+def _update_applicant_status(applicant_id):
+    """Derive an applicant's processing status from its outstanding tasks."""
+    tasks = ResumeTask.objects.filter(applicant_id=applicant_id)
+    if tasks.filter(status='failed').exists():
+        status = 'failed'
+    elif tasks.filter(status__in=['pending', 'running']).exists():
+        status = 'processing'
+    else:
+        status = 'ready'
+    Applicant.objects.filter(pk=applicant_id).update(processing_status=status)
+
+
+def run_task(task):
+    """
+    Run a claimed task, recording success, a scheduled retry or a final failure.
+
+    Args:
+        task: ResumeTask claimed by the current worker
+
+    Returns:
+        True if the task succeeded
+    """
+    Applicant.objects.filter(pk=task.applicant_id).update(processing_status='processing')
+    try:
+        HANDLERS[task.kind](task.applicant)
+    except Exception as e:
+        task.last_error = str(e)[:1000]
+        if task.attempts >= task.max_attempts:
+            task.status = 'failed'
+            logger.warning('Task %s failed permanently: %s', task.pk, task.last_error)
+        else:
+            task.status = 'pending'
+            task.run_after = timezone.now() + timedelta(
+                seconds=RETRY_BASE_DELAY * 2 ** (task.attempts - 1)
+            )
+        succeeded = False
+    else:
+        task.status = 'done'
+        task.last_error = ''
+        succeeded = True
+
+    task.locked_by = ''
+    task.locked_at = None
+    task.save(update_fields=['status', 'last_error', 'run_after', 'locked_by', 'locked_at', 'updated_at'])
+    _update_applicant_status(task.applicant_id)
+    return succeeded
+
+
+def process_available(worker_id, limit=None):
+    """
+    Run queued tasks until the queue is empty or the limit is reached.
+
+    Args:
+        worker_id: Identifier recorded on claimed tasks
+        limit: Maximum number of tasks to run, or None for no limit
+
+    Returns:
+        Number of tasks run
+    """
+    processed = 0
+    while limit is None or processed < limit:
+        task = claim_next(worker_id)
+        if task is None:
+            break
+        run_task(task)
+        processed += 1
+    return processed
+
+
+def sweep_unreferenced_resumes(limit=100):
+    """
+    Delete stored resume files that no application references any more.
+
+    Bulk deletes only release their references; the files are removed here, off
+    the request path.
+
+    Args:
+        limit: Maximum number of files to remove in one call
+
+    Returns:
+        Number of files removed
+    """
+    storage = Applicant._meta.get_field('resume').storage
+    removed = 0
+    for name in ResumeBlob.objects.filter(ref_count=0).values_list('name', flat=True)[:limit]:
+        # A new application may have picked the file up again since it was listed;
+        # the file goes while the row is locked so such an application waits for it.
+        with transaction.atomic():
+            deleted, _ = ResumeBlob.objects.filter(name=name, ref_count=0).delete()
+            if deleted:
+                storage.delete(name)
+        removed += bool(deleted)
+    return removed
+
+
+def sweep_orphaned_resumes(limit=100, grace_seconds=ORPHAN_GRACE_SECONDS):
+    """
+    Delete stored resume files that never got a blob row.
+
+    A file is written before its application is inserted, so an insert that
+    fails leaves the file behind with no reference to count. Files younger
+    than the grace period may belong to an application still being saved and
+    are kept.
+
+    Args:
+        limit: Maximum number of files to remove in one call
+        grace_seconds: Age a file must reach before it counts as orphaned
+
+    Returns:
+        Number of files removed
+    """
+    field = Applicant._meta.get_field('resume')
+    storage = field.storage
+    upload_dir = field.upload_to.rstrip('/')
+    if not storage.exists(upload_dir):
+        return 0
+    cutoff = timezone.now() - timedelta(seconds=grace_seconds)
+
+    removed = 0
+    for prefix in storage.listdir(upload_dir)[0]:
+        names = [
+            f'{upload_dir}/{prefix}/{filename}'
+            for filename in storage.listdir(f'{upload_dir}/{prefix}')[1]
+            if content_hash_from_name(filename)
+        ]
+        known = set(ResumeBlob.objects.filter(name__in=names).values_list('name', flat=True))
+        for name in names:
+            if name in known or storage.get_modified_time(name) > cutoff:
+                continue
+            if ResumeBlob.delete_orphan(name, storage):
+                removed += 1
+                if removed >= limit:
+                    return removed
+    return removed
+
+
+def claim_screening_run(worker_id):
+    """
+    Claim the oldest pending screening run for a worker.
+
+    Returns:
+        The claimed ScreeningRun, or None if there is none
+    """
+    for pk in ScreeningRun.objects.filter(status='pending').order_by('created_at').values_list('pk', flat=True)[:10]:
+        now = timezone.now()
+        if ScreeningRun.objects.filter(pk=pk, status='pending').update(
+            status='running', locked_by=worker_id, locked_at=now, updated_at=now
+        ):
+            return ScreeningRun.objects.select_related('job').get(pk=pk)
+    return None
+
+
+def run_screening(run, model=None):
+    """
+    Screen a run's job, recording progress on the run as applicants complete.
+
+    Each progress update refreshes the run's lock. An interrupted run is handed
+    back to the queue; one whose worker died is reclaimed by
+    requeue_stale_screening_runs. Applicants analyzed before the interruption
+    are skipped when the run starts again.
+    """
+    from .screening import screen_job
+
+    def progress(summary):
+        now = timezone.now()
+        ScreeningRun.objects.filter(pk=run.pk).update(
+            total=summary.total,
+            completed=summary.completed,
+            failed=summary.failed,
+            skipped=summary.skipped,
+            locked_at=now,
+            updated_at=now,
+        )
+
+    try:
+        screen_job(run.job, model=model, progress=progress, applicant_ids=run.applicant_ids)
+    except Exception as e:
+        logger.exception('Screening run %s failed', run.pk)
+        ScreeningRun.objects.filter(pk=run.pk).update(status='failed', last_error=str(e)[:1000])
+    except BaseException:
+        ScreeningRun.objects.filter(pk=run.pk).update(status='pending', locked_by='', locked_at=None)
+        raise
+    else:
+        ScreeningRun.objects.filter(pk=run.pk).update(status='done')
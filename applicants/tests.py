@@ -1,13 +1,68 @@
 """
 Tests for applicants app.
 """
-from django.test import TestCase, Client
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from io import StringIO
+from concurrent.futures import Future, TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.contrib import admin
+from django.contrib.messages import get_messages
+from django.test import TestCase, TransactionTestCase, Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from datetime import date, timedelta
+from ats_project.testing import QueryBudget, QueryBudgetAssertionsMixin, QueryPlanAssertionsMixin
 from jobs.models import Job
-from .models import Applicant
+from .models import (
+    Applicant, ApplicantCount, ApplicantNote, ResumeAnalysis, ResumeBlob, ResumeExtraction, ResumeTask, ScreeningRun,
+)
+from .management.commands import reextract_resumes
+from . import (
+    ai, export, extraction, importer, normalization, ranking, sample_data, screening, search, tasks, utils, views,
+)
+
+
+def make_pdf(*pages):
+    """Build a minimal PDF with one line of text per page."""
+    objects = ['<< /Type /Catalog /Pages 2 0 R >>', None,
+               '<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>']
+    kids = []
+    for text in pages:
+        stream = f'BT /F1 12 Tf 72 720 Td ({text}) Tj ET'
+        objects.append(f'<< /Length {len(stream)} >>\nstream\n{stream}\nendstream')
+        objects.append(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] '
+            f'/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>'
+        )
+        kids.append(f'{len(objects)} 0 R')
+    objects[1] = f'<< /Type /Pages /Kids [{" ".join(kids)}] /Count {len(kids)} >>'
+
+    out = b'%PDF-1.4\n'
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f'{number} 0 obj\n{body}\nendobj\n'.encode()
+    xref = len(out)
+    out += f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode()
+    for offset in offsets:
+        out += f'{offset:010d} 00000 n \n'.encode()
+    out += f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'.encode()
+    return out
 
 
 class ApplicantModelTestCase(TestCase):
@@ -43,3 +98,1826 @@ class ApplicantModelTestCase(TestCase):
         """Test applicant string representation."""
         expected = 'John Doe - Software Engineer'
         self.assertEqual(str(self.applicant), expected)
+
+
+class ResumeExtractionTestCase(TestCase):
+    """Test cases for stored resume extractions."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        self.applicant = Applicant.objects.create(
+            first_name='John',
+            last_name='Doe',
+            email='john@example.com',
+            phone='1234567890',
+            applied_job=self.job,
+            resume=SimpleUploadedFile('resume.pdf', make_pdf('Python developer', 'Django expert'))
+        )
+
+    def test_extraction_is_stored(self):
+        """Test resume text and page count are stored once per file."""
+        extraction = utils.get_resume_extraction(self.applicant)
+        self.assertTrue(extraction.success)
+        self.assertEqual(extraction.page_count, 2)
+        self.assertIn('Python developer', extraction.text)
+        self.applicant.refresh_from_db()
+        self.assertEqual(self.applicant.resume_hash, extraction.content_hash)
+
+        with mock.patch.object(utils, 'extract_text_from_pdf') as extract:
+            self.assertEqual(utils.get_resume_extraction(self.applicant).pk, extraction.pk)
+        extract.assert_not_called()
+
+    def test_extractor_version_change_reextracts(self):
+        """Test a new extractor version triggers a fresh extraction."""
+        utils.get_resume_extraction(self.applicant)
+        with mock.patch.object(utils, 'EXTRACTOR_VERSION', utils.EXTRACTOR_VERSION + 1):
+            extraction = utils.get_resume_extraction(self.applicant)
+        self.assertEqual(extraction.extractor_version, utils.EXTRACTOR_VERSION + 1)
+        self.assertEqual(ResumeExtraction.objects.count(), 2)
+
+    def test_detail_view_uses_stored_text(self):
+        """Test the detail view does not re-parse the PDF on repeat visits."""
+        self.client.login(username='recruiter', password='pass123')
+        url = reverse('applicants:applicant_detail', args=[self.applicant.pk])
+        self.assertContains(self.client.get(url), 'Django expert')
+        with mock.patch.object(utils, 'extract_text_from_pdf') as extract:
+            self.assertContains(self.client.get(url), 'Django expert')
+        extract.assert_not_called()
+
+
+class ResumeTaskQueueTestCase(TestCase):
+    """Test cases for the background resume-processing queue."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+
+    def apply(self):
+        return self.client.post(reverse('applicants:apply', args=[self.job.pk]), {
+            'first_name': 'Jane',
+            'last_name': 'Roe',
+            'email': 'jane@example.com',
+            'phone': '0771234567',
+            'resume': SimpleUploadedFile('cv.pdf', make_pdf('Kubernetes and Terraform')),
+        })
+
+    def test_apply_enqueues_without_extracting(self):
+        """Test applying queues extraction instead of parsing in the request."""
+        with mock.patch.object(utils, 'extract_text_from_pdf') as extract:
+            response = self.apply()
+        self.assertRedirects(response, reverse('applicants:application_success'))
+        extract.assert_not_called()
+        applicant = Applicant.objects.get()
+        self.assertEqual(applicant.processing_status, 'pending')
+        self.assertEqual(applicant.tasks.get().kind, 'extract_text')
+
+    def test_worker_processes_queue(self):
+        """Test the worker claims and completes queued tasks."""
+        self.apply()
+        self.assertEqual(tasks.process_available('test-worker'), 1)
+        applicant = Applicant.objects.get()
+        self.assertEqual(applicant.processing_status, 'ready')
+        self.assertEqual(applicant.tasks.get().status, 'done')
+        self.assertTrue(ResumeExtraction.objects.filter(content_hash=applicant.resume_hash).exists())
+
+    def test_failed_task_is_retried_then_marked_failed(self):
+        """Test failing tasks back off and are failed after max attempts."""
+        self.apply()
+        task = ResumeTask.objects.get()
+        with mock.patch.dict(tasks.HANDLERS, {'extract_text': mock.Mock(side_effect=RuntimeError('boom'))}):
+            for attempt in range(task.max_attempts):
+                ResumeTask.objects.filter(pk=task.pk).update(run_after=task.created_at)
+                self.assertEqual(tasks.process_available('test-worker'), 1)
+        task.refresh_from_db()
+        self.assertEqual(task.status, 'failed')
+        self.assertEqual(task.attempts, task.max_attempts)
+        self.assertEqual(task.last_error, 'boom')
+        self.assertEqual(Applicant.objects.get().processing_status, 'failed')
+
+
+class DuplicateApplicationTestCase(TransactionTestCase):
+    """Test cases for rejecting a second application with the same email or phone."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+
+    def apply(self, client, email='jane@example.com', phone='0771234567'):
+        return client.post(reverse('applicants:apply', args=[self.job.pk]), {
+            'first_name': 'Jane',
+            'last_name': 'Roe',
+            'email': email,
+            'phone': phone,
+            'resume': SimpleUploadedFile('cv.pdf', make_pdf('Python')),
+        })
+
+    @staticmethod
+    def errors(response):
+        return [str(m) for m in get_messages(response.wsgi_request) if m.level_tag == 'error']
+
+    def test_duplicate_checked_in_one_query(self):
+        """Test a repeated email and phone are both reported from a single lookup."""
+        self.apply(Client())
+        with CaptureQueriesContext(connection) as captured:
+            response = self.apply(Client())
+        self.assertRedirects(response, reverse('jobs:job_detail', args=[self.job.pk]), fetch_redirect_response=False)
+        self.assertEqual(self.errors(response), [
+            'You have already applied for this position with email jane@example.com.',
+            'You have already applied for this position with phone number 0771234567.',
+        ])
+        lookups = [q for q in captured if q['sql'].startswith('SELECT "applicants_applicant"."normalized_email"')]
+        self.assertEqual(len(lookups), 1)
+
+        response = self.apply(Client(), email='other@example.com')
+        self.assertEqual(self.errors(response), [
+            'You have already applied for this position with phone number 0771234567.',
+        ])
+        self.assertEqual(Applicant.objects.count(), 1)
+
+    def test_duplicate_matches_normalized_contacts(self):
+        """Test differently written copies of an email or phone number are the same applicant."""
+        self.apply(Client())
+        response = self.apply(Client(), email=' Jane@Example.COM', phone='+94 77 123 4567')
+        self.assertEqual(self.errors(response), [
+            'You have already applied for this position with email Jane@Example.COM.',
+            'You have already applied for this position with phone number +94 77 123 4567.',
+        ])
+        self.assertEqual(self.errors(self.apply(Client(), email='new@example.com', phone='no digits')), [])
+        self.assertEqual(Applicant.objects.count(), 1)
+
+        applicant = Applicant.objects.get()
+        self.assertEqual((applicant.normalized_email, applicant.normalized_phone), ('jane@example.com', '+94771234567'))
+        # The constraint holds for saves that skip the view's check
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Applicant.objects.create(
+                first_name='Jane',
+                last_name='Roe',
+                email='JANE@example.com',
+                phone='0711111111',
+                applied_job=self.job,
+                resume=SimpleUploadedFile('cv.pdf', b'%PDF-1.4 test')
+            )
+
+    def test_legacy_duplicate_can_be_saved(self):
+        """Test a row the backfill left without keys saves until its contacts change."""
+        self.apply(Client())
+        legacy = Applicant.objects.create(
+            first_name='Jane',
+            last_name='Roe',
+            email='legacy@example.com',
+            phone='0710000000',
+            applied_job=self.job,
+            resume=SimpleUploadedFile('cv.pdf', b'%PDF-1.4 test')
+        )
+        # As migration 0014 leaves a row duplicating an earlier application
+        Applicant.objects.filter(pk=legacy.pk).update(
+            email='JANE@example.com', phone='+94 77 123 4567', normalized_email=None, normalized_phone=None
+        )
+
+        client = Client()
+        client.login(username='recruiter', password='pass123')
+        response = client.post(reverse('applicants:applicant_detail', args=[legacy.pk]), {
+            'update_status': '1', 'status': 'screening',
+        })
+        self.assertRedirects(response, reverse('applicants:applicant_detail', args=[legacy.pk]))
+        legacy.refresh_from_db()
+        self.assertEqual(legacy.status, 'screening')
+        self.assertEqual((legacy.normalized_email, legacy.normalized_phone), (None, None))
+
+        legacy.email, legacy.phone = 'jane.roe@example.com', '0719999999'
+        legacy.save()
+        legacy.refresh_from_db()
+        self.assertEqual((legacy.normalized_email, legacy.normalized_phone), ('jane.roe@example.com', '+94719999999'))
+
+    def test_normalize_phone(self):
+        """Test national, international and separated numbers share one E.164 form."""
+        for phone in ['0771234567', '077-123 4567', '+94 (77) 123-4567', '0094771234567', '94771234567', '771234567']:
+            with self.subTest(phone=phone):
+                self.assertEqual(normalization.normalize_phone(phone), '+94771234567')
+        self.assertEqual(normalization.normalize_phone('+1 415 555 0100'), '+14155550100')
+        self.assertEqual(normalization.normalize_phone('020 7946 0018', country_code='44'), '+442079460018')
+        self.assertEqual(normalization.normalize_phone(' - '), '')
+
+    def test_parallel_submissions(self):
+        """Test concurrent submissions that all pass the check create one applicant and no errors."""
+        submissions = 4
+        # Hold every request after its duplicate check until all have passed it, then
+        # let them write one at a time, since SQLite's shared test database cannot
+        # take concurrent writers.
+        checked = threading.Barrier(submissions, timeout=30)
+        writing = threading.Lock()
+        check = views._duplicate_application_errors
+        state = threading.local()
+
+        def check_then_wait(*args):
+            errors = check(*args)
+            if not getattr(state, 'writing', False):
+                checked.wait()
+                writing.acquire()
+                state.writing = True
+            return errors
+
+        responses, failures = [], []
+
+        def submit():
+            try:
+                responses.append(self.apply(Client()))
+            except Exception as e:
+                failures.append(e)
+            finally:
+                if getattr(state, 'writing', False):
+                    writing.release()
+                connection.close()
+
+        with mock.patch.object(views, '_duplicate_application_errors', side_effect=check_then_wait):
+            threads = [threading.Thread(target=submit) for _ in range(submissions)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(failures, [])
+        self.assertEqual(Applicant.objects.count(), 1)
+        successes = [r for r in responses if r.url == reverse('applicants:application_success')]
+        self.assertEqual(len(successes), 1)
+        for response in responses:
+            if response not in successes:
+                self.assertEqual(response.url, reverse('jobs:job_detail', args=[self.job.pk]))
+                self.assertIn('You have already applied for this position with email jane@example.com.',
+                              self.errors(response))
+
+
+class SandboxedExtractionTestCase(TestCase):
+    """Test cases for sandboxed PDF extraction."""
+
+    def write_pdf(self, content):
+        path = os.path.join(self.tmpdir.name, 'cv.pdf')
+        with open(path, 'wb') as f:
+            f.write(content)
+        return path
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_successful_extraction(self):
+        """Test text and page count come back from the worker pool."""
+        result = extraction.extract_text_from_pdf(self.write_pdf(make_pdf('Go', 'Rust')))
+        self.assertTrue(result.ok)
+        self.assertEqual(result.page_count, 2)
+        self.assertIn('Rust', result.text)
+
+    @override_settings(RESUME_EXTRACTION_MAX_PAGES=1)
+    def test_page_cap(self):
+        """Test documents over the page cap are rejected with a typed failure."""
+        result = extraction.extract_text_from_pdf(self.write_pdf(make_pdf('One', 'Two')))
+        self.assertFalse(result.ok)
+        self.assertEqual(result.error, extraction.TOO_MANY_PAGES)
+
+    def test_malformed_and_missing_files(self):
+        """Test malformed and missing files return failure reasons, not strings to parse."""
+        result = extraction.extract_text_from_pdf(self.write_pdf(b'not a pdf'))
+        self.assertEqual(result.error, extraction.UNREADABLE)
+        result = extraction.extract_text_from_pdf(os.path.join(self.tmpdir.name, 'missing.pdf'))
+        self.assertEqual(result.error, extraction.NOT_FOUND)
+        self.assertEqual(result.message, 'Resume file not found.')
+
+    def wait_with_clock(self, running):
+        """Extract through a future that never finishes, with a clock that jumps ten seconds per check."""
+        future = mock.Mock()
+        future.result.side_effect = extraction.FutureTimeout()
+        future.running.return_value = running
+        future.cancel.return_value = not running
+        pool = mock.Mock()
+        pool.submit.return_value = future
+        clock = iter(range(0, 1000, 10))
+        with mock.patch.object(extraction, '_get_pool', return_value=pool), \
+                mock.patch.object(extraction, '_reset_pool') as reset, \
+                mock.patch.object(extraction.time, 'monotonic', lambda: next(clock)):
+            result = extraction.extract_text_from_pdf(self.write_pdf(make_pdf('Slow')))
+        return result, reset
+
+    @override_settings(RESUME_EXTRACTION_TIMEOUT=20)
+    def test_stuck_worker_resets_pool(self):
+        """Test a document running far past the worker's own alarm is a timeout and resets the pool."""
+        result, reset = self.wait_with_clock(running=True)
+        self.assertEqual(result.error, extraction.TIMEOUT)
+        reset.assert_called_once()
+
+    @override_settings(RESUME_EXTRACTION_TIMEOUT=20)
+    def test_queued_document_is_busy_not_timed_out(self):
+        """Test a document that never started is reported busy, not cached, and leaves the pool alone."""
+        result, reset = self.wait_with_clock(running=False)
+        self.assertEqual(result.error, extraction.BUSY)
+        self.assertIn(extraction.BUSY, extraction.TRANSIENT_ERRORS)
+        reset.assert_not_called()
+
+    def test_alarm_is_not_swallowed_by_parser(self):
+        """Test the in-worker alarm fires through the parser's own ``except Exception`` blocks."""
+        def extract_text():
+            try:
+                time.sleep(5)
+            except Exception:
+                return ''
+
+        reader = mock.Mock()
+        reader.return_value.pages = [mock.Mock(extract_text=extract_text)]
+        with mock.patch('PyPDF2.PdfReader', reader):
+            result = extraction.run_extraction(self.write_pdf(b'%PDF-1.4'), max_pages=5, max_memory_mb=64,
+                                               timeout=0.1)
+        self.assertEqual(result.error, extraction.TIMEOUT)
+
+
+class FakeExtractionPool:
+    """
+    In-process stand-in for the extraction pool.
+
+    Work runs when its result is read. A path in ``hanging`` never finishes and
+    one in ``crashing`` breaks the pool like a worker dying; killing the pool
+    breaks every future it has not finished.
+    """
+
+    hanging = set()
+    crashing = set()
+
+    def __init__(self, max_workers):
+        self._processes = {}
+        self.futures = []
+
+    def submit(self, fn, path, **limits):
+        pool = self
+
+        class LazyFuture(Future):
+            def result(self, timeout=None):
+                if not self.done():
+                    if path in pool.hanging:
+                        raise FutureTimeout()
+                    if path in pool.crashing:
+                        pool.shutdown()
+                    else:
+                        self.set_result(fn(path, **limits))
+                return super().result(timeout=0)
+
+        future = LazyFuture()
+        self.futures.append(future)
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        for future in self.futures:
+            if not future.done():
+                future.set_exception(BrokenProcessPool('A process in the process pool was terminated abruptly'))
+
+
+class ReextractResumesCommandTestCase(TestCase):
+    """Test cases for the bulk re-extraction command."""
+
+    def setUp(self):
+        user = User.objects.create_user(username='recruiter', password='pass123')
+        job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=user
+        )
+        self.applicants = [
+            Applicant.objects.create(
+                first_name=f'Candidate{i}',
+                last_name='Doe',
+                email=f'c{i}@example.com',
+                phone=f'07700000{i}',
+                applied_job=job,
+                resume=SimpleUploadedFile('resume.pdf', make_pdf(f'Candidate {i} resume'))
+            )
+            for i in range(3)
+        ]
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+
+    def test_backfill_with_checkpoint(self):
+        """Test resumes are extracted in chunks and the checkpoint records progress."""
+        checkpoint = os.path.join(self.tmpdir.name, 'checkpoint')
+        out = StringIO()
+        call_command('reextract_resumes', workers=1, chunk_size=2, checkpoint=checkpoint, stdout=out)
+
+        self.assertEqual(ResumeExtraction.objects.filter(success=True).count(), 3)
+        self.assertEqual(
+            set(Applicant.objects.values_list('processing_status', flat=True)), {'ready'}
+        )
+        with open(checkpoint) as f:
+            self.assertEqual(int(f.read()), self.applicants[-1].pk)
+        self.assertIn('docs/s', out.getvalue())
+        self.assertIn('pages/s', out.getvalue())
+
+        # Resuming from the checkpoint finds nothing left to do
+        out = StringIO()
+        call_command('reextract_resumes', workers=1, checkpoint=checkpoint, stdout=out)
+        self.assertIn('Done: 0 documents', out.getvalue())
+
+    def run_with_fake_pool(self, hanging=(), crashing=(), **options):
+        with mock.patch.object(reextract_resumes, 'create_pool', FakeExtractionPool), \
+                mock.patch.multiple(FakeExtractionPool, hanging=set(hanging), crashing=set(crashing)):
+            out = StringIO()
+            call_command('reextract_resumes', workers=2, stdout=out, **options)
+        return out.getvalue()
+
+    def statuses(self):
+        return list(Applicant.objects.order_by('pk').values_list('processing_status', flat=True))
+
+    def test_hung_resume_does_not_fail_the_rest_of_the_chunk(self):
+        """Test resumes queued behind a hung one are resubmitted to the replacement pool."""
+        checkpoint = os.path.join(self.tmpdir.name, 'checkpoint')
+        out = self.run_with_fake_pool(hanging=[self.applicants[0].resume.path], checkpoint=checkpoint)
+
+        self.assertIn('Done: 3 documents (1 failed)', out)
+        self.assertEqual(self.statuses(), ['failed', 'ready', 'ready'])
+        self.assertEqual(ResumeExtraction.objects.get(content_hash=self.applicants[0].resume_hash).error, 'timeout')
+        with open(checkpoint) as f:
+            self.assertEqual(int(f.read()), self.applicants[-1].pk)
+
+    def test_crashed_resume_is_left_for_the_next_run(self):
+        """Test a resume lost with a crashed worker is left unchanged and the checkpoint stops before it."""
+        checkpoint = os.path.join(self.tmpdir.name, 'checkpoint')
+        out = self.run_with_fake_pool(crashing=[self.applicants[1].resume.path], checkpoint=checkpoint)
+
+        self.assertIn('Done: 2 documents (0 failed)', out)
+        self.assertIn('lost to a crashed worker', out)
+        self.assertEqual(self.statuses(), ['ready', 'pending', 'ready'])
+        with open(checkpoint) as f:
+            self.assertEqual(int(f.read()), self.applicants[1].pk - 1)
+
+        out = self.run_with_fake_pool(checkpoint=checkpoint)
+        self.assertIn('Done: 1 documents (0 failed)', out)
+        self.assertEqual(self.statuses(), ['ready', 'ready', 'ready'])
+        with open(checkpoint) as f:
+            self.assertEqual(int(f.read()), self.applicants[-1].pk)
+
+    def test_skips_current_extractions_unless_forced(self):
+        """Test resumes with an up-to-date extraction are skipped without --force."""
+        utils.get_resume_extraction(self.applicants[0])
+        out = StringIO()
+        call_command('reextract_resumes', workers=1, stdout=out)
+        self.assertIn('Done: 2 documents', out.getvalue())
+        out = StringIO()
+        call_command('reextract_resumes', workers=1, force=True, stdout=out)
+        self.assertIn('Done: 3 documents', out.getvalue())
+
+
+    def test_reindexes_applicants_sharing_a_reextracted_resume(self):
+        """Test an applicant skipped because its resume was just extracted is still re-indexed."""
+        first = self.applicants[0]
+        twin = Applicant.objects.create(
+            first_name='Twin',
+            last_name='Doe',
+            email='twin@example.com',
+            phone='07700000009',
+            applied_job=first.applied_job,
+            resume=SimpleUploadedFile('resume.pdf', first.resume.read())
+        )
+        first.resume.close()
+        indexed = set()
+        with mock.patch.object(search, 'index_applicants', side_effect=indexed.update):
+            out = StringIO()
+            call_command('reextract_resumes', workers=1, chunk_size=1, stdout=out)
+
+        self.assertIn('Done: 3 documents', out.getvalue())
+        self.assertEqual(indexed, {a.pk for a in self.applicants} | {twin.pk})
+
+class ContentAddressedStorageTestCase(TestCase):
+    """Test cases for deduplicated resume storage."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        user = User.objects.create_user(username='recruiter', password='pass123')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Test',
+                location='Remote',
+                employment_type='FT',
+                requirements='Python',
+                responsibilities='Code',
+                deadline=date.today() + timedelta(days=30),
+                created_by=user
+            )
+            for i in range(2)
+        ]
+
+    def create_applicant(self, job, content):
+        return Applicant.objects.create(
+            first_name='John',
+            last_name='Doe',
+            email='john@example.com',
+            phone='1234567890',
+            applied_job=job,
+            resume=SimpleUploadedFile('resume.pdf', content)
+        )
+
+    def test_identical_uploads_are_stored_once(self):
+        """Test the same resume sent to two jobs shares one file named by its hash."""
+        content = make_pdf('Same resume')
+        first = self.create_applicant(self.jobs[0], content)
+        second = self.create_applicant(self.jobs[1], content)
+
+        digest = hashlib.sha256(content).hexdigest()
+        self.assertEqual(first.resume.name, second.resume.name)
+        self.assertEqual(first.resume.name, f'resumes/{digest[:2]}/{digest}.pdf')
+        self.assertEqual(Applicant.objects.get(pk=first.pk).resume_hash, digest)
+        self.assertEqual(ResumeBlob.objects.get(name=first.resume.name).ref_count, 2)
+
+    def test_file_deleted_with_last_reference(self):
+        """Test deleting an applicant only removes the file when no one else uses it."""
+        content = make_pdf('Shared resume')
+        first = self.create_applicant(self.jobs[0], content)
+        second = self.create_applicant(self.jobs[1], content)
+        path = first.resume.path
+
+        first.delete()
+        self.assertTrue(os.path.exists(path))
+        second.delete()
+        self.assertFalse(os.path.exists(path))
+        self.assertFalse(ResumeBlob.objects.exists())
+
+    def test_file_deleted_before_reference_is_stored_again(self):
+        """Test a shared file deleted while a new application is saved is written back."""
+        content = make_pdf('Shared resume')
+        first = self.create_applicant(self.jobs[0], content)
+        acquire = ResumeBlob.acquire
+
+        def delete_first(name):
+            # The last other reference goes after the file was reused but before it is counted
+            first.delete()
+            acquire(name)
+
+        with mock.patch.object(ResumeBlob, 'acquire', side_effect=delete_first):
+            second = self.create_applicant(self.jobs[1], content)
+
+        self.assertEqual(second.resume.name, first.resume.name)
+        with second.resume.open('rb') as stored:
+            self.assertEqual(stored.read(), content)
+        self.assertEqual(ResumeBlob.objects.get(name=second.resume.name).ref_count, 1)
+
+    def test_admin_cannot_swap_a_stored_resume(self):
+        """Test the admin only accepts a resume when an application is created."""
+        model_admin = admin.site._registry[Applicant]
+        applicant = self.create_applicant(self.jobs[0], make_pdf('Resume'))
+
+        self.assertNotIn('resume', model_admin.get_readonly_fields(None))
+        self.assertIn('resume', model_admin.get_readonly_fields(None, applicant))
+
+    def test_sweep_removes_old_orphaned_files(self):
+        """Test files left by failed inserts are swept once they pass the grace period."""
+        storage = Applicant._meta.get_field('resume').storage
+        kept = self.create_applicant(self.jobs[0], make_pdf('Kept resume')).resume.name
+        orphan = storage.save('resumes/resume.pdf', SimpleUploadedFile('resume.pdf', make_pdf('Orphan')))
+        recent = storage.save('resumes/resume.pdf', SimpleUploadedFile('resume.pdf', make_pdf('Recent')))
+        old = time.time() - tasks.ORPHAN_GRACE_SECONDS - 60
+        for name in (kept, orphan):
+            os.utime(storage.path(name), (old, old))
+
+        self.assertEqual(tasks.sweep_orphaned_resumes(), 1)
+        self.assertFalse(storage.exists(orphan))
+        self.assertTrue(storage.exists(kept))
+        self.assertTrue(storage.exists(recent))
+        self.assertEqual(list(ResumeBlob.objects.values_list('name', flat=True)), [kept])
+
+
+class AnalysisCacheTestCase(TestCase):
+    """Test cases for stored AI analyses."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.client.login(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        self.applicant = Applicant.objects.create(
+            first_name='John',
+            last_name='Doe',
+            email='john@example.com',
+            phone='1234567890',
+            applied_job=self.job,
+            resume=SimpleUploadedFile('resume.pdf', make_pdf('Python developer'))
+        )
+        self.url = reverse('applicants:applicant_detail', args=[self.applicant.pk])
+        patcher = mock.patch.object(
+            utils, 'analyze_cv_with_gemini',
+            return_value={'success': True, 'analysis': 'Strong Match'}
+        )
+        self.gemini = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_analysis_is_cached_and_shown(self):
+        """Test an analysis is stored and shown on later visits without calling the API."""
+        self.assertContains(self.client.post(self.url, {'analyze_cv': '1'}), 'Strong Match')
+        self.assertContains(self.client.get(self.url), 'Strong Match')
+        self.client.post(self.url, {'analyze_cv': '1'})
+        self.assertEqual(self.gemini.call_count, 1)
+
+    def test_job_edit_invalidates_dependent_analyses(self):
+        """Test editing a job's content drops only that job's analyses."""
+        self.client.post(self.url, {'analyze_cv': '1'})
+        other_job = Job.objects.create(
+            title='Other', description='Test', location='Remote', requirements='Go',
+            responsibilities='Code', deadline=self.job.deadline, created_by=self.user
+        )
+        ResumeAnalysis.objects.create(
+            cache_key='x' * 64, job=other_job, model_name='gemini-2.5-flash',
+            prompt_version=utils.PROMPT_VERSION, analysis='Other analysis'
+        )
+
+        self.client.post(reverse('jobs:job_edit', args=[self.job.pk]), {
+            'title': self.job.title,
+            'description': 'New description',
+            'location': self.job.location,
+            'employment_type': 'FT',
+            'requirements': self.job.requirements,
+            'responsibilities': self.job.responsibilities,
+            'deadline': self.job.deadline.isoformat(),
+            'is_active': 'on',
+        })
+        self.assertFalse(ResumeAnalysis.objects.filter(job=self.job).exists())
+        self.assertTrue(ResumeAnalysis.objects.filter(job=other_job).exists())
+        self.assertNotContains(self.client.get(self.url), 'Strong Match')
+
+
+class BatchScreeningTestCase(TestCase):
+    """Test cases for batch AI screening."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        for i in range(4):
+            Applicant.objects.create(
+                first_name=f'Candidate{i}',
+                last_name='Doe',
+                email=f'c{i}@example.com',
+                phone=f'07700000{i}',
+                applied_job=self.job,
+                resume=SimpleUploadedFile('resume.pdf', make_pdf(f'Candidate {i} knows Python'))
+            )
+
+    def test_screen_job_with_stub_retries_rate_limits(self):
+        """Test every pending applicant is analyzed, retrying the 429 path."""
+        model = ai.build_provider(ai.FakeBackend(rate_limit_every=3))
+        updates = []
+        summary = screening.screen_job(
+            self.job, model=model, concurrency=2, requests_per_minute=6000,
+            backoff=0.01, progress=lambda s: updates.append(s.completed)
+        )
+        self.assertEqual((summary.total, summary.completed, summary.failed), (4, 4, 0))
+        self.assertGreater(model.backend.calls, 4)
+        self.assertEqual(ResumeAnalysis.objects.filter(job=self.job).count(), 4)
+        self.assertEqual(updates[-1], 4)
+
+        # A second pass has nothing left to analyze
+        summary = screening.screen_job(self.job, model=model, requests_per_minute=6000)
+        self.assertEqual((summary.total, summary.skipped), (0, 4))
+
+    def test_fake_command_saves_nothing(self):
+        """Test a fake screening run is not cached as a real analysis or copied onto applicants."""
+        out = StringIO()
+        call_command('screen_job', self.job.pk, '--fake', '--fake-latency', '0', '--rpm', '6000', stdout=out)
+
+        self.assertIn('Screening finished: 4 analyzed', out.getvalue())
+        self.assertFalse(ResumeAnalysis.objects.exists())
+        self.assertFalse(Applicant.objects.filter(match_score__isnull=False).exists())
+
+    def test_token_bucket_limits_rate(self):
+        """Test the token bucket spaces calls once the burst is used."""
+        bucket = screening.TokenBucket(rate=20, per=1.0, burst=1)
+        started = time.monotonic()
+        for _ in range(3):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.09)
+
+    def test_screen_view_queues_run_for_worker(self):
+        """Test the dashboard action queues a run the worker completes."""
+        self.client.login(username='recruiter', password='pass123')
+        response = self.client.post(reverse('applicants:screen_job', args=[self.job.pk]))
+        run = ScreeningRun.objects.get()
+        self.assertRedirects(response, reverse('applicants:screening_run', args=[run.pk]))
+
+        claimed = tasks.claim_screening_run('test-worker')
+        tasks.run_screening(claimed, model=ai.FakeBackend())
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.completed, run.progress_percent), ('done', 4, 100))
+        self.assertContains(self.client.get(reverse('applicants:screening_run', args=[run.pk])), '100%')
+
+    def test_killed_run_is_reclaimed_and_resumed(self):
+        """Test a run stopped partway goes back to the queue and only screens what is left."""
+        run = ScreeningRun.objects.create(job=self.job, requested_by=self.user)
+        store_analysis = screening.store_analysis
+        stored = []
+
+        def store_then_die(*args):
+            if len(stored) == 2:
+                raise KeyboardInterrupt
+            stored.append(store_analysis(*args))
+
+        with mock.patch.object(screening, 'store_analysis', store_then_die), self.assertRaises(KeyboardInterrupt):
+            tasks.run_screening(tasks.claim_screening_run('test-worker'), model=ai.FakeBackend())
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.locked_by), ('pending', ''))
+
+        # A worker that died without unwinding leaves the run locked until the lock goes stale
+        tasks.claim_screening_run('test-worker')
+        self.assertEqual(tasks.requeue_stale_screening_runs(), 0)
+        stale = timezone.now() - timedelta(seconds=tasks.STALE_LOCK_SECONDS + 1)
+        ScreeningRun.objects.filter(pk=run.pk).update(locked_at=stale)
+        self.assertEqual(tasks.requeue_stale_screening_runs(), 1)
+
+        tasks.run_screening(tasks.claim_screening_run('test-worker'), model=ai.FakeBackend())
+        run.refresh_from_db()
+        self.assertEqual((run.status, run.total, run.completed, run.skipped), ('done', 2, 2, 2))
+        self.assertEqual(ResumeAnalysis.objects.filter(job=self.job).count(), 4)
+
+
+class AIProviderTestCase(TestCase):
+    """Test cases for the process-wide AI provider."""
+
+    def test_provider_is_built_once(self):
+        """Test the provider is created once and reused."""
+        with override_settings(AI_BACKEND='fake'):
+            self.assertIs(ai.get_provider(), ai.get_provider())
+            self.assertEqual(ai.get_provider().model_name, 'fake')
+
+    def test_fake_backend_is_deterministic(self):
+        """Test the fake backend returns the same analysis for the same prompt."""
+        with override_settings(AI_BACKEND='fake'):
+            first = utils.analyze_cv_with_gemini('Python', 'Desc', 'Engineer', 'Python')
+            second = utils.analyze_cv_with_gemini('Python', 'Desc', 'Engineer', 'Python')
+            self.assertTrue(first['success'])
+            self.assertEqual(first['analysis'], second['analysis'])
+            self.assertEqual(ai.get_provider().stats()['calls'], 2)
+
+    @override_settings(AI_CIRCUIT_BREAKER_THRESHOLD=2, AI_CIRCUIT_BREAKER_COOLDOWN=60)
+    def test_circuit_breaker_fails_fast_after_quota_errors(self):
+        """Test repeated quota errors open the breaker so the backend is not called."""
+        backend = mock.Mock()
+        backend.generate_content.side_effect = RuntimeError('429 quota exceeded')
+        provider = ai.build_provider(backend)
+
+        for _ in range(2):
+            self.assertTrue(utils.analyze_cv_with_gemini('cv', 'd', 't', 'r', model=provider)['rate_limited'])
+        result = utils.analyze_cv_with_gemini('cv', 'd', 't', 'r', model=provider)
+        self.assertIn('paused', result['error'])
+        self.assertEqual(backend.generate_content.call_count, 2)
+        self.assertEqual(provider.stats()['rejected'], 1)
+        self.assertTrue(provider.stats()['circuit_open'])
+
+    def test_circuit_breaker_admits_one_trial_call(self):
+        """Test a cooled-down breaker lets a single caller through until that call finishes."""
+        breaker = ai.CircuitBreaker(threshold=1, cooldown=60)
+        with mock.patch.object(ai.time, 'monotonic', return_value=1000.0) as now:
+            breaker.record_failure()
+            self.assertFalse(breaker.allow())
+
+            now.return_value = 1060.0
+            self.assertEqual([breaker.allow() for _ in range(3)], [True, False, False])
+            breaker.record_failure()
+            self.assertTrue(breaker.is_open)
+            self.assertFalse(breaker.allow())
+
+            now.return_value = 1120.0
+            self.assertTrue(breaker.allow())
+            breaker.release()
+            self.assertEqual([breaker.allow() for _ in range(2)], [True, False])
+            breaker.record_success()
+            self.assertFalse(breaker.is_open)
+            self.assertEqual([breaker.allow() for _ in range(3)], [True, True, True])
+
+    @override_settings(AI_BACKEND='gemini', AI_REQUEST_TIMEOUT=7)
+    def test_gemini_backend_configured_once_with_timeout(self):
+        """Test Gemini is configured once and requests carry the timeout."""
+        genai = mock.Mock()
+        google = mock.Mock(generativeai=genai)
+        with mock.patch.dict('sys.modules', {'google': google, 'google.generativeai': genai}), \
+                mock.patch.dict(os.environ, {'GEMINI_API_KEY': 'key'}):
+            for _ in range(2):
+                utils.analyze_cv_with_gemini('cv', 'd', 't', 'r')
+        genai.configure.assert_called_once_with(api_key='key')
+        genai.GenerativeModel.return_value.generate_content.assert_called_with(
+            mock.ANY, generation_config={'response_mime_type': 'application/json'}, request_options={'timeout': 7}
+        )
+        self.assertEqual(genai.GenerativeModel.return_value.generate_content.call_count, 2)
+
+
+class StructuredAnalysisTestCase(TestCase):
+    """Test cases for structured AI output and stored match scores."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.client.login(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        self.applicants = [
+            Applicant.objects.create(
+                first_name=name,
+                last_name='Doe',
+                email=f'{name}@example.com',
+                phone=f'07700000{i}',
+                applied_job=self.job,
+                resume=SimpleUploadedFile('resume.pdf', make_pdf(f'{name} knows Python'))
+            )
+            for i, name in enumerate(['Ann', 'Ben', 'Cat'])
+        ]
+
+    def test_parse_analysis(self):
+        """Test JSON responses are parsed, clamped and normalized."""
+        fields = utils.parse_analysis(
+            '```json\n{"score": 140, "matching_skills": ["Python"], "gaps": ["Go"], '
+            '"recommendation": "strong match", "explanation": "Fits"}\n```'
+        )
+        self.assertEqual(fields['score'], 100)
+        self.assertEqual(fields['recommendation'], 'Strong Match')
+        self.assertEqual(fields['gaps'], ['Go'])
+        with self.assertRaises(ValueError):
+            utils.parse_analysis('Match Score: 80%')
+
+    def test_analysis_stores_score_on_applicant(self):
+        """Test analyzing copies the structured score onto the applicant."""
+        response = json.dumps({'score': 72, 'matching_skills': ['Python'], 'gaps': [],
+                               'experience': 'Relevant', 'recommendation': 'Good Match', 'explanation': 'Solid'})
+        model = mock.Mock()
+        model.generate_content.return_value = mock.Mock(text=response)
+        applicant = self.applicants[0]
+        text = utils.get_resume_extraction(applicant).text
+        result = utils.analyze_resume_for_job(text, self.job, model=model, applicant_ids=[applicant.pk])
+
+        self.assertIn('Match Score: 72%', result['analysis'])
+        applicant.refresh_from_db()
+        self.assertEqual((applicant.match_score, applicant.ai_recommendation), (72, 'Good Match'))
+        self.assertEqual(ResumeAnalysis.objects.get().matching_skills, ['Python'])
+
+    def test_scores_recorded_when_analysis_is_stored(self):
+        """Test a stored analysis scores every applicant with the resume, and viewing one writes nothing."""
+        applicant = self.applicants[0]
+        copy = Applicant.objects.create(
+            first_name='Ann', last_name='Copy', email='copy@example.com', phone='0770000009',
+            applied_job=self.job, resume=SimpleUploadedFile('resume.pdf', make_pdf('Ann knows Python'))
+        )
+        text = utils.get_resume_extraction(applicant).text
+        utils.store_analysis(text, self.job, {'analysis': 'Fits', 'score': 64, 'recommendation': 'Good Match'},
+                             [applicant.pk])
+        self.assertEqual(Applicant.objects.get(pk=copy.pk).match_score, 64)
+
+        Applicant.objects.filter(pk=applicant.pk).update(match_score=None)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(reverse('applicants:applicant_detail', args=[applicant.pk]))
+        self.assertContains(response, 'Fits')
+        self.assertFalse([q['sql'] for q in captured if q['sql'].startswith('UPDATE "applicants_applicant"')])
+
+        # An application whose resume was analyzed before is scored once its text is extracted
+        tasks.enqueue_resume_processing(applicant)
+        tasks.process_available('worker')
+        self.assertEqual(Applicant.objects.get(pk=applicant.pk).match_score, 64)
+
+    def test_list_sorts_and_filters_by_score(self):
+        """Test the applicant list sorts and filters by the stored score."""
+        for applicant, score in zip(self.applicants, [40, None, 90]):
+            Applicant.objects.filter(pk=applicant.pk).update(match_score=score)
+        url = reverse('applicants:applicant_list')
+
+        names = [a.first_name for a in self.client.get(url, {'sort': 'score'}).context['applicants']]
+        self.assertEqual(names, ['Cat', 'Ann', 'Ben'])
+        names = [a.first_name for a in self.client.get(url, {'min_score': '50'}).context['applicants']]
+        self.assertEqual(names, ['Cat'])
+
+
+class RankingTestCase(TestCase):
+    """Test cases for the offline resume ranking."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.client.login(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Backend Developer',
+            description='Build Django services',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python Django PostgreSQL',
+            responsibilities='Design REST APIs',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        resumes = {
+            'Ann': 'Python Django PostgreSQL REST APIs developer',
+            'Ben': 'Python scripting',
+            'Cat': 'Graphic designer using Photoshop',
+        }
+        self.applicants = {}
+        for i, (name, text) in enumerate(resumes.items()):
+            applicant = Applicant.objects.create(
+                first_name=name,
+                last_name='Doe',
+                email=f'{name}@example.com',
+                phone=f'07700000{i}',
+                applied_job=self.job,
+                resume=SimpleUploadedFile('resume.pdf', make_pdf(text))
+            )
+            utils.get_resume_extraction(applicant)
+            self.applicants[name] = applicant
+
+    def test_bm25_scores(self):
+        """Test documents matching more weighted query terms score higher."""
+        scores = ranking.bm25_scores({'python': 2.0, 'django': 1.0}, [
+            ranking.count_terms(text) for text in ['Python, Django.', 'python', 'photoshop', 'C++ and node.js']
+        ])
+        self.assertGreater(scores[0], scores[1])
+        self.assertGreater(scores[1], scores[2])
+        self.assertEqual(scores[2], 0)
+        self.assertEqual(ranking.tokenize('C++ and Node.js.'), ['c++', 'node.js'])
+        self.assertEqual(ranking.count_terms('Uses Node.js. node.js'), ({'uses': 1, 'node.js': 2}, 3))
+
+    def test_rank_applicants(self):
+        """Test applicants are ranked best first, with unreadable resumes last."""
+        Applicant.objects.create(
+            first_name='Dan',
+            last_name='Doe',
+            email='dan@example.com',
+            phone='077000009',
+            applied_job=self.job,
+            resume=SimpleUploadedFile('resume.pdf', b'not a pdf')
+        )
+        ranked = ranking.rank_applicants(self.job)
+
+        self.assertEqual([r.applicant.first_name for r in ranked], ['Ann', 'Ben', 'Cat', 'Dan'])
+        self.assertEqual(ranked[0].score, 100)
+        self.assertIsNone(ranked[-1].score)
+        # Term counts are stored for the next ranking
+        self.assertFalse(ResumeExtraction.objects.filter(term_counts__isnull=True, success=True).exists())
+        with self.assertNumQueries(2):
+            ranking.rank_applicants(self.job)
+
+    def test_send_top_applicants_to_screening(self):
+        """Test only the top ranked applicants are queued for AI screening."""
+        response = self.client.get(reverse('applicants:rank_job', args=[self.job.pk]))
+        self.assertEqual(response.status_code, 200)
+
+        self.client.post(reverse('applicants:screen_job', args=[self.job.pk]), {'top': '2'})
+        run = ScreeningRun.objects.get()
+        self.assertEqual(run.applicant_ids, [self.applicants['Ann'].pk, self.applicants['Ben'].pk])
+
+        with override_settings(AI_BACKEND='fake'):
+            tasks.run_screening(run)
+        run.refresh_from_db()
+        self.assertEqual(run.completed, 2)
+        self.assertIsNone(Applicant.objects.get(pk=self.applicants['Cat'].pk).match_score)
+
+
+class SearchTestCase(TestCase):
+    """Test cases for full-text applicant search."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.client.login(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Platform Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Cloud',
+            responsibilities='Infrastructure',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        resumes = {
+            'Ann': 'Kubernetes and Terraform on AWS',
+            'Ben': 'Kubernetes operator in Go',
+            'Cat': 'Terraform modules for Azure',
+        }
+        self.applicants = {}
+        for i, (name, text) in enumerate(resumes.items()):
+            applicant = Applicant.objects.create(
+                first_name=name,
+                last_name='Doe',
+                email=f'{name.lower()}@example.com',
+                phone=f'07700000{i}',
+                applied_job=self.job,
+                resume=SimpleUploadedFile('resume.pdf', make_pdf(text))
+            )
+            utils.get_resume_extraction(applicant)
+            self.applicants[name] = applicant
+
+    def names(self, query, user=None):
+        hits = search.search_applicants(query, user or self.user)
+        return sorted(Applicant.objects.get(pk=hit.applicant_id).first_name for hit in hits)
+
+    def test_parse_query(self):
+        """Test operators, phrases and prefixes are parsed into OR-groups."""
+        groups = search.parse_query('kubernetes AND "machine learning" OR terra* NOT azure')
+        self.assertEqual(groups, [
+            [search.Term('kubernetes'), search.Term('machine learning')],
+            [search.Term('terra', prefix=True), search.Term('azure', negated=True)],
+        ])
+        self.assertEqual(search.parse_query('NOT java'), [])
+
+    def test_search_resume_text(self):
+        """Test boolean queries match extracted resume text."""
+        self.assertEqual(self.names('Kubernetes AND Terraform'), ['Ann'])
+        self.assertEqual(self.names('Kubernetes OR Terraform'), ['Ann', 'Ben', 'Cat'])
+        self.assertEqual(self.names('terraform NOT azure'), ['Ann'])
+        self.assertEqual(self.names('terra*'), ['Ann', 'Cat'])
+        self.assertEqual(self.names('ben@example.com'), ['Ben'])
+        other = User.objects.create_user(username='other', password='pass123')
+        self.assertEqual(self.names('Kubernetes', user=other), [])
+
+    def test_filters_apply_before_the_limit(self):
+        """Test a filtered search keeps matches ranked below the limit among all applicants."""
+        Applicant.objects.filter(pk=self.applicants['Ben'].pk).update(status='screening')
+        top = search.search_applicants('kubernetes', self.user, limit=1)
+        self.assertEqual(len(top), 1)
+        other = 'Ben' if top[0].applicant_id == self.applicants['Ann'].pk else 'Ann'
+        within = Applicant.objects.filter(first_name=other)
+        hits = search.search_applicants('kubernetes', self.user, limit=1, within=within)
+        self.assertEqual([hit.applicant_id for hit in hits], [self.applicants[other].pk])
+
+        response = self.client.get(reverse('applicants:applicant_list'), {'q': 'kubernetes', 'status': 'screening'})
+        self.assertEqual([a.first_name for a in response.context['applicants']], ['Ben'])
+
+        matches = Applicant.objects.filter(search.matching('kubernetes OR terraform'))
+        self.assertEqual(sorted(a.first_name for a in matches), ['Ann', 'Ben', 'Cat'])
+        self.assertFalse(Applicant.objects.filter(search.matching('NOT java')).exists())
+
+    def test_index_follows_updates_and_deletes(self):
+        """Test the index is refreshed when applicants change or are deleted."""
+        ann = self.applicants['Ann']
+        ann.cover_letter = 'Certified in Ansible'
+        ann.save()
+        self.assertEqual(self.names('ansible'), ['Ann'])
+
+        ann.delete()
+        self.assertEqual(self.names('Kubernetes'), ['Ben'])
+
+    def test_contact_like_queries_fall_back_to_text_search(self):
+        """Test number ranges and unknown email addresses are searched as text."""
+        self.assertIsNone(normalization.contact_lookup('2019-2021'))
+        self.assertIsNone(normalization.contact_lookup('+94 77'))
+        ann = self.applicants['Ann']
+        ann.cover_letter = 'Platform team 2019-2021, references from lead@cloud.example.com'
+        ann.save()
+        url = reverse('applicants:applicant_list')
+        for query in ['2019-2021', 'lead@cloud.example.com']:
+            with self.subTest(query=query):
+                applicants = self.client.get(url, {'q': query}).context['applicants']
+                self.assertEqual([a.first_name for a in applicants], ['Ann'])
+        applicants = self.client.get(url, {'q': '077 000 001'}).context['applicants']
+        self.assertEqual([a.first_name for a in applicants], ['Ben'])
+
+    def test_list_view_ranks_and_highlights(self):
+        """Test the applicant list shows ranked hits with highlighted snippets."""
+        response = self.client.get(reverse('applicants:applicant_list'), {'q': 'kubernetes'})
+        applicants = response.context['applicants']
+
+        self.assertEqual(sorted(a.first_name for a in applicants), ['Ann', 'Ben'])
+        self.assertContains(response, '<mark>Kubernetes</mark>')
+
+
+class ApplicantListPaginationTestCase(QueryPlanAssertionsMixin, TestCase):
+    """Test cases for the keyset-paginated applicant list."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.client.login(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        for i in range(7):
+            Applicant.objects.create(
+                first_name=f'Applicant{i}',
+                last_name='Doe',
+                email=f'applicant{i}@example.com',
+                phone=f'07700000{i}',
+                applied_job=self.job,
+                resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 test')
+            )
+        # Shared timestamps exercise the id tie-breaker
+        Applicant.objects.update(applied_at=timezone.now())
+        page_size = mock.patch.object(views, 'APPLICANT_LIST_PAGE_SIZE', 3)
+        page_size.start()
+        self.addCleanup(page_size.stop)
+
+    def walk(self, params):
+        seen = []
+        cursor = None
+        while True:
+            response = self.client.get(reverse('applicants:applicant_list'), {**params, 'after': cursor or ''})
+            seen += [a.pk for a in response.context['applicants']]
+            cursor = response.context['next_cursor']
+            if not cursor:
+                return seen
+
+    def test_pages_cover_every_applicant_once(self):
+        """Test walking the cursor visits every applicant once, newest first."""
+        expected = list(Applicant.objects.order_by('-applied_at', '-id').values_list('pk', flat=True))
+        self.assertEqual(self.walk({}), expected)
+
+    def test_score_sort_pages_through_nulls(self):
+        """Test score ordering keeps unscored applicants last across pages."""
+        pks = list(Applicant.objects.order_by('id').values_list('pk', flat=True))
+        for pk, score in zip(pks, [50, None, 80, 50, None, 10, 80]):
+            Applicant.objects.filter(pk=pk).update(match_score=score)
+        expected = list(Applicant.objects.order_by(
+            F('match_score').desc(nulls_last=True), '-applied_at', '-id'
+        ).values_list('pk', flat=True))
+        self.assertEqual(self.walk({'sort': 'score'}), expected)
+
+    def test_query_count_is_constant(self):
+        """Test a page costs the same queries regardless of rows, with the job title joined."""
+        url = reverse('applicants:applicant_list')
+        with CaptureQueriesContext(connection) as first:
+            response = self.client.get(url)
+        with CaptureQueriesContext(connection) as second:
+            self.client.get(url, {'after': response.context['next_cursor']})
+        self.assertEqual(len(first), len(second))
+        self.assertContains(response, 'Software Engineer')
+
+    def test_list_queries_use_indexes(self):
+        """Test every filter combination pages through an index without sorting."""
+        url = reverse('applicants:applicant_list')
+        cursor = self.client.get(url).context['next_cursor']
+        # A cursor past the unscored applicants, and one among the scored ones
+        null_cursor = self.client.get(url, {'sort': 'score'}).context['next_cursor']
+        Applicant.objects.filter(pk__in=list(Applicant.objects.values_list('pk', flat=True)[:4])).update(match_score=70)
+        score_cursor = self.client.get(url, {'sort': 'score'}).context['next_cursor']
+        for params in [{}, {'job': self.job.pk}, {'status': 'applied'}, {'job': self.job.pk, 'status': 'applied'}]:
+            for page in [{}, {'after': cursor}]:
+                with self.subTest(**params, **page):
+                    self.assertIndexedQueries(self.client.get, url, {**params, **page})
+        for params in [{'sort': 'score'}, {'sort': 'score', 'job': self.job.pk}]:
+            for page in [{}, {'after': null_cursor}, {'after': score_cursor}]:
+                with self.subTest(**params, **page):
+                    self.assertIndexedQueries(self.client.get, url, {**params, **page})
+
+    def test_contact_search_is_an_indexed_probe(self):
+        """Test searching for an email address or phone number matches it exactly through an index."""
+        url = reverse('applicants:applicant_list')
+        for query in ['APPLICANT3@example.com ', '+94 77 000 003', '077-000 003']:
+            with self.subTest(query=query):
+                response = self.assertIndexedQueries(self.client.get, url, {'q': query})
+                self.assertEqual([a.first_name for a in response.context['applicants']], ['Applicant3'])
+
+    def test_filter_state_and_bad_cursor(self):
+        """Test filters are rendered from the URL and a malformed cursor starts over."""
+        response = self.client.get(reverse('applicants:applicant_list'), {
+            'job': self.job.pk, 'status': 'applied', 'sort': 'score', 'after': 'not-a-cursor',
+        })
+        self.assertContains(response, f'<option value="{self.job.pk}" selected>')
+        self.assertContains(response, '<option value="score" selected>')
+        self.assertEqual(len(response.context['applicants']), 3)
+        cursor = response.context['next_cursor']
+        self.assertRegex(response.content.decode(), rf'href="\?[^"]*sort=score[^"]*after={cursor}"')
+
+
+class ApplicantCountTestCase(TestCase):
+    """Test cases for the maintained per-job, per-status applicant counters."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        self.applicants = [
+            Applicant.objects.create(
+                first_name='John',
+                last_name='Doe',
+                email=f'john{i}@example.com',
+                phone=f'07700000{i}',
+                applied_job=self.job,
+                resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 test')
+            )
+            for i in range(3)
+        ]
+
+    def counts(self):
+        return dict(ApplicantCount.objects.filter(job=self.job, count__gt=0).values_list('status', 'count'))
+
+    def test_counters_follow_create_status_change_and_delete(self):
+        """Test counters track applicants through their lifecycle."""
+        self.assertEqual(self.counts(), {'applied': 3})
+
+        applicant = Applicant.objects.get(pk=self.applicants[0].pk)
+        applicant.status = 'interview'
+        applicant.save()
+        applicant.save()
+        self.assertEqual(self.counts(), {'applied': 2, 'interview': 1})
+
+        applicant.delete()
+        self.assertEqual(self.counts(), {'applied': 2})
+        self.assertEqual(self.job.application_count, 2)
+
+    def test_moving_to_another_job_moves_owner_and_counters(self):
+        """Test an applicant moved to another recruiter's job leaves the old recruiter's list."""
+        other = User.objects.create_user(username='other', password='pass123')
+        other_job = Job.objects.create(
+            title='Data Engineer', description='Test', location='Remote', employment_type='FT',
+            requirements='SQL', responsibilities='Pipelines', deadline=self.job.deadline, created_by=other
+        )
+        applicant = Applicant.objects.get(pk=self.applicants[0].pk)
+        applicant.applied_job = other_job
+        applicant.status = 'interview'
+        applicant.save()
+
+        self.assertEqual(Applicant.objects.get(pk=applicant.pk).recruiter, other)
+        self.assertEqual(self.counts(), {'applied': 2})
+        self.assertEqual(dict(ApplicantCount.objects.filter(job=other_job, count__gt=0).values_list('status', 'count')),
+                         {'interview': 1})
+
+        client = Client()
+        client.login(username='recruiter', password='pass123')
+        self.assertNotContains(client.get(reverse('applicants:applicant_list')), 'john0@example.com')
+        client.login(username='other', password='pass123')
+        self.assertContains(client.get(reverse('applicants:applicant_list')), 'john0@example.com')
+
+    def test_reconcile_repairs_drift(self):
+        """Test the reconcile command recounts drifted and stale counters."""
+        Applicant.objects.filter(pk=self.applicants[0].pk).update(status='hired')
+        ApplicantCount.objects.create(job=self.job, status='rejected', count=5)
+
+        out = StringIO()
+        call_command('reconcile_applicant_counts', '--dry-run', stdout=out)
+        self.assertIn('Found 3 drifted counter(s)', out.getvalue())
+        self.assertEqual(self.counts(), {'applied': 3, 'rejected': 5})
+
+        call_command('reconcile_applicant_counts', stdout=StringIO())
+        self.assertEqual(self.counts(), {'applied': 2, 'hired': 1})
+
+    def test_dashboard_reads_counters(self):
+        """Test the dashboard takes applicant totals from the counters."""
+        ApplicantCount.objects.filter(job=self.job).update(count=7)
+        client = Client()
+        client.login(username='recruiter', password='pass123')
+        response = client.get(reverse('jobs:dashboard'))
+
+        self.assertContains(response, '<h2 class="display-4">7</h2>', html=True)
+        self.assertContains(response, '<span class="badge bg-primary">7</span>', html=True)
+
+
+class BulkApplicantActionTestCase(TestCase):
+    """Test cases for bulk status changes and deletes from the applicant list."""
+
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        other = User.objects.create_user(username='other', password='pass123')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Test',
+                location='Remote',
+                employment_type='FT',
+                requirements='Python',
+                responsibilities='Code',
+                deadline=date.today() + timedelta(days=30),
+                created_by=owner
+            )
+            for i, owner in enumerate([self.user, self.user, other])
+        ]
+        self.applicants = [
+            Applicant.objects.create(
+                first_name='John',
+                last_name='Doe',
+                email=f'john{i}@example.com',
+                phone=f'07700000{i}',
+                applied_job=job,
+                resume=SimpleUploadedFile('resume.pdf', make_pdf('Own resume' if job.created_by == other else 'Shared'))
+            )
+            for i, job in enumerate([self.jobs[0], self.jobs[0], self.jobs[1], self.jobs[2]])
+        ]
+        ApplicantNote.objects.create(applicant=self.applicants[0], note='Strong', created_by=self.user)
+        self.client = Client()
+        self.client.login(username='recruiter', password='pass123')
+
+    def counts(self):
+        return set(ApplicantCount.objects.filter(count__gt=0).values_list('job_id', 'status', 'count'))
+
+    def post(self, action):
+        return self.client.post(reverse('applicants:applicant_bulk_action'), {
+            'action': action,
+            'applicants': [applicant.pk for applicant in self.applicants],
+            'next': reverse('applicants:applicant_list') + '?status=applied',
+        })
+
+    def statements(self, captured, prefix):
+        return [query['sql'] for query in captured if query['sql'].startswith(prefix)]
+
+    def test_bulk_status_change(self):
+        """Test selected applicants move with one UPDATE and only the recruiter's are touched."""
+        with CaptureQueriesContext(connection) as captured:
+            response = self.post('rejected')
+
+        self.assertRedirects(response, reverse('applicants:applicant_list') + '?status=applied',
+                             fetch_redirect_response=False)
+        self.assertEqual(len(self.statements(captured, 'UPDATE "applicants_applicant"')), 1)
+        self.assertEqual(Applicant.objects.filter(status='rejected').count(), 3)
+        self.assertEqual(Applicant.objects.get(pk=self.applicants[3].pk).status, 'applied')
+        self.assertEqual(self.counts(), {
+            (self.jobs[0].pk, 'rejected', 2), (self.jobs[1].pk, 'rejected', 1), (self.jobs[2].pk, 'applied', 1),
+        })
+
+    def test_bulk_delete_defers_file_cleanup(self):
+        """Test selected applicants go with one DELETE and their shared file is left for the sweep."""
+        path = self.applicants[0].resume.path
+        with CaptureQueriesContext(connection) as captured:
+            self.post('delete')
+
+        self.assertEqual(len(self.statements(captured, 'DELETE FROM "applicants_applicant"')), 1)
+        loaded = [sql for sql in self.statements(captured, 'SELECT') if '"applicants_applicant"."first_name"' in sql]
+        self.assertEqual(loaded, [])
+        self.assertEqual(list(Applicant.objects.values_list('pk', flat=True)), [self.applicants[3].pk])
+        self.assertFalse(ApplicantNote.objects.exists())
+        self.assertEqual(self.counts(), {(self.jobs[2].pk, 'applied', 1)})
+        self.assertEqual(search.search_applicants('john', self.user), [])
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(ResumeBlob.objects.get(name=self.applicants[0].resume.name).ref_count, 0)
+
+        self.assertEqual(tasks.sweep_unreferenced_resumes(), 1)
+        self.assertFalse(os.path.exists(path))
+        self.assertEqual(list(ResumeBlob.objects.values_list('name', flat=True)), [self.applicants[3].resume.name])
+
+
+class ApplicantExportTestCase(TestCase):
+    """Test cases for the streaming applicant export."""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        other = User.objects.create_user(username='other', password='pass123')
+        self.jobs = [
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Test',
+                location='Remote',
+                employment_type='FT',
+                requirements='Python',
+                responsibilities='Code',
+                deadline=date.today() + timedelta(days=30),
+                created_by=owner
+            )
+            for i, owner in enumerate([self.user, other])
+        ]
+        self.applicants = [
+            Applicant.objects.create(
+                first_name='John',
+                last_name=f'Doe {i}',
+                email=f'john{i}@example.com',
+                phone=f'07700000{i}',
+                applied_job=job,
+                status=status,
+                resume=SimpleUploadedFile('resume.pdf', make_pdf(f'Resume number {i}'))
+            )
+            for i, (job, status) in enumerate([
+                (self.jobs[0], 'applied'), (self.jobs[0], 'interview'), (self.jobs[1], 'applied'),
+            ])
+        ]
+        utils.get_resume_extraction(self.applicants[0])
+        self.client = Client()
+        self.client.login(username='recruiter', password='pass123')
+
+    def export(self, **params):
+        response = self.client.get(reverse('applicants:applicant_export'), params)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode()
+
+    def test_csv_respects_filters_and_recruiter(self):
+        """Test the CSV holds only the recruiter's applicants matching the filters."""
+        response, body = self.export(status='applied')
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertIn('attachment; filename="applicants-', response['Content-Disposition'])
+
+        lines = body.splitlines()
+        self.assertEqual(lines[0].split(','), list(export.COLUMNS))
+        self.assertEqual(len(lines), 2)
+        self.assertIn(f'John,Doe 0,john0@example.com,077000000,,{self.jobs[0].pk},Job 0,applied,', lines[1])
+
+    def test_ndjson_with_resume_text(self):
+        """Test NDJSON rows carry the stored resume text when asked for."""
+        response, body = self.export(format='ndjson', resume_text='1')
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = {row['id']: row for row in map(json.loads, body.splitlines())}
+
+        self.assertEqual(set(rows), {self.applicants[0].pk, self.applicants[1].pk})
+        self.assertIn('Resume number 0', rows[self.applicants[0].pk]['resume_text'])
+        self.assertIsNone(rows[self.applicants[1].pk]['resume_text'])
+        self.assertEqual(rows[self.applicants[1].pk]['job_title'], 'Job 0')
+
+    def test_csv_escapes_formulas(self):
+        """Test text that spreadsheets would evaluate is written with a leading quote."""
+        Applicant.objects.filter(pk=self.applicants[0].pk).update(
+            first_name='=HYPERLINK("http://evil.example")', last_name='@SUM(A1)', linkedin='-1+2'
+        )
+        _, body = self.export(job=self.jobs[0].pk, status='applied')
+        row = next(csv.DictReader(StringIO(body)))
+        self.assertEqual(row['first_name'], '\'=HYPERLINK("http://evil.example")')
+        self.assertEqual(row['last_name'], "'@SUM(A1)")
+        self.assertEqual(row['linkedin'], "'-1+2")
+        self.assertEqual(export.csv_cell('+94771234567'), "'+94771234567")
+        self.assertEqual(export.csv_cell('John'), 'John')
+        self.assertEqual(export.csv_cell(-5), -5)
+
+    def test_search_export_is_not_capped(self):
+        """Test an export with a search query holds every match, not only the list's top hits."""
+        search.index_applicants([a.pk for a in self.applicants])
+        capped = search.search_applicants
+        with mock.patch.object(views, 'search_applicants',
+                               lambda query, recruiter, within=None: capped(query, recruiter, limit=1, within=within)):
+            listed = self.client.get(reverse('applicants:applicant_list'), {'q': 'John'}).context['applicants']
+            _, body = self.export(q='John')
+        self.assertEqual(len(listed), 1)
+        self.assertEqual(len(body.splitlines()), 3)
+
+    def test_header_sent_before_rows_are_read(self):
+        """Test the CSV header streams without waiting for the database."""
+        response = self.client.get(reverse('applicants:applicant_export'))
+        content = iter(response.streaming_content)
+        with CaptureQueriesContext(connection) as captured:
+            header = next(content)
+        self.assertTrue(header.startswith(b'id,first_name'))
+        self.assertEqual(len(captured), 0)
+        self.assertEqual(len(list(content)), 2)
+
+
+class ApplicantImportTestCase(TestCase):
+    """Test cases for the bulk job and applicant import."""
+
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=os.path.join(self.tmpdir.name, 'media'))
+        media.enable()
+        self.addCleanup(media.disable)
+        self.resume_root = os.path.join(self.tmpdir.name, 'export')
+        os.makedirs(self.resume_root)
+        for name in ('a.pdf', 'b.pdf'):
+            with open(os.path.join(self.resume_root, name), 'wb') as f:
+                f.write(make_pdf(f'Resume {name}'))
+
+        self.user = User.objects.create_user(username='recruiter', password='pass123', email='hr@example.com')
+        other = User.objects.create_user(username='other', password='pass123')
+        self.job, self.other_job = [
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Test',
+                location='Remote',
+                employment_type='FT',
+                requirements='Python',
+                responsibilities='Code',
+                deadline=date.today() + timedelta(days=30),
+                created_by=owner
+            )
+            for i, owner in enumerate([self.user, other])
+        ]
+        Applicant.objects.create(
+            first_name='Old',
+            last_name='Applicant',
+            email='old@example.com',
+            phone='0770000000',
+            applied_job=self.job,
+            resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 test')
+        )
+
+    def write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w') as f:
+            f.write(content)
+        return path
+
+    def applicant_row(self, i, **fields):
+        return json.dumps({
+            'first_name': 'New', 'last_name': f'Applicant {i}', 'email': f'new{i}@example.com',
+            'phone': f'07711111{i:02d}', 'resume': 'a.pdf', 'job': self.job.pk, **fields,
+        })
+
+    def test_command_imports_and_reports_rejections(self):
+        """Test valid rows are imported with their side effects and every other row is reported."""
+        jobs = self.write('jobs.csv', (
+            'ref,title,description,location,employment_type,requirements,responsibilities,deadline\n'
+            f'be,Backend,Build APIs,Remote,FT,Python,Code,{date.today() + timedelta(days=10)}\n'
+            f',,No title,Remote,FT,Python,Code,{date.today()}\n'
+        ))
+        applicants = self.write('applicants.jsonl', '\n'.join([
+            self.applicant_row(1),
+            self.applicant_row(2, resume='b.pdf', job_ref='be', job='', status='interview'),
+            self.applicant_row(3, email='OLD@example.com'),
+            self.applicant_row(4, phone='+94 77 111 1101'),
+            self.applicant_row(5, resume='../jobs.csv'),
+            self.applicant_row(6, resume='missing.pdf'),
+            self.applicant_row(7, job=self.other_job.pk),
+            self.applicant_row(8, email='hr@example.com'),
+            self.applicant_row(9, email='not-an-email'),
+            'not json',
+        ]))
+        report_path = os.path.join(self.tmpdir.name, 'rejected.csv')
+        out = StringIO()
+        call_command('import_applicants', '--recruiter', 'recruiter', '--jobs', jobs, '--applicants', applicants,
+                     '--resume-root', self.resume_root, '--report', report_path, stdout=out)
+
+        self.assertIn('Imported 1 job(s) and 2 applicant(s); 9 row(s) rejected', out.getvalue())
+        with open(report_path) as f:
+            reasons = {int(row['line']): row['reason'] for row in csv.DictReader(f) if row['source'] == 'applicants.jsonl'}
+        self.assertIn('with email OLD@example.com', reasons[3])
+        self.assertIn('with phone number +94 77 111 1101', reasons[4])
+        self.assertIn('outside the resume directory', reasons[5])
+        self.assertIn('does not exist', reasons[6])
+        self.assertIn('is not one of your jobs', reasons[7])
+        self.assertIn("recruiter's email", reasons[8])
+        self.assertIn('email:', reasons[9])
+        self.assertEqual(reasons[10], 'not a JSON object')
+
+        backend = Job.objects.get(title='Backend', created_by=self.user)
+        first = Applicant.objects.get(email='new1@example.com')
+        self.assertEqual(first.recruiter, self.user)
+        self.assertEqual(first.processing_status, 'pending')
+        self.assertEqual(first.tasks.get().kind, 'extract_text')
+        self.assertEqual(ResumeBlob.objects.get(name=first.resume.name).ref_count, 1)
+        self.assertEqual(first.resume_hash, first.resume.name.rsplit('/', 1)[1].split('.')[0])
+        self.assertEqual(dict(ApplicantCount.objects.filter(job=backend).values_list('status', 'count')),
+                         {'interview': 1})
+        self.assertEqual(self.job.application_count, 2)
+        self.assertEqual({hit.applicant_id for hit in search.search_applicants('new', self.user)},
+                         set(Applicant.objects.filter(first_name='New').values_list('pk', flat=True)))
+
+    def test_duplicates_checked_once_per_batch(self):
+        """Test each batch is deduplicated with a single query, including rows earlier in the file."""
+        applicants = self.write('applicants.csv', 'first_name,last_name,email,phone,resume,job\n' + ''.join(
+            f'New,Applicant,new{i % 3}@example.com,07711111{i:02d},a.pdf,{self.job.pk}\n' for i in range(6)
+        ))
+        with CaptureQueriesContext(connection) as captured:
+            call_command('import_applicants', '--recruiter', 'recruiter', '--applicants', applicants,
+                         '--resume-root', self.resume_root, '--batch-size', '2', stdout=StringIO())
+
+        lookups = [q['sql'] for q in captured if q['sql'].startswith('SELECT "applicants_applicant"."applied_job_id" AS')]
+        self.assertEqual(len(lookups), 3)
+        self.assertEqual(sorted(Applicant.objects.filter(first_name='New').values_list('email', flat=True)),
+                         ['new0@example.com', 'new1@example.com', 'new2@example.com'])
+
+    def test_rejected_rows_leave_no_resume_files(self):
+        """Test a row lost to a concurrent application does not leave its resume in storage."""
+        applicants = self.write('applicants.jsonl', '\n'.join([
+            self.applicant_row(1, resume='b.pdf'),
+            self.applicant_row(2),
+        ]))
+        store_resume = importer.Importer._store_resume
+
+        def apply_meanwhile(instance, path):
+            # The same person applies through the site after the batch was checked for duplicates
+            if not Applicant.objects.filter(email='new1@example.com').exists():
+                Applicant.objects.create(
+                    first_name='New', last_name='Applicant', email='new1@example.com', phone='0770000001',
+                    applied_job=self.job, resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 other')
+                )
+            return store_resume(instance, path)
+
+        with open(applicants) as f, mock.patch.object(importer.Importer, '_store_resume', apply_meanwhile):
+            report = importer.import_files(self.user, applicants=(f, 'applicants.jsonl'), resume_root=self.resume_root)
+
+        self.assertEqual(report.applicants, 1)
+        stored = {
+            name
+            for prefix in os.listdir(os.path.join(self.tmpdir.name, 'media', 'resumes'))
+            for name in os.listdir(os.path.join(self.tmpdir.name, 'media', 'resumes', prefix))
+        }
+        self.assertEqual(stored, {os.path.basename(a.resume.name) for a in Applicant.objects.all()})
+
+    def test_upload_reads_resumes_from_configured_root_only(self):
+        """Test the upload endpoint imports rows and rejects resume paths outside IMPORT_RESUME_ROOT."""
+        client = Client()
+        client.login(username='recruiter', password='pass123')
+        upload = SimpleUploadedFile('applicants.jsonl', '\n'.join([
+            self.applicant_row(1),
+            self.applicant_row(2, resume=os.path.join(self.tmpdir.name, 'applicants.jsonl')),
+        ]).encode())
+
+        with override_settings(IMPORT_RESUME_ROOT=self.resume_root):
+            response = client.post(reverse('applicants:applicant_import'), {'applicants_file': upload})
+        self.assertContains(response, 'Applicants imported: 1')
+        self.assertContains(response, 'is outside the resume directory')
+        self.assertTrue(Applicant.objects.filter(email='new1@example.com').exists())
+
+        upload.seek(0)
+        response = client.post(reverse('applicants:applicant_import'), {'applicants_file': upload})
+        self.assertContains(response, 'no resume directory is configured')
+
+
+class SampleDataTestCase(TestCase):
+    """Test cases for the scale data generator and the view benchmark."""
+
+    def setUp(self):
+        cache.clear()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def generate(self):
+        call_command(
+            'load_sample_data', '--recruiters', '2', '--jobs', '2', '--applicants', '5', '--notes', '1',
+            '--resumes', '3', '--batch-size', '4', stdout=StringIO()
+        )
+
+    def test_synthetic_resume_is_extractable(self):
+        """Test generated resumes are real PDFs whose text the extractor reads back."""
+        pdf, lines = sample_data.resume_pdf('seed')
+        path = os.path.join(self.tmpdir.name, 'cv.pdf')
+        with open(path, 'wb') as f:
+            f.write(pdf)
+        result = extraction.extract_text_from_pdf(path)
+        self.assertTrue(result.ok)
+        self.assertIn(lines[0], result.text)
+        self.assertEqual(sample_data.resume_pdf('seed')[0], pdf)
+
+    def test_generated_data_is_consistent(self):
+        """Test bulk-inserted rows get the side data their signal handlers would have written."""
+        self.generate()
+        self.assertEqual(Job.objects.count(), 4)
+        self.assertEqual(Applicant.objects.count(), 20)
+        self.assertEqual(ApplicantNote.objects.count(), 20)
+        self.assertFalse(Applicant.objects.exclude(recruiter=F('applied_job__created_by')).exists())
+        self.assertEqual(sum(ResumeBlob.objects.values_list('ref_count', flat=True)), 20)
+        self.assertEqual(ResumeExtraction.objects.filter(success=True).count(), 3)
+
+        out = StringIO()
+        call_command('reconcile_applicant_counts', '--dry-run', stdout=out)
+        self.assertIn('Found 0 drifted counter(s)', out.getvalue())
+
+        recruiter = User.objects.get(username='loadtest1')
+        applicant = Applicant.objects.filter(recruiter=recruiter).first()
+        hits = search.search_applicants(applicant.email, recruiter)
+        self.assertEqual([hit.applicant_id for hit in hits], [applicant.pk])
+
+    def test_benchmark_against_baseline(self):
+        """Test the benchmark stores a baseline and fails on a query count regression."""
+        self.generate()
+        baseline = os.path.join(self.tmpdir.name, 'baseline.json')
+        args = ['benchmark_views', '--requests', '2', '--warmup', '0', '--baseline', baseline]
+        call_command(*args, '--save-baseline', stdout=StringIO())
+        with open(baseline) as f:
+            stored = json.load(f)
+        self.assertEqual(set(stored['views']), {'job_list', 'dashboard', 'applicant_list', 'applicant_detail', 'apply'})
+        self.assertEqual(Applicant.objects.count(), 20)
+
+        stored['views']['applicant_list']['queries'] = 0
+        with open(baseline, 'w') as f:
+            json.dump(stored, f)
+        # Latency on a loaded test machine is noise; only the query count should regress
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            call_command(*args, '--min-delta-ms', '10000', stdout=StringIO())
+
+
+class ApplicantQueryBudgetTestCase(QueryBudgetAssertionsMixin, TestCase):
+    """Test the applicant views stay within their query budgets as the data grows."""
+
+    SIZES = (10, 100, 1000)
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    @staticmethod
+    def open_job(recruiter):
+        return Job.objects.filter(created_by=recruiter, is_active=True, deadline__gte=date.today()).first()
+
+    def test_applicant_list_budget(self):
+        """Test the applicant list page, filtered and sorted, is one page query plus its filters."""
+        def applicant_list(recruiter):
+            return reverse('applicants:applicant_list')
+
+        def filtered_applicant_list(recruiter):
+            job = self.open_job(recruiter)
+            return f"{reverse('applicants:applicant_list')}?job={job.pk}&status=applied&sort=score"
+
+        def applicant_search(recruiter):
+            return f"{reverse('applicants:applicant_list')}?q=python"
+
+        for url_for in (applicant_list, filtered_applicant_list):
+            self.assertViewBudgetAtSizes(QueryBudget(queries=4, db_ms=50), self.SIZES, url_for, signed_in=True)
+        self.assertViewBudgetAtSizes(QueryBudget(queries=5, db_ms=100), self.SIZES, applicant_search, signed_in=True)
+
+    def test_applicant_detail_budget(self):
+        """Test the applicant page does not grow with notes, applicants or analyses."""
+        def applicant_detail(recruiter):
+            applicant = Applicant.objects.filter(recruiter=recruiter).first()
+            return reverse('applicants:applicant_detail', args=[applicant.pk])
+        self.assertViewBudgetAtSizes(QueryBudget(queries=8, db_ms=100), self.SIZES, applicant_detail, signed_in=True)
+
+    def test_rank_job_budget(self):
+        """Test offline ranking reads stored term counts instead of one row per applicant."""
+        def rank_job(recruiter):
+            return reverse('applicants:rank_job', args=[self.open_job(recruiter).pk])
+        self.assertViewBudgetAtSizes(QueryBudget(queries=7, db_ms=100), self.SIZES, rank_job, signed_in=True)
+
+    def test_apply_budget(self):
+        """Test the application form and its submission."""
+        def apply(recruiter):
+            return reverse('applicants:apply', args=[self.open_job(recruiter).pk])
+
+        def application(recruiter):
+            return {
+                'first_name': 'New',
+                'last_name': 'Applicant',
+                'email': 'new.applicant@example.com',
+                'phone': '0771234567',
+                'resume': SimpleUploadedFile('resume.pdf', sample_data.resume_pdf('apply')[0]),
+            }
+
+        self.assertViewBudgetAtSizes(QueryBudget(queries=1, db_ms=50), self.SIZES, apply)
+        self.assertViewBudgetAtSizes(QueryBudget(queries=19, db_ms=150), self.SIZES, apply, data=application)
@@ -10,6 +10,12 @@ urlpatterns = [
     path('apply/<int:job_id>/', views.apply_view, name='apply'),
     path('success/', views.application_success_view, name='application_success'),
     path('list/', views.applicant_list_view, name='applicant_list'),
+    path('export/', views.applicant_export_view, name='applicant_export'),
+    path('import/', views.applicant_import_view, name='applicant_import'),
+    path('bulk/', views.applicant_bulk_action_view, name='applicant_bulk_action'),
     path('<int:pk>/', views.applicant_detail_view, name='applicant_detail'),
     path('<int:pk>/delete/', views.applicant_delete_view, name='applicant_delete'),
+    path('screen/<int:job_id>/', views.screen_job_view, name='screen_job'),
+    path('rank/<int:job_id>/', views.rank_job_view, name='rank_job'),
+    path('screening/<int:pk>/', views.screening_run_view, name='screening_run'),
 ]
\ No newline at end of file
@@ -1,37 +1,151 @@
 """
 Utility functions for applicant management.
 """
+import hashlib
+import json
 import os
-from PyPDF2 import PdfReader
 
+from ats_project.metrics import timed
 
-def extract_text_from_pdf(pdf_path):
+from .extraction import (
+    EXTRACTOR_VERSION, NOT_FOUND, TRANSIENT_ERRORS, ExtractionResult, extract_text_from_pdf, file_sha256
+)
+from .ai import AIProviderError, CircuitOpenError, current_model_name, get_provider, is_rate_limit_error
+from .storage import content_hash_from_name
+
+
+def get_resume_extraction(applicant):
     """
-    Extract text content from PDF resume.
+    Return the stored extraction for an applicant's resume, extracting it if needed.
+
+    Extractions are keyed by the resume's content hash and the extractor version,
+    so the PDF is only parsed again when the file or the extractor changes.
 
     Args:
-        pdf_path: Path to PDF file
+        applicant: Applicant instance with a PDF resume
 
     Returns:
-        Extracted text as string
+        ResumeExtraction instance (unsaved if the file is missing)
     """
-    try:
-        if not os.path.exists(pdf_path):
-            return "Resume file not found."
+    from . import search
+    from .models import ResumeExtraction
 
-        reader = PdfReader(pdf_path)
-        text = ""
+    path = applicant.resume.path
+    if not os.path.exists(path):
+        return ResumeExtraction.from_result(ExtractionResult.failure(NOT_FOUND))
 
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+    # Content-addressed names already carry the hash; older uploads are hashed on read
+    content_hash = content_hash_from_name(applicant.resume.name) or file_sha256(path)
+    extraction = ResumeExtraction.objects.filter(
+        content_hash=content_hash,
+        extractor_version=EXTRACTOR_VERSION
+    ).first()
+    if extraction is None:
+        result = extract_text_from_pdf(path)
+        if result.error in TRANSIENT_ERRORS:
+            return ResumeExtraction.from_result(result)
+        extraction, _ = ResumeExtraction.objects.get_or_create(
+            content_hash=content_hash,
+            extractor_version=EXTRACTOR_VERSION,
+            defaults=ResumeExtraction.fields_from_result(result)
+        )
 
-        return text.strip() if text.strip() else "Unable to extract text from resume."
+    if applicant.resume_hash != content_hash:
+        applicant.resume_hash = content_hash
+        type(applicant).objects.filter(pk=applicant.pk).update(resume_hash=content_hash)
+        if extraction.success:
+            search.index_applicants([applicant.pk])
 
-    except Exception as e:
-        return f"Error reading resume: {str(e)}"
+    return extraction
+
+
+# Bump whenever the analysis prompt changes so cached analyses are not reused.
+PROMPT_VERSION = 2
+
+RECOMMENDATIONS = ['Strong Match', 'Good Match', 'Partial Match', 'Poor Match']
+
+
+def build_analysis_prompt(resume_text, job_description, job_title, job_requirements):
+    """Build the CV analysis prompt sent to the model."""
+    return f"""You are an expert HR recruiter assistant. Analyze the following candidate's resume against the job requirements and provide a detailed assessment.
+
+**Job Title:** {job_title}
+
+**Job Description:**
+{job_description}
+
+**Job Requirements:**
+{job_requirements}
+
+**Candidate's Resume:**
+{resume_text}
 
+Respond with a single JSON object with exactly these keys:
 
-def analyze_cv_with_gemini(resume_text, job_description, job_title, job_requirements):
+- "score": integer from 0 to 100 indicating how well the candidate matches the job requirements
+- "matching_skills": list of skills from the resume that match the job requirements
+- "gaps": list of required skills or qualifications missing from the resume
+- "experience": one or two sentences on how relevant the candidate's experience is to this role
+- "recommendation": one of "Strong Match", "Good Match", "Partial Match" or "Poor Match"
+- "explanation": a one-line explanation of the recommendation
+
+Be concise but thorough in your analysis."""
+
+
+def parse_analysis(text):
+    """
+    Parse a model response into structured analysis fields.
+
+    Args:
+        text: Raw model output, expected to be a JSON object
+
+    Returns:
+        Dictionary with score, matching_skills, gaps, experience, recommendation
+        and explanation
+
+    Raises:
+        ValueError: If the response is not a usable JSON object
+    """
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.strip('`').removeprefix('json').strip()
+    data = json.loads(text)
+    if not isinstance(data, dict):
+        raise ValueError('Analysis is not a JSON object')
+
+    score = data.get('score')
+    score = max(0, min(100, int(score))) if score is not None else None
+    recommendation = next(
+        (r for r in RECOMMENDATIONS if r.lower() == str(data.get('recommendation', '')).strip().lower()), ''
+    )
+    return {
+        'score': score,
+        'matching_skills': [str(s) for s in data.get('matching_skills') or []],
+        'gaps': [str(s) for s in data.get('gaps') or []],
+        'experience': str(data.get('experience') or ''),
+        'recommendation': recommendation,
+        'explanation': str(data.get('explanation') or ''),
+    }
+
+
+def format_analysis(fields):
+    """Render structured analysis fields as display text."""
+    lines = []
+    if fields['score'] is not None:
+        lines += [f"Match Score: {fields['score']}%", '']
+    for title, items in [('Key Matching Skills', fields['matching_skills']), ('Missing Skills/Gaps', fields['gaps'])]:
+        lines.append(f'{title}:')
+        lines += [f'• {item}' for item in items] or ['• None']
+        lines.append('')
+    if fields['experience']:
+        lines += [f"Experience Relevance: {fields['experience']}", '']
+    if fields['recommendation']:
+        lines.append(f"Overall Recommendation: {fields['recommendation']} - {fields['explanation']}".rstrip(' -'))
+    return '\n'.join(lines).strip()
+
+
+@timed('ai')
+def analyze_cv_with_gemini(resume_text, job_description, job_title, job_requirements, model=None):
     """
     Use Gemini AI to analyze CV relevance to job description.
 
@@ -40,59 +154,156 @@ def analyze_cv_with_gemini(resume_text, job_description, job_title, job_requirem
         job_description: Job description text
         job_title: Title of the job
         job_requirements: Required qualifications for the job
+        model: Optional object with a ``generate_content(prompt)`` method used
+            instead of the process-wide AI provider
 
     Returns:
-        Dictionary with analysis results or error message
+        Dictionary with display text under ``analysis`` plus the structured
+        fields from parse_analysis, or an error message; rate-limit errors
+        also carry ``rate_limited: True``
     """
     try:
-        import google.generativeai as genai
+        if model is None:
+            model = get_provider()
 
-        api_key = os.getenv('GEMINI_API_KEY')
-        if not api_key:
-            return {"error": "Gemini API key not configured"}
+        prompt = build_analysis_prompt(resume_text, job_description, job_title, job_requirements)
+        response = model.generate_content(prompt)
 
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel('gemini-2.5-flash')
+        try:
+            fields = parse_analysis(response.text)
+        except (ValueError, TypeError):
+            return {"error": "AI analysis failed: the response was not in the expected format."}
 
-        prompt = f"""You are an expert HR recruiter assistant. Analyze the following candidate's resume against the job requirements and provide a detailed assessment.
+        return {
+            "success": True,
+            "analysis": format_analysis(fields),
+            **fields
+        }
 
-**Job Title:** {job_title}
+    except CircuitOpenError:
+        return {"error": "AI analysis is paused after repeated rate-limit errors. Please try again shortly.",
+                "rate_limited": True}
+    except AIProviderError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        if is_rate_limit_error(e):
+            return {"error": "Rate limit exceeded. Please wait 30 seconds and try again.", "rate_limited": True}
+        return {"error": f"AI analysis failed: {str(e)[:200]}"}
 
-**Job Description:**
-{job_description}
 
-**Job Requirements:**
-{job_requirements}
+def analysis_cache_key(resume_text, job):
+    """
+    Build the cache key for an analysis of a resume against a job.
 
-**Candidate's Resume:**
-{resume_text}
+    The key covers everything the result depends on: the resume text, the job's
+    title, description and requirements, the model and the prompt version.
 
-Please provide your analysis in the following format:
+    Args:
+        resume_text: Extracted text from applicant's resume
+        job: Job the resume is analyzed against
 
-1. **Match Score:** (Give a percentage from 0-100% indicating how well the candidate matches the job requirements)
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    for part in [hashlib.sha256(resume_text.encode()).hexdigest(), job.title, job.description,
+                 job.requirements, current_model_name(), str(PROMPT_VERSION)]:
+        digest.update(part.encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
 
-2. **Key Matching Skills:** (List the skills from the resume that match the job requirements)
 
-3. **Missing Skills/Gaps:** (List any required skills or qualifications that are missing from the resume)
+def get_cached_analysis(resume_text, job):
+    """
+    Return a stored analysis for this resume and job, if one exists.
+
+    Returns:
+        Dictionary in the analyze_cv_with_gemini format, or None
+    """
+    from .models import ResumeAnalysis
 
-4. **Experience Relevance:** (Assess how relevant the candidate's experience is to this role)
+    cached = ResumeAnalysis.objects.filter(cache_key=analysis_cache_key(resume_text, job)).first()
+    return cached.as_result() if cached else None
 
-5. **Overall Recommendation:** (Provide a brief recommendation: Strong Match, Good Match, Partial Match, or Poor Match, with a one-line explanation)
 
-Be concise but thorough in your analysis."""
+def record_applicant_scores(applicant_ids, result):
+    """Copy an analysis' score and recommendation onto applicants for sorting and filtering."""
+    from .models import Applicant
 
-        response = model.generate_content(prompt)
+    if applicant_ids:
+        Applicant.objects.filter(pk__in=applicant_ids).exclude(
+            match_score=result.get('score'), ai_recommendation=result.get('recommendation', '')
+        ).update(match_score=result.get('score'), ai_recommendation=result.get('recommendation', ''))
 
-        # Clean up markdown formatting (remove asterisks)
-        clean_text = response.text.replace('**', '').replace('*', '•')
 
-        return {
-            "success": True,
-            "analysis": clean_text
+def store_analysis(resume_text, job, result, applicant_ids=()):
+    """
+    Store a successful analysis so later requests reuse it.
+
+    The score is also copied onto every other applicant who sent the same
+    resume file to the job, since the analysis applies to them too.
+
+    Args:
+        resume_text: Extracted text the analysis was made from
+        job: Job the resume was analyzed against
+        result: Successful result from analyze_cv_with_gemini
+        applicant_ids: Applicants whose stored score should be updated
+
+    Returns:
+        The result dictionary, with ``analyzed_at`` added
+    """
+    from .models import Applicant, ResumeAnalysis
+
+    analysis, _ = ResumeAnalysis.objects.get_or_create(
+        cache_key=analysis_cache_key(resume_text, job),
+        defaults={
+            'job': job,
+            'model_name': current_model_name(),
+            'prompt_version': PROMPT_VERSION,
+            'analysis': result['analysis'],
+            'match_score': result.get('score'),
+            'recommendation': result.get('recommendation', ''),
+            'matching_skills': result.get('matching_skills', []),
+            'gaps': result.get('gaps', []),
         }
+    )
+    if applicant_ids:
+        same_resume = Applicant.objects.filter(pk__in=applicant_ids).exclude(resume_hash='').values('resume_hash')
+        applicant_ids = [*applicant_ids, *Applicant.objects.filter(
+            applied_job=job, resume_hash__in=same_resume
+        ).exclude(pk__in=applicant_ids).values_list('pk', flat=True)]
+    record_applicant_scores(applicant_ids, result)
+    result['analyzed_at'] = analysis.created_at
+    return result
 
-    except Exception as e:
-        error_msg = str(e)
-        if "429" in error_msg or "quota" in error_msg.lower():
-            return {"error": "Rate limit exceeded. Please wait 30 seconds and try again."}
-        return {"error": f"AI analysis failed: {error_msg[:200]}"}
+
+def analyze_resume_for_job(resume_text, job, model=None, applicant_ids=()):
+    """
+    Analyze a resume against a job, reusing a stored analysis when possible.
+
+    Successful analyses are stored; errors are returned but not cached.
+
+    Args:
+        resume_text: Extracted text from applicant's resume
+        job: Job the resume is analyzed against
+        model: Optional model client passed to analyze_cv_with_gemini
+        applicant_ids: Applicants whose stored score should be updated
+
+    Returns:
+        Dictionary with analysis results or error message
+    """
+    cached = get_cached_analysis(resume_text, job)
+    if cached:
+        record_applicant_scores(applicant_ids, cached)
+        return cached
+
+    result = analyze_cv_with_gemini(
+        resume_text=resume_text,
+        job_description=job.description,
+        job_title=job.title,
+        job_requirements=job.requirements,
+        model=model
+    )
+    if result.get('success'):
+        store_analysis(resume_text, job, result, applicant_ids)
+    return result
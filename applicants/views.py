@@ -1,18 +1,72 @@
 """
 Views for applicant management.
 """
+import io
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.db import IntegrityError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
 from jobs.models import Job
-from .models import Applicant, ApplicantNote
-from .forms import ApplicationForm, ApplicantStatusForm, ApplicantNoteForm
-from .utils import extract_text_from_pdf, analyze_cv_with_gemini
+from . import bulk, export, search
+from .models import Applicant, ApplicantNote, ScreeningRun
+from .forms import ApplicationForm, ApplicantStatusForm, ApplicantNoteForm, ImportForm
+from .importer import import_files
+from .normalization import contact_lookup, normalize_email, normalize_phone
+from .utils import RECOMMENDATIONS, analyze_resume_for_job, get_cached_analysis, get_resume_extraction
+from .tasks import enqueue_resume_processing
+from .pagination import Key, keyset_page
+from .ranking import rank_applicants
+from .search import highlight, search_applicants
+
+
+APPLICANT_LIST_PAGE_SIZE = 50
+
+# Rejected import rows listed on the import page; the rest are only counted
+IMPORT_REJECTIONS_SHOWN = 200
+
+# Columns shown by the applicant list table
+APPLICANT_LIST_FIELDS = [
+    'first_name', 'last_name', 'email', 'applied_at', 'status', 'match_score', 'ai_recommendation',
+    'applied_job__title',
+]
+
+# Keyset orderings of the applicant list, each ending in a unique column
+APPLICANT_LIST_ORDERINGS = {
+    '': [Key('applied_at'), Key('id')],
+    'score': [Key('match_score', nullable=True), Key('applied_at'), Key('id')],
+}
+
+
+def _duplicate_application_errors(job, email, phone):
+    """
+    Return the "already applied" messages for an email and phone number.
+
+    Both normalized unique keys are probed in one query.
+    """
+    errors = []
+    normalized_email, normalized_phone = normalize_email(email), normalize_phone(phone)
+    clashes = list(
+        Applicant.objects.filter(applied_job=job).filter(
+            Q(normalized_email=normalized_email) | Q(normalized_phone=normalized_phone)
+        ).values_list('normalized_email', 'normalized_phone')[:2]
+    )
+    if any(clash_email == normalized_email for clash_email, _ in clashes):
+        errors.append(f'You have already applied for this position with email {email}.')
+    if any(clash_phone == normalized_phone for _, clash_phone in clashes):
+        errors.append(f'You have already applied for this position with phone number {phone}.')
+    return errors
 
 
 def apply_view(request, job_id):
     """View for job application submission."""
-    job = get_object_or_404(Job, pk=job_id, is_active=True)
+    job = get_object_or_404(Job.objects.select_related('created_by'), pk=job_id, is_active=True)
 
     # Prevent job owner from applying to their own job
     if request.user.is_authenticated and request.user == job.created_by:
@@ -43,23 +97,29 @@ def apply_view(request, job_id):
             errors = []
             
             # Check if email belongs to the recruiter who posted the job
-            if email == job.created_by.email:
+            if normalize_email(email) == normalize_email(job.created_by.email):
                 errors.append("You cannot apply using the recruiter's email address.")
 
-            if Applicant.objects.filter(applied_job=job, email=email).exists():
-                errors.append(f'You have already applied for this position with email {email}.')
-            
-            if Applicant.objects.filter(applied_job=job, phone=phone).exists():
-                errors.append(f'You have already applied for this position with phone number {phone}.')
+            errors += _duplicate_application_errors(job, email, phone)
+
+            if not errors:
+                applicant = form.save(commit=False)
+                applicant.applied_job = job
+                try:
+                    applicant.save()
+                except IntegrityError:
+                    # A concurrent submission took the email or phone after the check above
+                    errors = _duplicate_application_errors(job, email, phone) or [
+                        'You have already applied for this position.'
+                    ]
 
             if errors:
                 for error in errors:
                     messages.error(request, error)
                 return redirect('jobs:job_detail', pk=job_id)
 
-            applicant = form.save(commit=False)
-            applicant.applied_job = job
-            applicant.save()
+            # Resume parsing happens in the background worker, not in this request
+            enqueue_resume_processing(applicant)
             
             # Update session timestamp
             request.session['last_applied_timestamp'] = current_time
@@ -77,31 +137,174 @@ def application_success_view(request):
     return render(request, 'applicants/success.html')
 
 
-@login_required
-def applicant_list_view(request):
-    """View listing all applicants for recruiter's jobs."""
-    job_id = request.GET.get('job')
-    status = request.GET.get('status')
+def filter_applicants(applicants, params, recruiter, ranked=True):
+    """
+    Apply the applicant list's query string filters to a queryset.
 
-    applicants = Applicant.objects.filter(applied_job__created_by=request.user)
+    Args:
+        applicants: Queryset of the recruiter's applicants
+        params: Query string parameters (``q``, ``job``, ``status``, ``min_score``, ``recommendation``)
+        recruiter: User whose applicants a search covers
+        ranked: Narrow a search to its best SEARCH_LIMIT hits and return their
+            ranks and snippets; otherwise every match is kept, e.g. for exports
+
+    Returns:
+        Tuple of the filtered queryset and a dictionary mapping applicant id to
+        SearchHit, or None when there is no ranked full-text search; a query that
+        is an email address or phone number of an applicant matches it exactly
+        instead, and falls back to full-text search if no applicant has it
+    """
+    query = params.get('q', '').strip()
+    job_id = params.get('job')
+    status = params.get('status')
+    min_score = params.get('min_score')
+    recommendation = params.get('recommendation')
 
     if job_id:
         applicants = applicants.filter(applied_job_id=job_id)
     if status:
         applicants = applicants.filter(status=status)
+    if min_score and min_score.isdigit():
+        applicants = applicants.filter(match_score__gte=int(min_score))
+    if recommendation:
+        applicants = applicants.filter(ai_recommendation=recommendation)
+
+    hits = None
+    lookup = contact_lookup(query) if query else None
+    if lookup and applicants.filter(**lookup).exists():
+        applicants = applicants.filter(**lookup)
+    elif query and ranked:
+        # The other filters run inside the search, so the limit applies to filtered hits
+        hits = {hit.applicant_id: hit for hit in search_applicants(query, recruiter, within=applicants)}
+        applicants = applicants.filter(pk__in=hits)
+    elif query:
+        applicants = applicants.filter(search.matching(query))
+    return applicants, hits
 
-    jobs = Job.objects.filter(created_by=request.user)
+
+@login_required
+def applicant_list_view(request):
+    """
+    View listing all applicants for recruiter's jobs, with optional full-text search.
+
+    Pages are keyset-paginated on the sort key; filters, sort and cursor all live
+    in the query string. Search results are capped and ranked by relevance.
+    """
+    query = request.GET.get('q', '').strip()
+    job_id = request.GET.get('job')
+    status = request.GET.get('status')
+    min_score = request.GET.get('min_score')
+    recommendation = request.GET.get('recommendation')
+    sort = request.GET.get('sort')
+
+    applicants, hits = filter_applicants(
+        Applicant.objects.filter(recruiter=request.user).select_related('applied_job').only(*APPLICANT_LIST_FIELDS),
+        request.GET,
+        request.user,
+    )
+
+    keys = APPLICANT_LIST_ORDERINGS.get(sort, APPLICANT_LIST_ORDERINGS[''])
+    next_cursor = None
+    if hits is not None:
+        applicants = list(applicants.order_by(*(key.order_by() for key in keys)))
+        for applicant in applicants:
+            applicant.search_snippet = highlight(hits[applicant.pk].snippet)
+        if sort != 'score':
+            applicants.sort(key=lambda a: hits[a.pk].rank, reverse=True)
+    else:
+        applicants, next_cursor = keyset_page(
+            applicants, keys, request.GET.get('after'), APPLICANT_LIST_PAGE_SIZE
+        )
+
+    jobs = Job.objects.filter(created_by=request.user).only('pk', 'title')
 
     context = {
         'applicants': applicants,
         'jobs': jobs,
+        'query': query,
+        'next_cursor': next_cursor,
+        'is_first_page': not request.GET.get('after'),
         'selected_job': job_id,
         'selected_status': status,
+        'selected_min_score': min_score,
+        'selected_recommendation': recommendation,
+        'selected_sort': sort,
         'status_choices': Applicant.STATUS_CHOICES,
+        'recommendation_choices': RECOMMENDATIONS,
     }
     return render(request, 'applicants/applicant_list.html', context)
 
 
+@login_required
+def applicant_export_view(request):
+    """
+    Stream the recruiter's applicants as CSV or NDJSON, honouring the list filters.
+
+    ``format`` picks ``csv`` (default) or ``ndjson``; ``resume_text=1`` adds the
+    stored resume text. Rows are streamed as they are read, so the download
+    starts at once and memory stays flat however many rows there are.
+    """
+    fmt = request.GET.get('format', 'csv')
+    if fmt not in export.FORMATS:
+        fmt = 'csv'
+    include_resume_text = request.GET.get('resume_text') == '1'
+
+    # Every match of a search, not only the list's best hits
+    applicants, _ = filter_applicants(
+        Applicant.objects.filter(recruiter=request.user), request.GET, request.user, ranked=False
+    )
+    rows = export.export_rows(applicants.order_by('-applied_at', '-id'), include_resume_text)
+    if fmt == 'csv':
+        content = export.stream_csv(rows, include_resume_text)
+    else:
+        content = export.stream_ndjson(rows)
+
+    content_type, extension = export.FORMATS[fmt]
+    response = StreamingHttpResponse(content, content_type=content_type)
+    filename = f"applicants-{timezone.localdate():%Y%m%d}.{extension}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+def _text_upload(upload):
+    """Return an uploaded file as an (open text file, file name) pair, or None."""
+    if not upload:
+        return None
+    return io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline=''), upload.name
+
+
+@login_required
+def applicant_import_view(request):
+    """
+    Import jobs and applicants in bulk from uploaded CSV or JSON Lines files.
+
+    Resume paths in the applicants file are read from settings.IMPORT_RESUME_ROOT.
+    """
+    report = None
+    if request.method == 'POST':
+        form = ImportForm(request.POST, request.FILES)
+        if form.is_valid():
+            report = import_files(
+                request.user,
+                jobs=_text_upload(form.cleaned_data['jobs_file']),
+                applicants=_text_upload(form.cleaned_data['applicants_file']),
+                resume_root=settings.IMPORT_RESUME_ROOT,
+            )
+            messages.success(request, f'Imported {report.jobs} job(s) and {report.applicants} applicant(s).')
+            if report.rejected:
+                messages.warning(request, f'{len(report.rejected)} row(s) were rejected.')
+    else:
+        form = ImportForm()
+
+    context = {
+        'form': form,
+        'report': report,
+        'rejected': report.rejected[:IMPORT_REJECTIONS_SHOWN] if report else [],
+        'resume_root_configured': bool(settings.IMPORT_RESUME_ROOT),
+    }
+    return render(request, 'applicants/import.html', context)
+
+
 @login_required
 def applicant_detail_view(request, pk):
     """View showing applicant details with resume preview."""
@@ -130,22 +333,20 @@ def applicant_detail_view(request, pk):
             messages.success(request, 'Note added successfully!')
             return redirect('applicants:applicant_detail', pk=pk)
 
-    # Extract resume text if PDF
+    # Load stored resume text if PDF (extracted once per file and extractor version)
+    extraction = None
     resume_text = None
     ai_analysis = None
     if applicant.resume and applicant.resume.name.endswith('.pdf'):
-        resume_text = extract_text_from_pdf(applicant.resume.path)
+        extraction = get_resume_extraction(applicant)
+        resume_text = extraction.message
+        if extraction.success:
+            ai_analysis = get_cached_analysis(resume_text, applicant.applied_job)
 
     # AI Analysis - only run when requested via button click
     if request.method == 'POST' and 'analyze_cv' in request.POST:
-        if resume_text and not resume_text.startswith("Error") and not resume_text.startswith("Unable"):
-            job = applicant.applied_job
-            ai_analysis = analyze_cv_with_gemini(
-                resume_text=resume_text,
-                job_description=job.description,
-                job_title=job.title,
-                job_requirements=job.requirements
-            )
+        if extraction and extraction.success:
+            ai_analysis = analyze_resume_for_job(resume_text, applicant.applied_job, applicant_ids=[applicant.pk])
             if ai_analysis.get('error'):
                 messages.warning(request, f"AI Analysis: {ai_analysis['error']}")
         else:
@@ -182,3 +383,80 @@ def applicant_delete_view(request, pk):
         return redirect('applicants:applicant_list')
 
     return render(request, 'applicants/applicant_confirm_delete.html', {'applicant': applicant})
+
+
+@login_required
+@require_POST
+def applicant_bulk_action_view(request):
+    """
+    Apply a status change or delete to the applicants selected on the list.
+
+    The action is ``delete`` or a status value; selected ids that are not the
+    recruiter's applicants are ignored.
+    """
+    action = request.POST.get('action', '')
+    applicant_ids = [int(pk) for pk in request.POST.getlist('applicants') if pk.isdigit()]
+    statuses = dict(Applicant.STATUS_CHOICES)
+
+    if not applicant_ids:
+        messages.error(request, 'Select at least one applicant.')
+    elif action == 'delete':
+        deleted = bulk.delete(request.user, applicant_ids)
+        messages.success(request, f'{deleted} applicant(s) deleted.')
+    elif action in statuses:
+        updated = bulk.update_status(request.user, applicant_ids, action)
+        messages.success(request, f'{updated} applicant(s) moved to {statuses[action]}.')
+    else:
+        messages.error(request, 'Choose an action to apply.')
+
+    next_url = request.POST.get('next', '')
+    if url_has_allowed_host_and_scheme(next_url, {request.get_host()}, request.is_secure()):
+        return redirect(next_url)
+    return redirect('applicants:applicant_list')
+
+
+@login_required
+@require_POST
+def screen_job_view(request, job_id):
+    """
+    Queue AI analysis of a job's applicants that have not been analyzed yet.
+
+    A positive ``top`` POST value limits the run to the best applicants of the
+    offline ranking.
+    """
+    job = get_object_or_404(Job, pk=job_id, created_by=request.user)
+    run = job.screening_runs.filter(status__in=['pending', 'running']).first()
+    if run:
+        messages.info(request, 'Screening is already in progress for this job.')
+    else:
+        applicant_ids = []
+        top = request.POST.get('top', '')
+        if top.isdigit() and int(top) > 0:
+            ranked = [r for r in rank_applicants(job) if r.score is not None]
+            applicant_ids = [r.applicant.pk for r in ranked[:int(top)]]
+            if not applicant_ids:
+                messages.error(request, 'No applicants with readable resumes to screen yet.')
+                return redirect('applicants:rank_job', job_id=job.pk)
+        run = ScreeningRun.objects.create(job=job, requested_by=request.user, applicant_ids=applicant_ids)
+        messages.success(request, 'AI screening queued. Results appear on each applicant as they complete.')
+    return redirect('applicants:screening_run', pk=run.pk)
+
+
+@login_required
+def rank_job_view(request, job_id):
+    """Offline relevance ranking of a job's applicants, computed locally without AI calls."""
+    job = get_object_or_404(Job, pk=job_id, created_by=request.user)
+    ranked = rank_applicants(job)
+    context = {
+        'job': job,
+        'ranked': ranked,
+        'unranked_count': sum(1 for r in ranked if r.score is None),
+    }
+    return render(request, 'applicants/rank_job.html', context)
+
+
+@login_required
+def screening_run_view(request, pk):
+    """Progress of a batch AI screening run."""
+    run = get_object_or_404(ScreeningRun.objects.select_related('job'), pk=pk, job__created_by=request.user)
+    return render(request, 'applicants/screening_run.html', {'run': run})
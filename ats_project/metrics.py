@@ -0,0 +1,256 @@
+"""
+Per-request performance instrumentation.
+
+MetricsMiddleware times every request and, through a database execute
+wrapper, its queries. Template rendering is timed by the TimedDjangoTemplates
+backend, and slow helpers such as PDF extraction and AI analysis by the
+``timed`` decorator. Each response gets a ``Server-Timing`` header, and the
+numbers are aggregated per view into histograms that ``views.metrics_view``
+serves in the Prometheus text format. Everything stays in process memory, so each
+process reports its own figures.
+"""
+import bisect
+import contextvars
+import functools
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.backends.django import DjangoTemplates, Template, reraise
+
+# Spans reported in Server-Timing, in order, with their descriptions
+SPANS = {
+    'db': 'Database',
+    'tpl': 'Template rendering',
+    'pdf': 'PDF text extraction',
+    'ai': 'AI analysis',
+}
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+
+class _RequestTimings:
+    """Timings collected while one request is being handled."""
+
+    def __init__(self):
+        self.spans = dict.fromkeys(SPANS, 0.0)
+        self.queries = 0
+
+
+_current = contextvars.ContextVar('request_timings', default=None)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram keyed by a tuple of label values."""
+
+    def __init__(self, name, help_text, labels, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.labels = labels
+        self.buckets = buckets
+        self.lock = threading.Lock()
+        self.series = {}
+
+    def observe(self, label_values, value):
+        with self.lock:
+            series = self.series.get(label_values)
+            if series is None:
+                series = self.series[label_values] = [[0] * len(self.buckets), 0, 0.0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += 1
+            series[2] += value
+
+    def reset(self):
+        with self.lock:
+            self.series = {}
+
+    def expose(self):
+        """Return the histogram as Prometheus text exposition lines."""
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self.lock:
+            series = sorted(self.series.items())
+            series = [(labels, list(counts), count, total) for labels, (counts, count, total) in series]
+        for label_values, counts, count, total in series:
+            labels = ','.join(f'{name}="{_escape(value)}"' for name, value in zip(self.labels, label_values))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f'{self.name}_sum{{{labels}}} {total}')
+            lines.append(f'{self.name}_count{{{labels}}} {count}')
+        return lines
+
+
+REQUEST_DURATION = Histogram(
+    'ats_request_duration_seconds', 'Time spent handling requests, per view.', ('view',), DURATION_BUCKETS
+)
+REQUEST_SPAN_DURATION = Histogram(
+    'ats_request_span_duration_seconds', 'Time spent in each span of a request, per view.',
+    ('view', 'span'), DURATION_BUCKETS
+)
+REQUEST_QUERIES = Histogram(
+    'ats_request_db_queries', 'Database queries run per request, per view.', ('view',), QUERY_BUCKETS
+)
+OPERATION_DURATION = Histogram(
+    'ats_operation_duration_seconds', 'Duration of timed operations, in and outside requests.',
+    ('operation',), DURATION_BUCKETS
+)
+HISTOGRAMS = [REQUEST_DURATION, REQUEST_SPAN_DURATION, REQUEST_QUERIES, OPERATION_DURATION]
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _add_span(span, seconds):
+    timings = _current.get()
+    if timings is not None:
+        timings.spans[span] += seconds
+
+
+def timed(span):
+    """
+    Decorator adding a function's run time to a request span.
+
+    Calls outside a request (e.g. in the resume worker) are still recorded in
+    the operation histogram.
+
+    Args:
+        span: Key of SPANS the time is reported under
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - started
+                _add_span(span, elapsed)
+                OPERATION_DURATION.observe((span,), elapsed)
+        return wrapper
+    return decorator
+
+
+class TimedTemplate(Template):
+    """Django template whose top-level renders count toward the template span."""
+
+    def render(self, context=None, request=None):
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            _add_span('tpl', time.perf_counter() - started)
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """DjangoTemplates backend returning TimedTemplate instances."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(self.engine.from_string(template_code), self)
+
+    def get_template(self, template_name):
+        try:
+            return TimedTemplate(self.engine.get_template(template_name), self)
+        except TemplateDoesNotExist as exc:
+            reraise(exc, self)
+
+
+def _time_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.spans['db'] += time.perf_counter() - started
+            timings.queries += 1
+
+
+def server_timing(timings, total):
+    """Format request timings as a Server-Timing header value."""
+    entries = []
+    for span, description in SPANS.items():
+        seconds = timings.spans[span]
+        if span == 'db':
+            description = f'{description} ({timings.queries} queries)'
+        elif not seconds:
+            continue
+        entries.append(f'{span};dur={seconds * 1000:.1f};desc="{description}"')
+    entries.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(entries)
+
+
+class MetricsMiddleware:
+    """Time each request, add a Server-Timing header and feed the histograms."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.METRICS_ENABLED:
+            return self.get_response(request)
+
+        timings = _RequestTimings()
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            with connections['default'].execute_wrapper(_time_query):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total = time.perf_counter() - started
+
+        match = request.resolver_match
+        view = match.view_name if match else 'unresolved'
+        REQUEST_DURATION.observe((view,), total)
+        REQUEST_QUERIES.observe((view,), timings.queries)
+        for span, seconds in timings.spans.items():
+            if seconds or span == 'db':
+                REQUEST_SPAN_DURATION.observe((view, span), seconds)
+        response.headers['Server-Timing'] = server_timing(timings, total)
+        return response
+
+
+def reset():
+    """Clear every histogram."""
+    for histogram in HISTOGRAMS:
+        histogram.reset()
+
+
+def _stat_lines(name, help_text, metric_type, samples):
+    lines = [f'# HELP {name} {help_text}', f'# TYPE {name} {metric_type}']
+    lines += [f'{name}{{{labels}}} {value}' if labels else f'{name} {value}' for labels, value in samples]
+    return lines
+
+
+def exposition():
+    """Return every metric in the Prometheus text format."""
+    from applicants import ai
+    from jobs import cache
+
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines += histogram.expose()
+
+    caches = {'dashboard': cache.stats(), 'public_pages': cache.page_stats()}
+    for field in ('hits', 'misses'):
+        lines += _stat_lines(
+            f'ats_cache_{field}_total', f'Cache {field} by cache.', 'counter',
+            [(f'cache="{name}"', stats[field]) for name, stats in caches.items()]
+        )
+
+    provider = ai.provider_stats()
+    if provider is not None:
+        for field in ('calls', 'errors', 'rate_limited', 'rejected'):
+            lines += _stat_lines(f'ats_ai_{field}_total', f'AI provider {field.replace("_", " ")}.', 'counter',
+                                 [('', provider[field])])
+        lines += _stat_lines('ats_ai_circuit_open', 'Whether the AI circuit breaker is open.', 'gauge',
+                             [('', int(provider['circuit_open']))])
+    return '\n'.join(lines) + '\n'
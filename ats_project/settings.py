@@ -2,6 +2,7 @@
 Django settings for ats_project.
 """
 import os
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 import dj_database_url
@@ -39,9 +40,11 @@ INSTALLED_APPS = [
     'accounts',
     'jobs',
     'applicants',
+    'api',
 ]
 
 MIDDLEWARE = [
+    'ats_project.metrics.MetricsMiddleware',  # Outermost, so its total covers the whole stack
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # For static files in production
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -56,7 +59,7 @@ ROOT_URLCONF = 'ats_project.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'ats_project.metrics.TimedDjangoTemplates',  # DjangoTemplates that times renders
         'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -123,6 +126,10 @@ STORAGES = {
     'default': {
         'BACKEND': 'django.core.files.storage.FileSystemStorage',
     },
+    # Resumes are stored once per distinct file, named by SHA-256
+    'resumes': {
+        'BACKEND': 'applicants.storage.ContentAddressedStorage',
+    },
     'staticfiles': {
         'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
     },
@@ -132,6 +139,58 @@ STORAGES = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Resume text extraction limits (per document, enforced in a sandboxed process pool)
+RESUME_EXTRACTION_TIMEOUT = int(os.getenv('RESUME_EXTRACTION_TIMEOUT', 20))
+RESUME_EXTRACTION_MAX_MEMORY_MB = int(os.getenv('RESUME_EXTRACTION_MAX_MEMORY_MB', 256))
+RESUME_EXTRACTION_MAX_PAGES = int(os.getenv('RESUME_EXTRACTION_MAX_PAGES', 30))
+RESUME_EXTRACTION_WORKERS = int(os.getenv('RESUME_EXTRACTION_WORKERS', 2))
+
+# Directory that imported applicant rows may reference resume files in; resume paths
+# outside it are rejected. Unset, the upload endpoint cannot import resumes.
+IMPORT_RESUME_ROOT = os.getenv('IMPORT_RESUME_ROOT') or None
+
+# Calling code given to applicants' phone numbers entered without one (Sri Lanka)
+PHONE_DEFAULT_COUNTRY_CODE = os.getenv('PHONE_DEFAULT_COUNTRY_CODE', '94')
+
+# AI provider: 'gemini' or 'fake' (deterministic, offline; for tests and benchmarks)
+AI_BACKEND = os.getenv('AI_BACKEND', 'gemini')
+AI_MODEL_NAME = os.getenv('AI_MODEL_NAME', 'gemini-2.5-flash')
+AI_REQUEST_TIMEOUT = int(os.getenv('AI_REQUEST_TIMEOUT', 60))
+AI_CIRCUIT_BREAKER_THRESHOLD = int(os.getenv('AI_CIRCUIT_BREAKER_THRESHOLD', 3))
+AI_CIRCUIT_BREAKER_COOLDOWN = int(os.getenv('AI_CIRCUIT_BREAKER_COOLDOWN', 30))
+
+# Batch AI screening: concurrent calls and the provider quota they must respect
+AI_SCREENING_CONCURRENCY = int(os.getenv('AI_SCREENING_CONCURRENCY', 4))
+AI_REQUESTS_PER_MINUTE = int(os.getenv('AI_REQUESTS_PER_MINUTE', 10))
+
+# Cache
+# Generation bumps from every web worker, the resume worker and the management
+# commands must reach every process, so outside DEBUG the default is a file cache
+# shared by the processes of one host. Point CACHE_BACKEND/CACHE_LOCATION at Redis
+# or Memcached when they run on several hosts. DEBUG keeps a per-process memory cache.
+if DEBUG:
+    _default_cache = ('django.core.cache.backends.locmem.LocMemCache', 'ats')
+else:
+    _default_cache = (
+        'django.core.cache.backends.filebased.FileBasedCache', os.path.join(tempfile.gettempdir(), 'ats-cache')
+    )
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', _default_cache[0]),
+        'LOCATION': os.getenv('CACHE_LOCATION', _default_cache[1]),
+    }
+}
+
+# Seconds a dashboard fragment may live; writes invalidate it sooner
+DASHBOARD_CACHE_TIMEOUT = int(os.getenv('DASHBOARD_CACHE_TIMEOUT', 3600))
+
+# Seconds a rendered public job page may live; job writes invalidate it sooner
+PUBLIC_PAGE_CACHE_TIMEOUT = int(os.getenv('PUBLIC_PAGE_CACHE_TIMEOUT', 3600))
+
+# Metrics
+# Server-Timing headers and the staff-only /metrics/ endpoint; cheap enough to leave on
+METRICS_ENABLED = os.getenv('METRICS_ENABLED', 'True') == 'True'
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -0,0 +1,211 @@
+"""
+Test helpers shared across apps.
+"""
+import os
+import sysconfig
+import time
+import traceback
+from collections import defaultdict
+from dataclasses import dataclass
+from io import StringIO
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, transaction
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryPlanAssertionsMixin:
+    """
+    TestCase mixin asserting that the queries run by a block of code are
+    served by indexes: no full table or index scans and no temporary sort.
+
+    Plans are read with SQLite's EXPLAIN QUERY PLAN; other databases skip.
+    """
+
+    def assertIndexedQueries(self, func, *args, **kwargs):
+        """
+        Run ``func`` and check the plan of every SELECT it issued.
+
+        Returns:
+            Whatever ``func`` returns
+        """
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plan assertions use SQLite EXPLAIN QUERY PLAN')
+
+        with CaptureQueriesContext(connection) as queries:
+            result = func(*args, **kwargs)
+
+        selects = [q['sql'] for q in queries.captured_queries if q['sql'].lstrip().upper().startswith('SELECT')]
+        self.assertTrue(selects, 'No SELECT queries were captured')
+        with connection.cursor() as cursor:
+            for sql in selects:
+                cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+                plan = '\n'.join(row[-1] for row in cursor.fetchall())
+                for step in plan.splitlines():
+                    message = f'\n{sql}\n{plan}'
+                    self.assertFalse(step.startswith('SCAN'), f'Full scan:{message}')
+                    self.assertNotIn('USE TEMP B-TREE', step, f'Temporary sort:{message}')
+        return result
+
+
+@dataclass(frozen=True)
+class QueryBudget:
+    """
+    Most queries one call may use, and optionally the milliseconds spent running them.
+
+    ``db_ms`` defaults to None, which skips the timing check. View budgets set
+    it generously, at several times the usual cost, so only a real slow-query
+    regression fails on a loaded machine.
+    """
+
+    queries: int
+    db_ms: float | None = None
+
+
+# Frames skipped when attributing a query: Django's generic machinery, the
+# standard library, and project code that only wraps other code
+_MACHINERY = ('db', 'template', 'utils', 'core', 'test', 'views', 'dispatch', 'http', 'middleware', 'shortcuts.py')
+_STDLIB = sysconfig.get_paths()['stdlib'] + os.sep
+_WRAPPERS = {__file__, os.path.join(os.path.dirname(__file__), 'metrics.py')}
+
+
+def _call_site():
+    """Return ``path:line in function`` for the innermost frame of the current stack that issued the query."""
+    root = str(settings.BASE_DIR) + os.sep
+    for frame in reversed(traceback.extract_stack()):
+        filename = frame.filename
+        if filename in _WRAPPERS or (filename.startswith(_STDLIB) and 'site-packages' not in filename):
+            continue
+        if 'site-packages' in filename or not filename.startswith(root):
+            head, _, tail = filename.rpartition(f'{os.sep}django{os.sep}')
+            if not head or tail.startswith(_MACHINERY):
+                continue
+            filename = f'django{os.sep}{tail}'
+        else:
+            filename = os.path.relpath(filename, root)
+        return f'{filename}:{frame.lineno} in {frame.name}'
+    return 'unknown'
+
+
+class _QueryRecorder:
+    """Database execute wrapper recording each query with its call site and duration."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((_call_site(), sql, time.perf_counter() - started))
+
+
+def seed_recruiting_data(applicants, jobs=10):
+    """
+    Generate one recruiter with ``applicants`` synthetic applicants, spread
+    evenly over ``jobs`` jobs, each with a note.
+
+    Uses ``load_sample_data --recruiters``, so tests should point MEDIA_ROOT at
+    a temporary directory.
+
+    Returns:
+        The recruiter User
+    """
+    call_command(
+        'load_sample_data', '--recruiters', '1', '--jobs', str(jobs), '--applicants', str(applicants // jobs),
+        '--notes', '1', '--resumes', '3', stdout=StringIO()
+    )
+    return User.objects.filter(username__startswith='loadtest').latest('pk')
+
+
+class QueryBudgetAssertionsMixin:
+    """
+    TestCase mixin asserting that a block of code stays within a QueryBudget,
+    including as the data behind it grows.
+    """
+
+    def assertWithinBudget(self, budget, func, *args, label='call', **kwargs):
+        """
+        Run ``func`` and fail if it used more queries or database time than ``budget``.
+
+        The failure message lists the SQL grouped by the project line that issued it.
+
+        Returns:
+            Whatever ``func`` returns
+        """
+        recorder = _QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            result = func(*args, **kwargs)
+
+        db_ms = sum(seconds for _, _, seconds in recorder.queries) * 1000
+        too_slow = budget.db_ms is not None and db_ms > budget.db_ms
+        if len(recorder.queries) > budget.queries or too_slow:
+            by_site = defaultdict(list)
+            for site, sql, seconds in recorder.queries:
+                by_site[site].append((sql, seconds))
+            time_budget = 'no budget' if budget.db_ms is None else f'budget {budget.db_ms:.0f} ms'
+            lines = [
+                f'{label} used {len(recorder.queries)} queries (budget {budget.queries}) '
+                f'and {db_ms:.1f} ms of database time ({time_budget})'
+            ]
+            for site, queries in sorted(by_site.items(), key=lambda item: -len(item[1])):
+                site_ms = sum(seconds for _, seconds in queries) * 1000
+                lines.append(f'  {len(queries)}x {site} ({site_ms:.1f} ms)')
+                for sql in dict.fromkeys(sql for sql, _ in queries):
+                    lines.append(f'      {sql[:300]}')
+            self.fail('\n'.join(lines))
+        return result
+
+    def assertBudgetAtSizes(self, budget, sizes, seed, func, label='call'):
+        """
+        Check ``func`` against ``budget`` with data seeded at each size.
+
+        Each size is seeded and checked inside a transaction that is rolled back
+        afterwards, so a budget that only holds for small tables fails at the
+        larger sizes.
+
+        Args:
+            budget: QueryBudget that must hold at every size
+            sizes: Sizes passed to ``seed``, smallest first
+            seed: Callable creating data for a size; its return value is passed to ``func``
+            func: Code under test
+            label: Name used in failure messages
+        """
+        for size in sizes:
+            with self.subTest(label=label, size=size), transaction.atomic():
+                self.assertWithinBudget(budget, func, seed(size), label=f'{label} at size {size}')
+                transaction.set_rollback(True)
+
+    def assertViewBudgetAtSizes(self, budget, sizes, url_for, signed_in=False, data=None, headers=None):
+        """
+        Check one request to a view against ``budget`` with seed_recruiting_data at each size.
+
+        Caches are cleared before the request, so the budget covers a cold render.
+
+        Args:
+            budget: QueryBudget that must hold at every size
+            sizes: Numbers of applicants to seed, smallest first
+            url_for: Callable returning the URL to request, given the seeded recruiter
+            signed_in: Request as the seeded recruiter instead of anonymously
+            data: Callable returning POST data, given the recruiter; GET if omitted
+            headers: Callable returning request headers, given the recruiter
+        """
+        def seed(size):
+            recruiter = seed_recruiting_data(size)
+            client = Client(headers=headers(recruiter) if headers else None)
+            if signed_in:
+                client.force_login(recruiter)
+            return client, url_for(recruiter), data(recruiter) if data else None
+
+        def request(seeded):
+            client, url, post_data = seeded
+            cache.clear()
+            response = client.post(url, post_data) if data else client.get(url)
+            self.assertLess(response.status_code, 400, url)
+
+        self.assertBudgetAtSizes(budget, sizes, seed, request, label=url_for.__name__)
@@ -0,0 +1,115 @@
+"""
+Tests for project-level instrumentation and test helpers.
+"""
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import TestCase, Client, RequestFactory, override_settings
+from django.urls import reverse
+
+from jobs.models import Job
+
+from . import metrics
+from .testing import QueryBudget, QueryBudgetAssertionsMixin
+
+
+class MetricsTestCase(TestCase):
+    """Test cases for the request metrics middleware and endpoint."""
+
+    def setUp(self):
+        cache.clear()
+        metrics.reset()
+        self.client = Client()
+
+    def test_server_timing_header(self):
+        """Test responses report database, template and total time."""
+        response = self.client.get(reverse('jobs:job_list'))
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'db;dur=[\d.]+;desc="Database \(\d+ queries\)"')
+        self.assertIn('tpl;dur=', timing)
+        self.assertRegex(timing, r'total;dur=[\d.]+$')
+
+    def test_timed_spans(self):
+        """Test timed helpers called while handling a request are reported in its spans."""
+        @metrics.timed('pdf')
+        def extract():
+            return 'text'
+
+        def view(request):
+            extract()
+            return HttpResponse()
+
+        response = metrics.MetricsMiddleware(view)(RequestFactory().get('/'))
+        self.assertIn('pdf;dur=', response['Server-Timing'])
+        self.assertNotIn('ai;dur=', response['Server-Timing'])
+        self.assertIn('ats_operation_duration_seconds_count{operation="pdf"} 1', metrics.exposition())
+
+    @override_settings(METRICS_ENABLED=False)
+    def test_disabled(self):
+        """Test no header is added when metrics are turned off."""
+        response = self.client.get(reverse('jobs:job_list'))
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_endpoint_is_staff_only(self):
+        """Test the Prometheus endpoint serves histograms to staff only."""
+        self.client.get(reverse('jobs:job_list'))
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 302)
+
+        User.objects.create_user(username='staff', password='pass123', is_staff=True)
+        self.client.login(username='staff', password='pass123')
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('# TYPE ats_request_duration_seconds histogram', body)
+        self.assertIn('ats_request_duration_seconds_count{view="jobs:job_list"} 1', body)
+        self.assertIn('ats_request_db_queries_bucket{view="jobs:job_list",le="+Inf"} 1', body)
+        self.assertIn('ats_cache_hits_total{cache="public_pages"}', body)
+
+
+class QueryBudgetTestCase(QueryBudgetAssertionsMixin, TestCase):
+    """Test cases for the query budget assertions."""
+
+    def setUp(self):
+        user = User.objects.create_user(username='recruiter', password='pass123')
+        for i in range(3):
+            Job.objects.create(
+                title=f'Job {i}',
+                description='Test',
+                location='Remote',
+                employment_type='FT',
+                requirements='Python',
+                responsibilities='Code',
+                deadline=date.today() + timedelta(days=30),
+                created_by=user
+            )
+
+    def test_n_plus_one_reported_by_call_site(self):
+        """Test an N+1 breaks the budget and is reported at the line issuing it."""
+        def owners():
+            jobs = list(Job.objects.all())
+            return [job.created_by.username for job in jobs]
+
+        with self.assertRaises(AssertionError) as raised:
+            self.assertWithinBudget(QueryBudget(queries=2), owners, label='owners')
+        message = str(raised.exception)
+        self.assertIn('owners used 4 queries (budget 2)', message)
+        self.assertRegex(message, r'3x ats_project/tests\.py:\d+ in owners')
+        self.assertIn('FROM "auth_user"', message)
+
+        def owners_joined():
+            return [job.created_by.username for job in Job.objects.select_related('created_by')]
+
+        self.assertEqual(self.assertWithinBudget(QueryBudget(queries=1), owners_joined), ['recruiter'] * 3)
+
+    def test_database_time_checked_only_when_budgeted(self):
+        """Test database time fails a budget only when the budget sets db_ms."""
+        def jobs():
+            return list(Job.objects.all())
+
+        self.assertEqual(len(self.assertWithinBudget(QueryBudget(queries=1), jobs)), 3)
+        with self.assertRaises(AssertionError) as raised:
+            self.assertWithinBudget(QueryBudget(queries=1, db_ms=-1), jobs, label='jobs')
+        self.assertIn('jobs used 1 queries (budget 1)', str(raised.exception))
+        self.assertIn('(budget -1 ms)', str(raised.exception))
@@ -6,13 +6,16 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import RedirectView
+from .views import metrics_view
 
 urlpatterns = [
     path('admin/', admin.site.urls),
+    path('metrics/', metrics_view, name='metrics'),
     path('', RedirectView.as_view(url='/jobs/', permanent=False)),
     path('accounts/', include('accounts.urls')),
     path('jobs/', include('jobs.urls')),
     path('applicants/', include('applicants.urls')),
+    path('api/', include('api.urls')),
 ]
 
 # Serve media files in development
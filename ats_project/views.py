@@ -0,0 +1,13 @@
+"""
+Project-level views.
+"""
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import HttpResponse
+
+from .metrics import exposition
+
+
+@staff_member_required
+def metrics_view(request):
+    """Prometheus scrape endpoint with the request and cache metrics, for staff users."""
+    return HttpResponse(exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
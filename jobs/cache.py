@@ -0,0 +1,175 @@
+"""
+Versioned caches for dashboard fragments and public job pages.
+
+Each recruiter has a generation number stored in the cache. Fragment keys
+include it, so bumping the generation on any Job, Applicant or ApplicantNote
+write makes every cached fragment of that recruiter unreachable at once;
+stale entries simply expire. Public job pages work the same way under a
+single shared generation bumped by job writes and applicant counts changing;
+the time of the last bump is kept too and serves as their Last-Modified.
+Hit and miss counters are kept per process.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.safestring import mark_safe
+
+
+PUBLIC_GENERATION_KEY = 'jobs:public:generation'
+PUBLIC_MODIFIED_KEY = 'jobs:public:modified'
+
+
+def _generation_key(user_id):
+    return f'dashboard:generation:{user_id}'
+
+
+def _current(key):
+    generation = cache.get(key)
+    if generation is None:
+        # Start from the clock so a generation lost to eviction never repeats an old one
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, time.time_ns(), timeout=None)
+
+
+def _bump(key):
+    # Bump now and again on commit, so an entry rendered from pre-commit data by another request is not kept
+    _incr(key)
+    transaction.on_commit(lambda: _incr(key))
+
+
+def get_generation(user_id):
+    """Return the recruiter's current cache generation, starting one if needed."""
+    return _current(_generation_key(user_id))
+
+
+def bump_generation(user_id):
+    """Invalidate every cached dashboard fragment of a recruiter."""
+    if user_id is not None:
+        _bump(_generation_key(user_id))
+
+
+def _touch_public():
+    cache.set(PUBLIC_MODIFIED_KEY, time.time(), timeout=None)
+
+
+def bump_public_generation():
+    """Invalidate every cached public job page."""
+    _bump(PUBLIC_GENERATION_KEY)
+    _touch_public()
+    transaction.on_commit(_touch_public)
+
+
+def public_last_modified():
+    """
+    Return the Unix time public job pages last changed.
+
+    The value never goes backwards: if it was lost to eviction, the current
+    time is recorded instead.
+    """
+    modified = cache.get(PUBLIC_MODIFIED_KEY)
+    if modified is None:
+        cache.add(PUBLIC_MODIFIED_KEY, time.time(), timeout=None)
+        modified = cache.get(PUBLIC_MODIFIED_KEY)
+    return modified
+
+
+class _Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def record(self, hit):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def snapshot(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else 0.0,
+            }
+
+    def reset(self):
+        with self.lock:
+            self.hits = 0
+            self.misses = 0
+
+
+_stats = _Stats()
+_page_stats = _Stats()
+
+
+def stats():
+    """Return a snapshot of this process's fragment cache hit and miss counts."""
+    return _stats.snapshot()
+
+
+def page_stats():
+    """Return a snapshot of this process's public page cache hit and miss counts."""
+    return _page_stats.snapshot()
+
+
+def reset_stats():
+    """Zero the hit and miss counters."""
+    _stats.reset()
+    _page_stats.reset()
+
+
+def get_or_render(user_id, name, render):
+    """
+    Return a recruiter's cached fragment, rendering and storing it on a miss.
+
+    Args:
+        user_id: Recruiter the fragment belongs to
+        name: Fragment name, unique per page section
+        render: Callable returning the fragment HTML; only called on a miss
+
+    Returns:
+        Fragment HTML, marked safe
+    """
+    # Read the generation before any data, so a write racing this render bumps past it
+    key = f'dashboard:{user_id}:{get_generation(user_id)}:{name}'
+    html = cache.get(key)
+    _stats.record(hit=html is not None)
+    if html is None:
+        html = render()
+        cache.set(key, html, settings.DASHBOARD_CACHE_TIMEOUT)
+    return mark_safe(html)
+
+
+def get_or_build_page(name, build):
+    """
+    Return a cached public page, building and storing it on a miss.
+
+    Args:
+        name: Page name, unique per URL
+        build: Callable returning the page entry, a dict holding at least the
+            rendered ``html``; only called on a miss
+
+    Returns:
+        The page entry
+    """
+    key = f'jobs:public:{_current(PUBLIC_GENERATION_KEY)}:{name}'
+    page = cache.get(key)
+    _page_stats.record(hit=page is not None)
+    if page is None:
+        page = build()
+        cache.set(key, page, settings.PUBLIC_PAGE_CACHE_TIMEOUT)
+    return page
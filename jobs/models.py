@@ -24,13 +24,20 @@ class Job(models.Model):
     requirements = models.TextField(help_text='Job requirements and qualifications')
     responsibilities = models.TextField(help_text='Key responsibilities')
     deadline = models.DateField(help_text='Application deadline')
-    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs')
+    # Indexed by job_owner_recent_idx below
+    created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='jobs', db_index=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     is_active = models.BooleanField(default=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Recruiter dashboard: a recruiter's jobs, newest first
+            models.Index(fields=['created_by', '-created_at'], name='job_owner_recent_idx'),
+            # Public job list: active jobs, newest first
+            models.Index(fields=['is_active', '-created_at'], name='job_active_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} - {self.location}"
@@ -42,5 +49,5 @@ class Job(models.Model):
 
     @property
     def application_count(self):
-        """Get total number of applications."""
-        return self.applicants.count()
+        """Get total number of applications from the maintained per-status counters."""
+        return sum(self.applicant_counts.values_list('count', flat=True))
@@ -0,0 +1,15 @@
+"""
+Signal handlers for job side effects.
+"""
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import bump_generation, bump_public_generation
+from .models import Job
+
+
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_owner_dashboard(sender, instance, **kwargs):
+    """Drop the owner's cached dashboard fragments and the public job pages when a job changes."""
+    bump_generation(instance.created_by_id)
+    bump_public_generation()
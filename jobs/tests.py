@@ -3,8 +3,20 @@ Tests for jobs app.
 """
 from django.test import TestCase, Client
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import parse_http_date
 from datetime import date, timedelta
+from unittest import mock
+from applicants.models import Applicant, ApplicantNote
+import tempfile
+from django.test import override_settings
+from ats_project.testing import QueryBudget, QueryBudgetAssertionsMixin, QueryPlanAssertionsMixin
+from . import cache as dashboard_cache
 from .models import Job
 
 
@@ -38,6 +50,7 @@ class JobViewTestCase(TestCase):
     """Test cases for job views."""
 
     def setUp(self):
+        cache.clear()
         self.client = Client()
         self.user = User.objects.create_user(username='recruiter', password='pass123')
         self.job = Job.objects.create(
@@ -60,4 +73,285 @@ class JobViewTestCase(TestCase):
     def test_dashboard_requires_login(self):
         """Test dashboard requires authentication."""
         response = self.client.get(reverse('jobs:dashboard'))
-        self.assertEqual(response.status_code, 302) 
\ No newline at end of file
+        self.assertEqual(response.status_code, 302) 
+
+
+class JobQueryPlanTestCase(QueryPlanAssertionsMixin, TestCase):
+    """Test the dashboard and job list are served by indexes."""
+
+    def setUp(self):
+        cache.clear()
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        other = User.objects.create_user(username='other', password='pass123')
+        for i, owner in enumerate([self.user, self.user, other]):
+            job = Job.objects.create(
+                title=f'Job {i}',
+                description='Test description',
+                location='Remote',
+                employment_type='FT',
+                requirements='Python',
+                responsibilities='Code',
+                deadline=date.today() + timedelta(days=30),
+                created_by=owner,
+                is_active=i != 1
+            )
+            Applicant.objects.create(
+                first_name='John',
+                last_name='Doe',
+                email='john@example.com',
+                phone='1234567890',
+                applied_job=job,
+                resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 test')
+            )
+
+    def test_job_list_plan(self):
+        """Test the public job list uses the active jobs index."""
+        response = self.assertIndexedQueries(self.client.get, reverse('jobs:job_list'))
+        self.assertEqual(len(response.context['jobs']), 2)
+
+    def test_dashboard_plan(self):
+        """Test every dashboard query uses an index without sorting."""
+        self.client.login(username='recruiter', password='pass123')
+        response = self.assertIndexedQueries(self.client.get, reverse('jobs:dashboard'))
+        self.assertContains(response, 'Job 0')
+        self.assertContains(response, 'Job 1')
+        self.assertNotContains(response, 'Job 2')
+
+
+class DashboardCacheTestCase(TestCase):
+    """Test the dashboard fragments are cached until the recruiter's data changes."""
+
+    def setUp(self):
+        cache.clear()
+        dashboard_cache.reset_stats()
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test description',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        self.applicant = Applicant.objects.create(
+            first_name='John',
+            last_name='Doe',
+            email='john@example.com',
+            phone='1234567890',
+            applied_job=self.job,
+            resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 test')
+        )
+        self.client.login(username='recruiter', password='pass123')
+
+    def get_dashboard(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('jobs:dashboard'))
+        tables = ('jobs_job', 'applicants_applicant')
+        data_queries = [q['sql'] for q in queries.captured_queries if any(t in q['sql'] for t in tables)]
+        return response, data_queries
+
+    def test_reload_served_from_cache(self):
+        """Test a second load renders the same page without touching jobs or applicants."""
+        first, data_queries = self.get_dashboard()
+        self.assertTrue(data_queries)
+        second, data_queries = self.get_dashboard()
+        self.assertEqual(data_queries, [])
+        self.assertContains(second, 'Software Engineer')
+        self.assertContains(second, 'John Doe')
+        self.assertEqual(dashboard_cache.stats(), {'hits': 3, 'misses': 3, 'hit_ratio': 0.5})
+
+    def test_writes_invalidate_fragments(self):
+        """Test job, applicant and note writes each show up on the next load."""
+        self.get_dashboard()
+
+        self.job.title = 'Data Engineer'
+        self.job.save()
+        response, data_queries = self.get_dashboard()
+        self.assertTrue(data_queries)
+        self.assertContains(response, 'Data Engineer')
+
+        self.applicant.status = 'interview'
+        self.applicant.save()
+        self.assertContains(self.get_dashboard()[0], 'Interview')
+
+        generation = dashboard_cache.get_generation(self.user.pk)
+        ApplicantNote.objects.create(applicant=self.applicant, note='Strong candidate', created_by=self.user)
+        self.assertNotEqual(dashboard_cache.get_generation(self.user.pk), generation)
+
+    def test_other_recruiters_unaffected(self):
+        """Test a write bumps only the owning recruiter's generation."""
+        other = User.objects.create_user(username='other', password='pass123')
+        generation = dashboard_cache.get_generation(self.user.pk)
+        Job.objects.create(
+            title='Other Job',
+            description='Test description',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=other
+        )
+        self.assertEqual(dashboard_cache.get_generation(self.user.pk), generation)
+
+    def test_screen_form_outside_cached_fragments(self):
+        """Test the CSRF token is rendered per request, not cached with the jobs table."""
+        response, _ = self.get_dashboard()
+        self.assertNotIn('csrfmiddlewaretoken', response.context['jobs_html'])
+        self.assertContains(response, 'id="screen-job-form"')
+        self.assertContains(response, 'form="screen-job-form"')
+
+
+class PublicPageCacheTestCase(TestCase):
+    """Test the public job pages are cached and support conditional GET."""
+
+    def setUp(self):
+        cache.clear()
+        dashboard_cache.reset_stats()
+        self.client = Client()
+        self.user = User.objects.create_user(username='recruiter', password='pass123')
+        self.job = Job.objects.create(
+            title='Software Engineer',
+            description='Test description',
+            location='Remote',
+            employment_type='FT',
+            requirements='Python',
+            responsibilities='Code',
+            deadline=date.today() + timedelta(days=30),
+            created_by=self.user
+        )
+        self.list_url = reverse('jobs:job_list')
+        self.detail_url = reverse('jobs:job_detail', args=[self.job.pk])
+
+    def add_applicant(self, email):
+        return Applicant.objects.create(
+            first_name='John',
+            last_name='Doe',
+            email=email,
+            phone=email,
+            applied_job=self.job,
+            resume=SimpleUploadedFile('resume.pdf', b'%PDF-1.4 test')
+        )
+
+    def test_repeat_visits_served_from_cache(self):
+        """Test a crawled page is rendered once and then served without touching jobs."""
+        for url in (self.list_url, self.detail_url):
+            first = self.client.get(url)
+            with CaptureQueriesContext(connection) as queries:
+                second = self.client.get(url)
+            self.assertFalse([q for q in queries.captured_queries if 'jobs_job' in q['sql']])
+            self.assertEqual(second.content, first.content)
+            self.assertContains(second, 'Software Engineer')
+        self.assertEqual(dashboard_cache.page_stats(), {'hits': 2, 'misses': 2, 'hit_ratio': 0.5})
+
+    def test_conditional_get(self):
+        """Test matching If-None-Match or If-Modified-Since validators get a 304."""
+        response = self.client.get(self.detail_url)
+        self.assertTrue(response['ETag'])
+        self.assertTrue(response['Last-Modified'])
+
+        not_modified = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+        not_modified = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_last_modified_never_goes_backwards(self):
+        """Test removing the latest edited job still moves Last-Modified forward."""
+        clock = [1_900_000_000.0]
+        with mock.patch('jobs.cache.time.time', lambda: clock[0]):
+            older = Job.objects.create(
+                title='Older Job', description='Test', location='Remote', employment_type='FT',
+                requirements='Python', responsibilities='Code', deadline=self.job.deadline, created_by=self.user
+            )
+            first = self.client.get(self.list_url)
+
+            clock[0] += 10
+            self.job.is_active = False
+            self.job.save()
+            response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 'Software Engineer')
+        self.assertContains(response, older.title)
+        self.assertGreater(parse_http_date(response['Last-Modified']), parse_http_date(first['Last-Modified']))
+
+    def test_pages_are_rebuilt_on_a_new_day(self):
+        """Test a cached page is not served past midnight."""
+        first = self.client.get(self.list_url)
+        tomorrow = timezone.localdate() + timedelta(days=1)
+        with mock.patch('jobs.views.timezone.localdate', return_value=tomorrow):
+            response = self.client.get(self.list_url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified'])
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+        self.assertEqual(dashboard_cache.page_stats()['misses'], 2)
+
+    def test_job_writes_invalidate(self):
+        """Test editing and deactivating a job changes the pages and their ETags."""
+        etag = self.client.get(self.list_url)['ETag']
+
+        self.job.title = 'Data Engineer'
+        self.job.save()
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Data Engineer')
+
+        self.job.is_active = False
+        self.job.save()
+        self.assertNotContains(self.client.get(self.list_url), 'Data Engineer')
+        self.assertEqual(self.client.get(self.detail_url).status_code, 404)
+
+    def test_applicant_count_changes_etag(self):
+        """Test a new application changes the ETag and the shown count."""
+        etag = self.client.get(self.list_url)['ETag']
+        applicant = self.add_applicant('john@example.com')
+        response = self.client.get(self.list_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, '1 applicants')
+
+        applicant.delete()
+        self.assertContains(self.client.get(self.list_url), '0 applicants')
+
+    def test_signed_in_users_bypass_cache(self):
+        """Test signed-in users get a fresh render without validators."""
+        self.client.get(self.list_url)
+        self.client.login(username='recruiter', password='pass123')
+        response = self.client.get(self.list_url)
+        self.assertContains(response, 'recruiter')
+        self.assertFalse(response.has_header('ETag'))
+
+
+class JobQueryBudgetTestCase(QueryBudgetAssertionsMixin, TestCase):
+    """Test the job views stay within their query budgets as the data grows."""
+
+    SIZES = (10, 100, 1000)
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        media = override_settings(MEDIA_ROOT=self.tmpdir.name)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def test_job_list_budget(self):
+        """Test the public job list reads the jobs and their counters."""
+        def job_list(recruiter):
+            return reverse('jobs:job_list')
+        self.assertViewBudgetAtSizes(QueryBudget(queries=2, db_ms=50), self.SIZES, job_list)
+
+    def test_job_detail_budget(self):
+        """Test the public job page reads the job and its counters."""
+        def job_detail(recruiter):
+            job = Job.objects.filter(created_by=recruiter, is_active=True).first()
+            return reverse('jobs:job_detail', args=[job.pk])
+        self.assertViewBudgetAtSizes(QueryBudget(queries=2, db_ms=50), self.SIZES, job_detail)
+
+    def test_dashboard_budget(self):
+        """Test the dashboard reads the session, user, jobs, counters and recent applicants."""
+        def dashboard(recruiter):
+            return reverse('jobs:dashboard')
+        self.assertViewBudgetAtSizes(QueryBudget(queries=5, db_ms=50), self.SIZES, dashboard, signed_in=True)
@@ -1,50 +1,147 @@
 """
 Views for job management and dashboard.
 """
+import hashlib
+import math
+from datetime import datetime, time
+
+from django.http import HttpResponse
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Count
+from django.contrib.messages import get_messages
+from django.template.loader import render_to_string
+from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from .cache import get_or_build_page, get_or_render, public_last_modified
 from .models import Job
 from .forms import JobForm
-from applicants.models import Applicant
+from applicants.models import Applicant, ApplicantCount, ResumeAnalysis
+
+
+def _attach_applicant_counts(jobs):
+    """Set ``applicant_count`` on each job from the counter table; returns the totals."""
+    totals = ApplicantCount.totals(job.pk for job in jobs)
+    for job in jobs:
+        job.applicant_count = totals.get(job.pk, 0)
+    return totals
+
+
+def _page_entry(html, jobs, totals):
+    """
+    Bundle a rendered public page with its validators.
+
+    The ETag covers each shown job's last edit and applicant count plus today's
+    date (expiry badges depend on it). Last-Modified is the last change to any
+    public page, or midnight if that is later, so removing a job or a new day
+    never moves it backwards.
+    """
+    today = timezone.localdate()
+    state = [today.isoformat()] + [f'{job.pk}:{job.updated_at.isoformat()}:{totals.get(job.pk, 0)}' for job in jobs]
+    midnight = timezone.make_aware(datetime.combine(today, time.min)).timestamp()
+    return {
+        'html': html,
+        'etag': quote_etag(hashlib.sha256('|'.join(state).encode()).hexdigest()[:32]),
+        'last_modified': math.ceil(max(public_last_modified(), midnight)),
+    }
+
+
+def _serve_public_page(request, name, build):
+    """
+    Serve a public page from the shared page cache with conditional GET support.
+
+    Signed-in users and requests carrying flash messages get a fresh render,
+    since the page then depends on who is asking.
+
+    Args:
+        request: The current request
+        name: Page name, unique per URL
+        build: Callable rendering the page entry for this request
+
+    Returns:
+        Response, or None when the page must be rendered per request
+    """
+    if request.user.is_authenticated or len(get_messages(request)):
+        return None
+
+    # Keyed by date as well: expiry badges and the Apply button change at midnight
+    page = get_or_build_page(f'{name}:{timezone.localdate().isoformat()}', lambda: build(request))
+    response = get_conditional_response(request, etag=page['etag'], last_modified=page['last_modified'])
+    if response is None:
+        response = HttpResponse(page['html'])
+    response.headers['ETag'] = page['etag']
+    response.headers['Last-Modified'] = http_date(page['last_modified'])
+    return response
+
+
+def _job_list_page(request):
+    jobs = list(Job.objects.filter(is_active=True))
+    totals = _attach_applicant_counts(jobs)
+    return _page_entry(render_to_string('jobs/job_list.html', {'jobs': jobs}, request), jobs, totals)
 
 
 def job_list_view(request):
     """Public view of all active job postings."""
-    jobs = Job.objects.filter(is_active=True).annotate(
-        applicant_count=Count('applicants')
-    )
-    return render(request, 'jobs/job_list.html', {'jobs': jobs})
+    response = _serve_public_page(request, 'job_list', _job_list_page)
+    if response is not None:
+        return response
+    return HttpResponse(_job_list_page(request)['html'])
+
+
+def _job_detail_page(request, pk):
+    job = get_object_or_404(Job, pk=pk, is_active=True)
+    totals = _attach_applicant_counts([job])
+    return _page_entry(render_to_string('jobs/job_detail.html', {'job': job}, request), [job], totals)
 
 
 def job_detail_view(request, pk):
     """Public view of job details."""
-    job = get_object_or_404(Job, pk=pk, is_active=True)
-    return render(request, 'jobs/job_detail.html', {'job': job})
+    response = _serve_public_page(request, f'job_detail:{pk}', lambda r: _job_detail_page(r, pk))
+    if response is not None:
+        return response
+    return HttpResponse(_job_detail_page(request, pk)['html'])
 
 
 @login_required
 def dashboard_view(request):
-    """Recruiter dashboard showing jobs and recent applicants."""
-    jobs = Job.objects.filter(created_by=request.user).annotate(
-        applicant_count=Count('applicants')
-    )
-    recent_applicants = Applicant.objects.filter(
-        applied_job__created_by=request.user
-    ).order_by('-applied_at')[:10]
-
-    # Statistics
-    total_jobs = jobs.count()
-    active_jobs = jobs.filter(is_active=True).count()
-    total_applicants = Applicant.objects.filter(applied_job__created_by=request.user).count()
+    """
+    Recruiter dashboard showing jobs and recent applicants.
+
+    The stats cards, jobs table and recent applicants are cached per recruiter
+    (see jobs.cache), so a reload with no writes in between runs no queries for them.
+    """
+    user_id = request.user.pk
+    jobs = []
+
+    def load_jobs():
+        # Shared by the stats and jobs fragments; loaded once, and only on a miss
+        if not jobs:
+            jobs.append(list(Job.objects.filter(created_by_id=user_id)))
+            jobs.append(_attach_applicant_counts(jobs[0]))
+        return jobs
+
+    def render_stats():
+        job_list, totals = load_jobs()
+        return render_to_string('jobs/dashboard_stats.html', {
+            'total_jobs': len(job_list),
+            'active_jobs': sum(job.is_active for job in job_list),
+            'total_applicants': sum(totals.values()),
+        })
+
+    def render_jobs():
+        return render_to_string('jobs/dashboard_jobs.html', {'jobs': load_jobs()[0]})
+
+    def render_recent():
+        recent_applicants = Applicant.objects.filter(
+            recruiter_id=user_id
+        ).select_related('applied_job').order_by('-applied_at', '-id')[:10]
+        return render_to_string('jobs/dashboard_recent.html', {'recent_applicants': recent_applicants})
 
     context = {
-        'jobs': jobs,
-        'recent_applicants': recent_applicants,
-        'total_jobs': total_jobs,
-        'active_jobs': active_jobs,
-        'total_applicants': total_applicants,
+        'stats_html': get_or_render(user_id, 'stats', render_stats),
+        'jobs_html': get_or_render(user_id, 'jobs', render_jobs),
+        'recent_html': get_or_render(user_id, 'recent', render_recent),
     }
     return render(request, 'jobs/dashboard.html', context)
 
@@ -75,6 +172,10 @@ def job_edit_view(request, pk):
         form = JobForm(request.POST, instance=job)
         if form.is_valid():
             form.save()
+            # Stored AI analyses depend on these fields; drop only this job's
+            if set(form.changed_data) & {'title', 'description', 'requirements'}:
+                ResumeAnalysis.objects.filter(job=job).delete()
+                job.applicants.update(match_score=None, ai_recommendation='')
             messages.success(request, 'Job updated successfully!')
             return redirect('jobs:dashboard')
     else: